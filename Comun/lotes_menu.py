@@ -0,0 +1,158 @@
+"""Ejecucion por lotes de un menu de consola, comun a las dos listas.
+
+Listas Simples/lotes.py (menu de tareas) y Listas Dobles/batch.py (menu de
+la playlist) solo aportan como se ejecuta una opcion; la lectura de
+comandos, las respuestas a las preguntas, el buffer de salida y los tiempos
+viven aqui. Un comando es una opcion del menu seguida de las respuestas que
+leerian sus preguntas, en orden, separadas por ``|`` o como objeto JSON:
+
+    1|Titulo|Artista|3:45
+    {"opcion": "3", "datos": ["Titulo"]}
+
+Las lineas vacias y las que empiezan con # se ignoran. Las carpetas de las
+listas se ejecutan como scripts sueltos y no como paquetes, asi que cada
+script agrega esta carpeta a sys.path antes de importar el modulo.
+"""
+
+import io
+import json
+import sys
+import time
+from array import array
+from contextlib import redirect_stdout
+
+SEPARADOR = "|"
+# La salida acumulada se escribe al superar este tamano
+TAMANO_BUFFER = 1 << 20
+
+
+class Estadisticas:
+    """Tiempos de ejecucion por opcion del menu."""
+
+    def __init__(self):
+        # Opcion -> duraciones en nanosegundos
+        self.tiempos = {}
+        self.errores = 0
+
+    @property
+    def comandos(self):
+        return sum(len(duraciones) for duraciones in self.tiempos.values())
+
+    def registrar(self, opcion, nanosegundos):
+        self.tiempos.setdefault(opcion, array("q")).append(nanosegundos)
+
+    def informe(self):
+        """Tabla de texto con cantidad, total y percentiles por opcion."""
+        filas = [f"{'opcion':>8} {'cantidad':>10} {'total ms':>10} {'media us':>10} "
+                 f"{'p50 us':>10} {'p99 us':>10} {'max us':>10}"]
+        for opcion in sorted(self.tiempos, key=lambda o: (len(o), o)):
+            duraciones = sorted(self.tiempos[opcion])
+            cantidad = len(duraciones)
+            total = sum(duraciones)
+            filas.append(
+                f"{opcion:>8} {cantidad:>10} {total / 1e6:>10.1f} {total / cantidad / 1e3:>10.1f} "
+                f"{_percentil(duraciones, 50) / 1e3:>10.1f} {_percentil(duraciones, 99) / 1e3:>10.1f} "
+                f"{duraciones[-1] / 1e3:>10.1f}")
+        filas.append(f"Comandos ejecutados: {self.comandos}, con error: {self.errores}")
+        return "\n".join(filas)
+
+
+def _percentil(ordenados, percentil):
+    return ordenados[min(len(ordenados) - 1, len(ordenados) * percentil // 100)]
+
+
+def interpretar_linea(linea, claves=("opcion", "datos")):
+    """Devuelve (opcion, datos) o None si la linea no tiene comando.
+
+    `claves` son los nombres de la opcion y de los datos en los comandos JSON.
+    """
+    clave_opcion, clave_datos = claves
+    linea = linea.rstrip("\r\n")
+    if not linea.strip() or linea.lstrip().startswith("#"):
+        return None
+    if linea.lstrip().startswith("{"):
+        comando = json.loads(linea)
+        if not isinstance(comando, dict) or clave_opcion not in comando:
+            raise ValueError(f"se esperaba un objeto con la clave '{clave_opcion}'")
+        datos = comando.get(clave_datos, [])
+        if not isinstance(datos, list):
+            raise ValueError(f"'{clave_datos}' debe ser una lista")
+        return str(comando[clave_opcion]).strip(), [str(dato) for dato in datos]
+    opcion, *datos = linea.split(SEPARADOR)
+    return opcion.strip(), datos
+
+
+class RespuestasComando:
+    """Funcion leer(mensaje) para las opciones: devuelve los datos del comando en curso."""
+
+    def __init__(self):
+        self._pendientes = iter(())
+
+    def __call__(self, mensaje=""):
+        try:
+            return next(self._pendientes)
+        except StopIteration:
+            # EOFError, como input(): las opciones atrapan ValueError
+            raise EOFError("faltan datos para la opcion") from None
+
+    def cargar(self, datos):
+        self._pendientes = iter(datos)
+
+    def sobrantes(self):
+        return sum(1 for _ in self._pendientes)
+
+
+def ejecutar_comandos(lineas, despachar, salida=None, silencioso=False,
+                      claves=("opcion", "datos"), respuestas=None):
+    """Ejecuta los comandos de `lineas`; devuelve las Estadisticas.
+
+    despachar(opcion, leer) ejecuta una opcion leyendo sus datos con leer,
+    devuelve False para terminar el lote y lanza ValueError si la opcion no
+    existe. Un comando que falla (formato invalido, opcion desconocida,
+    datos de menos) se informa en stderr con su numero de linea, se cuenta
+    como error, su salida se descarta y el lote sigue. Los datos de mas se
+    informan despues de ejecutar el comando, que conserva su salida.
+    `respuestas` permite pasar el RespuestasComando que usaran las opciones
+    si hay que conocerlo antes (por ejemplo, para armar sus handlers).
+    """
+    salida = sys.stdout if salida is None else salida
+    respuestas = RespuestasComando() if respuestas is None else respuestas
+    estadisticas = Estadisticas()
+    buffer = io.StringIO()
+
+    def vaciar():
+        if not silencioso:
+            salida.write(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
+
+    with redirect_stdout(buffer):
+        for numero, linea in enumerate(lineas, start=1):
+            marca = buffer.tell()
+            try:
+                comando = interpretar_linea(linea, claves)
+                if comando is None:
+                    continue
+                opcion, datos = comando
+                inicio = time.perf_counter_ns()
+                respuestas.cargar(datos)
+                seguir = despachar(opcion, respuestas)
+                estadisticas.registrar(opcion, time.perf_counter_ns() - inicio)
+            except (ValueError, EOFError) as error:
+                # Se descartan las preguntas que alcanzo a mostrar el comando
+                buffer.seek(marca)
+                buffer.truncate()
+                estadisticas.errores += 1
+                print(f"linea {numero}: {error}", file=sys.stderr)
+                continue
+            sobrantes = respuestas.sobrantes()
+            if sobrantes:
+                estadisticas.errores += 1
+                print(f"linea {numero}: sobran {sobrantes} datos para la opcion", file=sys.stderr)
+            if buffer.tell() >= TAMANO_BUFFER or silencioso:
+                vaciar()
+            if not seguir:
+                break
+    vaciar()
+    salida.flush()
+    return estadisticas
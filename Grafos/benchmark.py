@@ -0,0 +1,249 @@
+"""Benchmark harness for the developer network pipeline.
+
+Generates synthetic software_dev.csv-shaped rosters, times every stage on
+its own (load, G_sim, G_bi, G_perf, metrics, layout, render), records peak
+traced memory per stage and writes the results as JSON. A previous results
+file can be passed with --compare to flag stages that got slower.
+
+    python benchmark.py --sizes 1000 10000 --output bench.json
+    python benchmark.py --sizes 1000 10000 --compare bench.json
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import networkx as nx
+import numpy as np
+
+from bipartite import BipartiteCounts
+from csr import CSRGraph
+from grafos import build_performance_graph
+from loader import SCHEMA, load_devs
+from metrics import approximate_average_clustering, average_clustering, top_hubs
+from similarity import add_similarity_edges
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+LANGUAGES = ('Python', 'Java', 'C#', 'R')
+
+# Similarity graphs grow roughly quadratically with the roster, and spring
+# layouts are far slower still, so bigger runs skip those stages by default
+DEFAULT_MAX_GRAPH_ROWS = 5_000
+DEFAULT_MAX_DRAW_ROWS = 1_000
+
+
+def generate_csv(path, rows, seed=42):
+    """Write ``rows`` synthetic developers with the same columns as software_dev.csv."""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(list(SCHEMA))
+        for dev_id in range(1, rows + 1):
+            writer.writerow([
+                dev_id,
+                rng.randint(1, 10),
+                rng.choice(LANGUAGES),
+                rng.randint(10, 30),
+                float(rng.randint(200, 400)),
+                rng.randint(1, 5),
+                float(rng.randint(34, 50)),
+                rng.randint(0, 5),
+            ])
+    return path
+
+
+def dataset(data_dir, rows, seed):
+    path = os.path.join(data_dir, f"software_dev_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        generate_csv(path, rows, seed)
+    return path
+
+
+def run_stage(stages, name, fn, trace_memory):
+    """Time ``fn`` and record its wall time (and peak traced memory) under ``name``."""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        value = fn()
+    finally:
+        elapsed = time.perf_counter() - start
+        record = {'seconds': round(elapsed, 6)}
+        if trace_memory:
+            record['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        stages[name] = record
+    return value
+
+
+def skip_stage(stages, name, reason):
+    stages[name] = {'skipped': reason}
+
+
+def bench_size(rows, args):
+    stages = {}
+    result = {'rows': rows, 'stages': stages}
+    path = dataset(args.data_dir, rows, args.seed)
+    trace = not args.no_memory
+
+    roster = run_stage(stages, 'load', lambda: load_devs(path), trace)
+    dev_ids = roster.numpy('Dev_ID')
+    lang_codes = roster.numpy('Lenguaje_Principal')
+    exp_years = roster.numpy('Experiencia_Anios')
+    satisfaction = roster.numpy('Satisfaccion')
+
+    def build_sim():
+        if args.backend == 'csr':
+            return CSRGraph.from_similarity(dev_ids, lang_codes, exp_years, satisfaction,
+                                            method=args.method)
+        G = nx.Graph()
+        for dev_id, code, e, s in zip(dev_ids.tolist(), lang_codes.tolist(),
+                                      exp_years.tolist(), satisfaction.tolist()):
+            G.add_node(dev_id, lang=roster.languages[code], exp=e, sat=s)
+        return add_similarity_edges(G, dev_ids, lang_codes, exp_years, satisfaction,
+                                    method=args.method)
+
+    G_sim = None
+    if rows <= args.max_graph_rows:
+        G_sim = run_stage(stages, 'sim_build', build_sim, trace)
+        result['sim_edges'] = G_sim.number_of_edges()
+    else:
+        skip_stage(stages, 'sim_build', f"rows > --max-graph-rows ({args.max_graph_rows})")
+
+    bipartite = run_stage(stages, 'bi_build', lambda: BipartiteCounts.from_columns(
+        lang_codes, exp_years, roster.languages), trace)
+    G_perf = run_stage(stages, 'perf_build', build_performance_graph, trace)
+
+    def metrics():
+        if args.backend == 'csr':
+            hubs = G_sim.top_hubs(3)
+            if args.clustering_samples:
+                return hubs, G_sim.approximate_average_clustering(args.clustering_samples, seed=1)
+            return hubs, G_sim.average_clustering()
+        hubs = top_hubs(G_sim, 3)
+        if args.clustering_samples:
+            return hubs, approximate_average_clustering(G_sim, args.clustering_samples, seed=1)
+        return hubs, average_clustering(G_sim, args.workers)
+
+    if G_sim is None:
+        skip_stage(stages, 'metrics', "no similarity graph")
+    else:
+        run_stage(stages, 'metrics', metrics, trace)
+
+    if G_sim is None or rows > args.max_draw_rows:
+        skip_stage(stages, 'layout', f"rows > --max-draw-rows ({args.max_draw_rows})")
+        skip_stage(stages, 'render', f"rows > --max-draw-rows ({args.max_draw_rows})")
+        return result
+
+    G_draw = G_sim
+    if args.backend == 'csr':
+        G_draw = G_sim.to_networkx(lang=[roster.languages[c] for c in lang_codes.tolist()],
+                                   exp=exp_years.tolist(), sat=satisfaction.tolist())
+    run_stage(stages, 'layout', lambda: nx.spring_layout(G_draw, k=0.5, seed=42), trace)
+
+    from render import render_report
+    stats = [['Total Developers', rows], ['Similar Pairs', G_sim.number_of_edges()]]
+    with tempfile.TemporaryDirectory() as tmp:
+        # Fresh cache directory so the render is measured cold
+        run_stage(stages, 'render', lambda: render_report(
+            G_draw, bipartite.graph, G_perf, stats, out_path=os.path.join(tmp, 'report.png'),
+            dpi=args.dpi, workers=args.workers, cache_dir=os.path.join(tmp, 'cache')), trace)
+    return result
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'networkx': nx.__version__,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Print per-stage time ratios; return the stages slower than ``tolerance``."""
+    previous = {r['rows']: r['stages'] for r in baseline['results']}
+    regressions = []
+    print(f"{'rows':>9}  {'stage':<11} {'before':>10} {'after':>10} {'ratio':>7}")
+    for result in current['results']:
+        before_stages = previous.get(result['rows'], {})
+        for stage, after in result['stages'].items():
+            before = before_stages.get(stage, {})
+            if 'seconds' not in after or 'seconds' not in before:
+                continue
+            ratio = after['seconds'] / before['seconds'] if before['seconds'] else float('inf')
+            flag = ''
+            if ratio > tolerance:
+                flag = '  SLOWER'
+                regressions.append((result['rows'], stage, ratio))
+            print(f"{result['rows']:>9}  {stage:<11} {before['seconds']:>10.4f} "
+                  f"{after['seconds']:>10.4f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the developer network pipeline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'grafos_bench'),
+                        help="where generated datasets are kept and reused")
+    parser.add_argument('--backend', choices=('networkx', 'csr'), default='networkx')
+    parser.add_argument('--method', choices=('indexed', 'blocked'), default='indexed')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--clustering-samples', type=int, default=0)
+    parser.add_argument('--max-graph-rows', type=int, default=DEFAULT_MAX_GRAPH_ROWS)
+    parser.add_argument('--max-draw-rows', type=int, default=DEFAULT_MAX_DRAW_ROWS)
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip tracemalloc (it slows down Python-heavy stages)")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="earlier results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=1.2,
+                        help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+    if args.clustering_samples < 0:
+        parser.error("--clustering-samples must be 0 (exact) or positive")
+
+    baseline = None
+    if args.compare:
+        # Read first: the baseline may be the file this run overwrites
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    report = {'environment': environment(), 'config': vars(args), 'results': []}
+    for rows in args.sizes:
+        print(f"Benchmarking {rows} rows...", flush=True)
+        result = bench_size(rows, args)
+        report['results'].append(result)
+        for stage, record in result['stages'].items():
+            if 'seconds' in record:
+                peak = record.get('peak_bytes')
+                peak = f", peak {peak / 2**20:.1f} MiB" if peak is not None else ''
+                print(f"  {stage:<11} {record['seconds']:.4f} s{peak}")
+            else:
+                print(f"  {stage:<11} skipped ({record['skipped']})")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved: {args.output}")
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} stage(s) slower than {args.tolerance}x the baseline")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Language x experience-band aggregation backing the bipartite graph.
+
+Counts are computed in one group-by pass over the columnar roster and then
+kept live: adding or removing a developer touches a single counter and at
+most one edge of the graph.
+"""
+from bisect import bisect_left
+from collections import Counter
+
+import networkx as nx
+import numpy as np
+
+# Upper (inclusive) bound of every band but the last, and the band labels
+DEFAULT_BANDS = (3, 6)
+DEFAULT_LABELS = ('Junior', 'Mid', 'Senior')
+
+
+class BipartiteCounts:
+    """Developer counts per (language, experience band) plus the live graph."""
+
+    def __init__(self, bands=DEFAULT_BANDS, labels=DEFAULT_LABELS):
+        bands = tuple(bands)
+        if len(labels) != len(bands) + 1:
+            raise ValueError("labels must have exactly one entry more than bands")
+        if any(lo >= hi for lo, hi in zip(bands, bands[1:])):
+            raise ValueError("bands must be strictly increasing")
+        self.bands = bands
+        self.labels = tuple(labels)
+        self.counts = Counter()
+        self.lang_totals = Counter()
+        self.level_totals = Counter()
+        self.graph = nx.Graph()
+
+    @classmethod
+    def from_columns(cls, lang_codes, exp, languages, bands=DEFAULT_BANDS,
+                     labels=DEFAULT_LABELS):
+        """Aggregate the whole roster in a single bincount pass."""
+        agg = cls(bands, labels)
+        n_levels = len(agg.labels)
+        level_idx = np.searchsorted(np.asarray(agg.bands), exp, side='left')
+        cells = np.bincount(np.asarray(lang_codes, dtype=np.int64) * n_levels + level_idx,
+                            minlength=len(languages) * n_levels)
+        for cell in np.flatnonzero(cells).tolist():
+            code, level = divmod(cell, n_levels)
+            agg._bump(languages[code], agg.labels[level], int(cells[cell]))
+        return agg
+
+    def level(self, exp):
+        """Band label for ``exp`` years of experience."""
+        return self.labels[bisect_left(self.bands, exp)]
+
+    def languages(self):
+        return list(self.lang_totals)
+
+    def levels(self):
+        return [label for label in self.labels if label in self.level_totals]
+
+    def add(self, lang, exp, n=1):
+        """Account for ``n`` developers joining the roster."""
+        _check_count(n)
+        self._bump(lang, self.level(exp), n)
+
+    def remove(self, lang, exp, n=1):
+        """Account for ``n`` developers leaving the roster."""
+        _check_count(n)
+        level = self.level(exp)
+        if self.counts[(lang, level)] < n:
+            raise ValueError(f"cannot remove {n} developers from ({lang}, {level})")
+        self._bump(lang, level, -n)
+
+    def _bump(self, lang, level, delta):
+        key = (lang, level)
+        lang_node, level_node = f"L_{lang}", f"E_{level}"
+        self.counts[key] += delta
+        self.lang_totals[lang] += delta
+        self.level_totals[level] += delta
+
+        if self.counts[key] > 0:
+            if lang_node not in self.graph:
+                self.graph.add_node(lang_node, bipartite=0)
+            if level_node not in self.graph:
+                self.graph.add_node(level_node, bipartite=1)
+            self.graph.add_edge(lang_node, level_node, weight=self.counts[key])
+            return
+
+        # Drop emptied cells, and nodes with no developers left
+        del self.counts[key]
+        if self.graph.has_edge(lang_node, level_node):
+            self.graph.remove_edge(lang_node, level_node)
+        if self.lang_totals[lang] <= 0:
+            del self.lang_totals[lang]
+            self.graph.remove_node(lang_node)
+        if self.level_totals[level] <= 0:
+            del self.level_totals[level]
+            self.graph.remove_node(level_node)
+
+
+def _check_count(n):
+    if n <= 0:
+        raise ValueError(f"developer count must be positive, got {n}")
@@ -0,0 +1,175 @@
+"""Array-backed (CSR) storage for the developer similarity network.
+
+Each undirected edge is stored twice as an int32 column index with an int8
+weight, and rows are delimited by an int64 offsets array: roughly 10 bytes
+per edge versus several hundred for a networkx Graph with attribute dicts.
+The graph is built straight from the similarity engine's edge arrays and
+only converted to networkx when it has to be drawn.
+"""
+import random
+
+import networkx as nx
+import numpy as np
+
+from metrics import check_sampling, hoeffding_error
+from similarity import DEFAULT_BLOCK, MIN_SCORE, iter_indexed_edges, iter_similarity_edges
+
+
+class CSRGraph:
+    """Undirected weighted graph over rows 0..n-1, labelled by ``ids``."""
+
+    def __init__(self, ids, offsets, indices, weights):
+        self.ids = np.asarray(ids)
+        self.offsets = offsets
+        self.indices = indices
+        self.weights = weights
+        self._row_index = None
+
+    @classmethod
+    def from_edges(cls, ids, rows_i, rows_j, weights):
+        """Build from one direction of every edge (i, j, weight)."""
+        n = len(ids)
+        src = np.concatenate((rows_i, rows_j)).astype(np.int32, copy=False)
+        dst = np.concatenate((rows_j, rows_i)).astype(np.int32, copy=False)
+        w = np.concatenate((weights, weights)).astype(np.int8, copy=False)
+        order = np.lexsort((dst, src))
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+        return cls(ids, offsets, dst[order], w[order])
+
+    @classmethod
+    def from_similarity(cls, ids, lang, exp, sat, method='indexed', block=DEFAULT_BLOCK,
+                        min_score=MIN_SCORE, report=None):
+        """Run the similarity engine and pack its edges directly into CSR."""
+        if method == 'indexed':
+            edges = iter_indexed_edges(lang, exp, sat, min_score, report)
+        elif method == 'blocked':
+            edges = iter_similarity_edges(lang, exp, sat, block, min_score)
+        else:
+            raise ValueError(f"unknown similarity method: {method!r}")
+        parts_i, parts_j, parts_w = [], [], []
+        for ii, jj, w in edges:
+            # Narrow each tile right away so peak memory stays near the CSR size
+            parts_i.append(ii.astype(np.int32))
+            parts_j.append(jj.astype(np.int32))
+            parts_w.append(w)
+        if not parts_i:
+            empty = np.empty(0, dtype=np.int32)
+            return cls.from_edges(ids, empty, empty, np.empty(0, dtype=np.int8))
+        return cls.from_edges(ids, np.concatenate(parts_i), np.concatenate(parts_j),
+                              np.concatenate(parts_w))
+
+    # ------------------------------------------------------------------
+    # Basic queries
+    # ------------------------------------------------------------------
+    def number_of_nodes(self):
+        return len(self.ids)
+
+    def number_of_edges(self):
+        return len(self.indices) // 2
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + self.indices.nbytes + self.weights.nbytes + self.ids.nbytes
+
+    def row_of(self, dev_id):
+        if self._row_index is None:
+            self._row_index = {dev_id: i for i, dev_id in enumerate(self.ids.tolist())}
+        return self._row_index[dev_id]
+
+    def degrees(self):
+        return np.diff(self.offsets)
+
+    def degree(self, row):
+        return int(self.offsets[row + 1] - self.offsets[row])
+
+    def neighbors(self, row):
+        """Sorted neighbour rows of ``row`` (a view, not a copy)."""
+        return self.indices[self.offsets[row]:self.offsets[row + 1]]
+
+    def edge_weights(self, row):
+        return self.weights[self.offsets[row]:self.offsets[row + 1]]
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+    def component_labels(self):
+        """Component label per row (the smallest row in its component).
+
+        Shiloach-Vishkin style: hook every root onto the smallest neighbouring
+        root, then pointer-jump until every tree is a star; repeat until no
+        edge crosses two components.
+        """
+        parent = np.arange(self.number_of_nodes(), dtype=np.int64)
+        src = np.repeat(parent, self.degrees())
+        dst = self.indices
+        while True:
+            pu, pv = parent[src], parent[dst]
+            mask = pv < pu
+            if not mask.any():
+                return parent
+            np.minimum.at(parent, pu[mask], pv[mask])
+            while True:
+                jumped = parent[parent]
+                if np.array_equal(jumped, parent):
+                    break
+                parent = jumped
+
+    def number_of_components(self):
+        return len(np.unique(self.component_labels()))
+
+    def local_clustering(self, row):
+        nbrs = self.neighbors(row)
+        d = len(nbrs)
+        if d < 2:
+            return 0.0
+        starts, stops = self.offsets[nbrs], self.offsets[nbrs + 1]
+        second = np.concatenate([self.indices[a:b] for a, b in zip(starts, stops)])
+        links = np.count_nonzero(np.isin(second, nbrs, assume_unique=False))
+        return links / (d * (d - 1))
+
+    def average_clustering(self):
+        n = self.number_of_nodes()
+        return sum(self.local_clustering(r) for r in range(n)) / n if n else 0.0
+
+    def approximate_average_clustering(self, samples=1000, confidence=0.95, seed=None):
+        """Sampled estimate and Hoeffding error bound (see metrics.py)."""
+        check_sampling(samples, confidence)
+        n = self.number_of_nodes()
+        if not n:
+            return 0.0, 0.0
+        rng = random.Random(seed)
+        total = sum(self.local_clustering(rng.randrange(n)) for _ in range(samples))
+        return total / samples, hoeffding_error(samples, confidence)
+
+    def top_hubs(self, k=3):
+        """The ``k`` highest-degree nodes as (dev_id, degree centrality)."""
+        n = self.number_of_nodes()
+        deg = self.degrees()
+        k = min(k, n)
+        if not k:
+            return []
+        kth = np.partition(deg, n - k)[n - k]
+        candidates = np.flatnonzero(deg >= kth)
+        # Ties broken by row order, like a stable sort of the networkx degree view
+        top = candidates[np.lexsort((candidates, -deg[candidates]))][:k]
+        scale = 1 / (n - 1) if n > 1 else 1.0
+        return [(int(self.ids[r]), int(deg[r]) * scale) for r in top.tolist()]
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+    def to_networkx(self, **node_attrs):
+        """networkx copy for drawing; ``node_attrs`` map names to per-row values."""
+        G = nx.Graph()
+        ids = self.ids.tolist()
+        names = list(node_attrs)
+        columns = [list(node_attrs[name]) for name in names]
+        for row, dev_id in enumerate(ids):
+            G.add_node(dev_id, **{name: col[row] for name, col in zip(names, columns)})
+        src = np.repeat(np.arange(len(ids)), self.degrees())
+        upper = src < self.indices
+        G.add_weighted_edges_from(zip(self.ids[src[upper]].tolist(),
+                                      self.ids[self.indices[upper]].tolist(),
+                                      self.weights[upper].tolist()))
+        return G
@@ -0,0 +1,283 @@
+"""Incremental maintenance of the developer similarity network.
+
+Instead of rebuilding G_sim after every roster change, SimilarityService
+applies add/update/remove deltas. Candidate neighbours come from the same
+(language, experience, satisfaction) buckets as the indexed builder, and
+components, degree centrality and local clustering are updated in place for
+the touched nodes only. The initial roster is loaded in bulk with the
+indexed builder instead of one delta per developer.
+"""
+from collections import deque
+
+import networkx as nx
+
+from similarity import (EXP_SCORE, EXP_TOLERANCE, LANG_SCORE, MIN_SCORE, SAT_SCORE,
+                        SAT_TOLERANCE, iter_indexed_edges)
+
+
+class SimilarityService:
+    """Live similarity graph with components and per-node metrics."""
+
+    def __init__(self, min_score=MIN_SCORE):
+        if LANG_SCORE >= min_score or EXP_SCORE + SAT_SCORE >= min_score:
+            raise ValueError("incremental service requires a language match plus "
+                             "one more criterion")
+        self.min_score = min_score
+        self.graph = nx.Graph()
+        # Bucket index: cell -> dev ids, plus the occupied sat/exp values per row
+        self._cells = {}
+        self._sats_by_exp = {}
+        self._exps_by_sat = {}
+        # Node -> member set of its component; a component's nodes share one
+        # set, so a split relabels only the pieces that break off
+        self._component = {}
+        self._component_count = 0
+        # Triangle counts and the running sum of local clustering
+        self._triangles = {}
+        self._clustering = {}
+        self._clustering_sum = 0.0
+
+    @classmethod
+    def from_columns(cls, ids, lang_codes, exp, sat, languages, min_score=MIN_SCORE):
+        """Bootstrap from roster columns: edges in bulk, metrics computed once."""
+        service = cls(min_score)
+        graph = service.graph
+        for dev_id, code, e, s in zip(ids.tolist(), lang_codes.tolist(),
+                                      exp.tolist(), sat.tolist()):
+            if dev_id in graph:
+                raise ValueError(f"developer {dev_id} already present")
+            graph.add_node(dev_id, lang=languages[code], exp=e, sat=s)
+            service._index(dev_id, languages[code], e, s)
+        for ii, jj, w in iter_indexed_edges(lang_codes, exp, sat, min_score):
+            graph.add_weighted_edges_from(zip(ids[ii].tolist(), ids[jj].tolist(), w.tolist()))
+
+        for members in nx.connected_components(graph):
+            for node in members:
+                service._component[node] = members
+            service._component_count += 1
+        service._triangles = nx.triangles(graph)
+        service._clustering = dict.fromkeys(graph, 0.0)
+        for node in graph:
+            service._refresh_clustering(node)
+        return service
+
+    # ------------------------------------------------------------------
+    # Deltas
+    # ------------------------------------------------------------------
+    def apply(self, deltas):
+        """Apply ('add'|'update', dev_id, lang, exp, sat) / ('remove', dev_id) deltas."""
+        for op, dev_id, *values in deltas:
+            if op == 'add':
+                self.add_developer(dev_id, *values)
+            elif op == 'update':
+                self.update_developer(dev_id, *values)
+            elif op == 'remove':
+                self.remove_developer(dev_id)
+            else:
+                raise ValueError(f"unknown delta operation: {op!r}")
+
+    def add_developer(self, dev_id, lang, exp, sat):
+        if dev_id in self.graph:
+            raise ValueError(f"developer {dev_id} already present")
+        self.graph.add_node(dev_id, lang=lang, exp=exp, sat=sat)
+        self._component[dev_id] = {dev_id}
+        self._component_count += 1
+        self._triangles[dev_id] = 0
+        self._clustering[dev_id] = 0.0
+        for other, weight in self._candidates(dev_id, lang, exp, sat):
+            self._add_edge(dev_id, other, weight)
+        self._index(dev_id, lang, exp, sat)
+
+    def update_developer(self, dev_id, lang=None, exp=None, sat=None):
+        attrs = self.graph.nodes[dev_id]
+        lang = attrs['lang'] if lang is None else lang
+        exp = attrs['exp'] if exp is None else exp
+        sat = attrs['sat'] if sat is None else sat
+        self._unindex(dev_id, attrs['lang'], attrs['exp'], attrs['sat'])
+        attrs.update(lang=lang, exp=exp, sat=sat)
+
+        wanted = dict(self._candidates(dev_id, lang, exp, sat))
+        dropped = [n for n in self.graph[dev_id] if n not in wanted]
+        for other in dropped:
+            self._remove_edge(dev_id, other)
+        for other, weight in wanted.items():
+            if self.graph.has_edge(dev_id, other):
+                self.graph[dev_id][other]['weight'] = weight
+            else:
+                self._add_edge(dev_id, other, weight)
+        self._index(dev_id, lang, exp, sat)
+        if dropped:
+            self._split([dev_id, *dropped])
+
+    def remove_developer(self, dev_id):
+        attrs = self.graph.nodes[dev_id]
+        self._unindex(dev_id, attrs['lang'], attrs['exp'], attrs['sat'])
+        neighbours = list(self.graph[dev_id])
+        for other in neighbours:
+            self._remove_edge(dev_id, other)
+
+        members = self._component.pop(dev_id)
+        members.discard(dev_id)
+        self.graph.remove_node(dev_id)
+        del self._triangles[dev_id]
+        self._clustering_sum -= self._clustering.pop(dev_id)
+        if not members:
+            self._component_count -= 1
+        else:
+            self._split(neighbours)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def number_of_components(self):
+        return self._component_count
+
+    def component_of(self, dev_id):
+        return self._component[dev_id]
+
+    def degree_centrality(self, dev_id):
+        n = self.graph.number_of_nodes()
+        return self.graph.degree(dev_id) / (n - 1) if n > 1 else 1.0
+
+    def clustering(self, dev_id):
+        return self._clustering[dev_id]
+
+    def average_clustering(self):
+        n = self.graph.number_of_nodes()
+        return self._clustering_sum / n if n else 0.0
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _candidates(self, dev_id, lang, exp, sat):
+        """Yield (dev_id, weight) for every developer scoring >= min_score."""
+        seen = set()
+        for e2 in range(exp - EXP_TOLERANCE, exp + EXP_TOLERANCE + 1):
+            for s2 in self._sats_by_exp.get((lang, e2), ()):
+                seen.add((e2, s2))
+        if LANG_SCORE + SAT_SCORE >= self.min_score:
+            for s2 in range(sat - SAT_TOLERANCE, sat + SAT_TOLERANCE + 1):
+                for e2 in self._exps_by_sat.get((lang, s2), ()):
+                    seen.add((e2, s2))
+        for e2, s2 in seen:
+            weight = LANG_SCORE
+            if abs(e2 - exp) <= EXP_TOLERANCE:
+                weight += EXP_SCORE
+            if abs(s2 - sat) <= SAT_TOLERANCE:
+                weight += SAT_SCORE
+            if weight < self.min_score:
+                continue
+            for other in self._cells[(lang, e2, s2)]:
+                if other != dev_id:
+                    yield other, weight
+
+    def _index(self, dev_id, lang, exp, sat):
+        cell = self._cells.setdefault((lang, exp, sat), set())
+        if not cell:
+            self._sats_by_exp.setdefault((lang, exp), set()).add(sat)
+            self._exps_by_sat.setdefault((lang, sat), set()).add(exp)
+        cell.add(dev_id)
+
+    def _unindex(self, dev_id, lang, exp, sat):
+        cell = self._cells[(lang, exp, sat)]
+        cell.discard(dev_id)
+        if not cell:
+            del self._cells[(lang, exp, sat)]
+            self._sats_by_exp[(lang, exp)].discard(sat)
+            self._exps_by_sat[(lang, sat)].discard(exp)
+
+    def _add_edge(self, u, v, weight):
+        common = self.graph[u].keys() & self.graph[v].keys()
+        self.graph.add_edge(u, v, weight=weight)
+        self._bump_triangles(u, v, common, 1)
+        self._union(u, v)
+
+    def _remove_edge(self, u, v):
+        self.graph.remove_edge(u, v)
+        common = self.graph[u].keys() & self.graph[v].keys()
+        self._bump_triangles(u, v, common, -1)
+
+    def _bump_triangles(self, u, v, common, sign):
+        self._triangles[u] += sign * len(common)
+        self._triangles[v] += sign * len(common)
+        for w in common:
+            self._triangles[w] += sign
+            self._refresh_clustering(w)
+        self._refresh_clustering(u)
+        self._refresh_clustering(v)
+
+    def _refresh_clustering(self, node):
+        d = self.graph.degree(node)
+        value = 2 * self._triangles[node] / (d * (d - 1)) if d > 1 else 0.0
+        self._clustering_sum += value - self._clustering[node]
+        self._clustering[node] = value
+
+    def _union(self, u, v):
+        members_u, members_v = self._component[u], self._component[v]
+        if members_u is members_v:
+            return
+        if len(members_u) < len(members_v):
+            members_u, members_v = members_v, members_u
+        members_u |= members_v
+        for node in members_v:
+            self._component[node] = members_u
+        self._component_count -= 1
+
+    def _split(self, seeds):
+        """Split the component holding ``seeds`` if removed edges disconnected it.
+
+        ``seeds`` are the endpoints left behind by the removed edges; every
+        other member still reaches one of them. One breadth-first search
+        starts at each seed and they take turns expanding a node; searches
+        that meet are merged. Once a single search is left the seeds are still
+        connected and nothing changes. A search that runs out of nodes first
+        has walked a whole piece that broke off, so the work is bounded by the
+        size of the pieces (times the number of seeds), not of the component.
+        """
+        seeds = list(dict.fromkeys(seeds))
+        if len(seeds) < 2:
+            return
+        owner = {seed: i for i, seed in enumerate(seeds)}
+        merged_into = list(range(len(seeds)))
+        visited = [{seed} for seed in seeds]
+        frontiers = [deque([seed]) for seed in seeds]
+        active = set(range(len(seeds)))
+        pieces = []
+
+        def search_of(node):
+            i = owner[node]
+            while merged_into[i] != i:
+                merged_into[i] = i = merged_into[merged_into[i]]
+            return i
+
+        while len(active) > 1:
+            for i in list(active):
+                if i not in active:
+                    continue
+                for nbr in self.graph[frontiers[i].popleft()]:
+                    if nbr not in owner:
+                        owner[nbr] = i
+                        visited[i].add(nbr)
+                        frontiers[i].append(nbr)
+                        continue
+                    j = search_of(nbr)
+                    if j != i:
+                        # Keep the larger search and fold the other one into it
+                        if len(visited[i]) < len(visited[j]):
+                            i, j = j, i
+                        visited[i] |= visited[j]
+                        frontiers[i].extend(frontiers[j])
+                        merged_into[j] = i
+                        active.discard(j)
+                if not frontiers[i]:
+                    pieces.append(visited[i])
+                    active.discard(i)
+                if len(active) < 2:
+                    break
+
+        rest = self._component[seeds[0]]
+        for piece in pieces:
+            rest -= piece
+            for node in piece:
+                self._component[node] = piece
+        self._component_count += len(pieces)
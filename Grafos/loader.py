@@ -0,0 +1,164 @@
+"""Streaming loader for software_dev.csv into typed columnar storage.
+
+The file is read in chunks and every column is appended to a compact
+``array.array``; languages are interned into a small code table. The header
+is validated once, so per-row work is limited to the numeric conversions.
+"""
+import csv
+from array import array
+
+# Column name -> array typecode ('lang' columns are stored as interned codes)
+SCHEMA = {
+    'Dev_ID': 'q',
+    'Experiencia_Anios': 'i',
+    'Lenguaje_Principal': 'lang',
+    'Bugs_Mensuales': 'i',
+    'Lineas_Cod_Diarias': 'd',
+    'Satisfaccion': 'i',
+    'Horas_Semanales': 'd',
+    'Certificaciones': 'i',
+}
+LANG_TYPECODE = 'H'
+
+DEFAULT_CHUNK = 65536
+
+
+class DevTable:
+    """Developer roster stored as one typed array per CSV column."""
+
+    def __init__(self):
+        self.columns = {name: array(LANG_TYPECODE if code == 'lang' else code)
+                        for name, code in SCHEMA.items()}
+        self.languages = []
+        self._lang_codes = {}
+        self._row_index = None
+
+    def __len__(self):
+        return len(self.columns['Dev_ID'])
+
+    def intern_language(self, name):
+        """Return the code for ``name``, assigning a new one if unseen."""
+        code = self._lang_codes.get(name)
+        if code is None:
+            code = self._lang_codes[name] = len(self.languages)
+            self.languages.append(name)
+        return code
+
+    def language(self, row):
+        return self.languages[self.columns['Lenguaje_Principal'][row]]
+
+    def numpy(self, name):
+        """Zero-copy NumPy view of a column (do not append while it is alive)."""
+        import numpy as np
+        col = self.columns[name]
+        return np.frombuffer(col, dtype=col.typecode)
+
+    def row_of(self, dev_id):
+        """Row holding ``dev_id``, via a Dev_ID index built on first use."""
+        if self._row_index is None:
+            self._row_index = {dev_id: i for i, dev_id in enumerate(self.columns['Dev_ID'])}
+        return self._row_index[dev_id]
+
+    def row(self, i):
+        """Materialize row ``i`` as a dict keyed like the CSV header."""
+        values = {name: col[i] for name, col in self.columns.items()}
+        values['Lenguaje_Principal'] = self.languages[values['Lenguaje_Principal']]
+        return values
+
+    def append_chunk(self, rows, positions, lines=None):
+        """Parse a chunk of raw CSV rows and append it column by column.
+
+        ``lines`` holds the file line of each row, for error messages. Each
+        column is converted straight into an array of its typecode, so a
+        value out of range fails like a malformed one.
+        """
+        parsed = {}
+        # Languages first seen in this chunk, registered only if it all parses
+        new_languages = {}
+        for name, code in SCHEMA.items():
+            idx = positions[name]
+            raw = [r[idx] for r in rows]
+            if code == 'lang':
+                convert = self._language_code(new_languages)
+            else:
+                convert = float if code == 'd' else int
+            typecode = self.columns[name].typecode
+            try:
+                parsed[name] = array(typecode, map(convert, raw))
+            except (ValueError, OverflowError) as exc:
+                # Only now look for the offending row
+                bad = next(i for i, v in enumerate(raw) if not _converts(typecode, convert, v))
+                where = f"line {lines[bad]}" if lines is not None else f"row {bad}"
+                raise ValueError(f"{where}: invalid {name!r} value: {exc}") from None
+        # Commit only once the whole chunk parsed, so columns never go ragged
+        for language in new_languages:
+            self.intern_language(language)
+        for name, values in parsed.items():
+            self.columns[name].extend(values)
+        self._row_index = None
+
+    def _language_code(self, new_languages):
+        """Converter from a raw language to its code, collecting unseen ones."""
+        known, base = self._lang_codes, len(self.languages)
+
+        def convert(value):
+            value = value.strip()
+            code = known.get(value)
+            if code is None:
+                code = new_languages.setdefault(value, base + len(new_languages))
+            return code
+        return convert
+
+
+def _converts(typecode, convert, value):
+    try:
+        array(typecode, [convert(value)])
+    except (ValueError, OverflowError):
+        return False
+    return True
+
+
+def read_header(reader):
+    """Validate the header once and return column name -> position."""
+    header = [h.strip() for h in next(reader, [])]
+    missing = [name for name in SCHEMA if name not in header]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+    return {name: header.index(name) for name in SCHEMA}
+
+
+def iter_chunks(f, chunk_size=DEFAULT_CHUNK):
+    """Yield (lines, positions, rows) chunks from an open CSV file.
+
+    ``lines`` gives the physical line each row starts on, counting the blank
+    rows skipped and quoted fields spanning several lines.
+    """
+    reader = csv.reader(f)
+    positions = read_header(reader)
+    width = max(positions.values()) + 1
+    chunk = []
+    lines = array('q')
+    line_no = reader.line_num
+    for row in reader:
+        start, line_no = line_no + 1, reader.line_num
+        if not row:
+            continue
+        if len(row) < width:
+            raise ValueError(f"line {start}: expected at least {width} fields")
+        chunk.append(row)
+        lines.append(start)
+        if len(chunk) >= chunk_size:
+            yield lines, positions, chunk
+            chunk = []
+            lines = array('q')
+    if chunk:
+        yield lines, positions, chunk
+
+
+def load_devs(path, chunk_size=DEFAULT_CHUNK, table=None):
+    """Stream ``path`` into a DevTable (or extend ``table``) chunk by chunk."""
+    table = DevTable() if table is None else table
+    with open(path, 'r', newline='') as f:
+        for lines, positions, chunk in iter_chunks(f, chunk_size):
+            table.append_chunk(chunk, positions, lines)
+    return table
@@ -0,0 +1,117 @@
+"""Network metrics for large developer graphs.
+
+Exact local clustering is computed in parallel by partitioning the nodes
+across worker processes; a sampled estimator with a Hoeffding error bound
+is available when an approximate average is good enough. Hubs are taken
+with a heap instead of sorting every node.
+"""
+import heapq
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many nodes process start-up costs more than it saves
+PARALLEL_MIN_NODES = 5000
+
+_adjacency = None
+
+
+def adjacency_sets(G):
+    """Plain dict of neighbour sets, cheap to ship to worker processes."""
+    return {n: set(nbrs) for n, nbrs in G.adj.items()}
+
+
+def local_clustering(adj, node):
+    nbrs = adj[node]
+    d = len(nbrs)
+    if d < 2:
+        return 0.0
+    links = sum(len(nbrs & adj[u]) for u in nbrs)
+    return links / (d * (d - 1))
+
+
+def _init_worker(adj):
+    global _adjacency
+    _adjacency = adj
+
+
+def _clustering_chunk(nodes):
+    return [(n, local_clustering(_adjacency, n)) for n in nodes]
+
+
+def clustering(G, workers=None, chunks_per_worker=4):
+    """Exact local clustering of every node, split across ``workers`` processes."""
+    adj = adjacency_sets(G)
+    nodes = list(adj)
+    if workers == 1 or len(nodes) < PARALLEL_MIN_NODES:
+        return {n: local_clustering(adj, n) for n in nodes}
+
+    workers = workers or os.cpu_count() or 1
+    size = max(1, math.ceil(len(nodes) / (workers * chunks_per_worker)))
+    parts = [nodes[i:i + size] for i in range(0, len(nodes), size)]
+    result = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(adj,)) as pool:
+        for chunk in pool.map(_clustering_chunk, parts):
+            result.update(chunk)
+    return result
+
+
+def average_clustering(G, workers=None):
+    n = G.number_of_nodes()
+    return sum(clustering(G, workers).values()) / n if n else 0.0
+
+
+def check_sampling(samples, confidence):
+    """Reject sample counts below 1 and confidences outside (0, 1)."""
+    if samples < 1:
+        raise ValueError(f"samples must be at least 1, got {samples}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+
+
+def hoeffding_samples(error, confidence=0.95):
+    """Samples needed so the estimate is within ``error`` with ``confidence``."""
+    if error <= 0:
+        raise ValueError(f"error must be positive, got {error}")
+    check_sampling(1, confidence)
+    return math.ceil(math.log(2 / (1 - confidence)) / (2 * error ** 2))
+
+
+def hoeffding_error(samples, confidence=0.95):
+    """Error bound of a mean of ``samples`` values in [0, 1] at ``confidence``."""
+    check_sampling(samples, confidence)
+    return math.sqrt(math.log(2 / (1 - confidence)) / (2 * samples))
+
+
+def approximate_average_clustering(G, samples=1000, confidence=0.95, seed=None):
+    """Estimate average clustering from ``samples`` random nodes.
+
+    Returns (estimate, error): local clustering lies in [0, 1], so by
+    Hoeffding's inequality the true average is within ``error`` of the
+    estimate with probability ``confidence``.
+    """
+    check_sampling(samples, confidence)
+    nodes = list(G)
+    if not nodes:
+        return 0.0, 0.0
+    rng = random.Random(seed)
+    adj = G.adj
+    total = 0.0
+    for _ in range(samples):
+        node = rng.choice(nodes)
+        nbrs = adj[node]
+        d = len(nbrs)
+        if d > 1:
+            links = sum(len(nbrs.keys() & adj[u].keys()) for u in nbrs)
+            total += links / (d * (d - 1))
+    return total / samples, hoeffding_error(samples, confidence)
+
+
+def top_hubs(G, k=3):
+    """The ``k`` nodes with the highest degree centrality, as (node, centrality)."""
+    n = G.number_of_nodes()
+    scale = 1 / (n - 1) if n > 1 else 1.0
+    return [(node, deg * scale)
+            for node, deg in heapq.nlargest(k, G.degree, key=lambda item: item[1])]
@@ -0,0 +1,202 @@
+"""Rendering stage for the developer network report.
+
+Kept apart from the analysis so batch runs can skip it entirely: matplotlib
+is only imported inside the worker functions. Each panel is drawn in its own
+process, spring layouts are cached on disk keyed by a graph fingerprint, and
+finished panels and the stitched report are cached too, so re-rendering
+unchanged graphs is little more than a file copy.
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+
+DEFAULT_CACHE_DIR = '.render_cache'
+DEFAULT_DPI = 300
+PANEL_SIZE = (8, 7)
+TITLE_SIZE = (16, 0.8)
+TITLE = 'Software Developer Network Analysis'
+
+LANG_COLORS = {'Python': '#3776ab', 'Java': '#f89820', 'C#': '#68217a', 'R': '#276dc3'}
+
+
+def graph_fingerprint(G, *extra):
+    """Stable hash of a graph's nodes, edges and attributes (plus ``extra``)."""
+    h = hashlib.sha1()
+    h.update(type(G).__name__.encode())
+    for item in sorted(repr((n, sorted(d.items()))) for n, d in G.nodes(data=True)):
+        h.update(item.encode())
+    for item in sorted(repr((u, v, sorted(d.items()))) for u, v, d in G.edges(data=True)):
+        h.update(item.encode())
+    for item in extra:
+        h.update(repr(item).encode())
+    return h.hexdigest()
+
+
+def cached_spring_layout(G, cache_dir=DEFAULT_CACHE_DIR, **params):
+    """``nx.spring_layout`` memoized on disk by graph fingerprint and params."""
+    key = graph_fingerprint(G, sorted(params.items()))
+    path = os.path.join(cache_dir, f"layout-{key}.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            return {node: tuple(xy) for node, *xy in json.load(f)}
+    pos = nx.spring_layout(G, **params)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump([[node, float(x), float(y)] for node, (x, y) in pos.items()], f)
+    return pos
+
+
+# ============================================================================
+# Panels (run inside worker processes)
+# ============================================================================
+def draw_similarity(ax, G_sim, cache_dir):
+    import matplotlib.pyplot as plt
+    node_colors = [LANG_COLORS.get(G_sim.nodes[n]['lang'], 'gray') for n in G_sim.nodes()]
+    pos = cached_spring_layout(G_sim, cache_dir, k=0.5, seed=42)
+    nx.draw(G_sim, pos, node_color=node_colors, node_size=300, with_labels=True,
+            font_size=8, font_weight='bold', edge_color='gray', alpha=0.7, ax=ax)
+    ax.set_title('Developer Similarity Network\n(Colored by Language)', fontweight='bold')
+    legend_handles = [
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor=c,
+                   markersize=10, label=l)
+        for l, c in LANG_COLORS.items()
+    ]
+    ax.legend(handles=legend_handles, loc='upper right', fontsize=8)
+
+
+def draw_bipartite(ax, G_bi, cache_dir):
+    lang_nodes = [n for n in G_bi.nodes() if n.startswith('L_')]
+    exp_nodes = [n for n in G_bi.nodes() if n.startswith('E_')]
+    pos = {**{n: (0, i*2) for i, n in enumerate(lang_nodes)},
+           **{n: (3, i*2.5) for i, n in enumerate(exp_nodes)}}
+    weights = [G_bi[u][v]['weight'] for u, v in G_bi.edges()]
+
+    nx.draw_networkx_nodes(G_bi, pos, lang_nodes, node_color='lightblue',
+                           node_size=800, node_shape='s', ax=ax)
+    nx.draw_networkx_nodes(G_bi, pos, exp_nodes, node_color='lightcoral',
+                           node_size=800, node_shape='o', ax=ax)
+    nx.draw_networkx_edges(G_bi, pos, width=[w*0.5 for w in weights], alpha=0.5, ax=ax)
+    nx.draw_networkx_labels(G_bi, pos, {n: n.split('_')[1] for n in G_bi.nodes()},
+                            font_size=9, ax=ax)
+    ax.set_title('Language-Experience Distribution\n(Edge width = dev count)',
+                 fontweight='bold')
+    ax.axis('off')
+
+
+def draw_performance(ax, G_perf, cache_dir):
+    pos = cached_spring_layout(G_perf, cache_dir, k=1.5, seed=42)
+    edge_colors = ['green' if G_perf[u][v]['influence'] == 'pos' else 'red'
+                   for u, v in G_perf.edges()]
+    edge_widths = [G_perf[u][v]['weight']*5 for u, v in G_perf.edges()]
+    nx.draw(G_perf, pos, node_color='lightgreen', node_size=2000, with_labels=True,
+            font_size=9, font_weight='bold', edge_color=edge_colors, width=edge_widths,
+            arrows=True, arrowsize=20, connectionstyle='arc3,rad=0.1', ax=ax)
+    ax.set_title('Performance Dependencies\n(Green=Positive, Red=Negative)',
+                 fontweight='bold')
+
+
+def draw_stats(ax, stats, cache_dir):
+    ax.axis('off')
+    table = ax.table(cellText=stats, colLabels=['Metric', 'Value'],
+                     cellLoc='left', loc='center', colWidths=[0.6, 0.3])
+    table.auto_set_font_size(False)
+    table.set_fontsize(10)
+    table.scale(1, 2)
+    for i in range(2):
+        table[(0, i)].set_facecolor('#4CAF50')
+        table[(0, i)].set_text_props(weight='bold', color='white')
+    ax.set_title('Network Statistics', fontweight='bold', pad=20)
+
+
+def draw_title(ax, title, cache_dir):
+    ax.axis('off')
+    ax.text(0.5, 0.5, title, fontsize=16, fontweight='bold', ha='center', va='center')
+
+
+PANELS = {
+    'similarity': (draw_similarity, PANEL_SIZE),
+    'bipartite': (draw_bipartite, PANEL_SIZE),
+    'performance': (draw_performance, PANEL_SIZE),
+    'stats': (draw_stats, PANEL_SIZE),
+    'title': (draw_title, TITLE_SIZE),
+}
+
+
+def panel_key(name, data, dpi):
+    if isinstance(data, nx.Graph):
+        return graph_fingerprint(data, name, dpi)
+    return hashlib.sha1(repr((name, data, dpi)).encode()).hexdigest()
+
+
+def render_panel(name, data, dpi=DEFAULT_DPI, cache_dir=DEFAULT_CACHE_DIR):
+    """Draw one panel into PNG bytes, reusing the cached image when unchanged."""
+    draw, figsize = PANELS[name]
+    path = os.path.join(cache_dir, f"panel-{panel_key(name, data, dpi)}.png")
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=figsize)
+    draw(ax, data, cache_dir)
+    fig.tight_layout()
+    buf = io.BytesIO()
+    # Fixed figure size (no tight bbox) so panels tile exactly when stitched
+    fig.savefig(buf, format='png', dpi=dpi)
+    plt.close(fig)
+    png = buf.getvalue()
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(png)
+    return png
+
+
+def _decode(png):
+    import matplotlib.image as mpimg
+    img = mpimg.imread(io.BytesIO(png), format='png')
+    return (img * 255).round().astype(np.uint8)
+
+
+def render_report(G_sim, G_bi, G_perf, stats, out_path='developer_network_analysis.png',
+                  dpi=DEFAULT_DPI, workers=None, cache_dir=DEFAULT_CACHE_DIR, show=False):
+    """Render the 2x2 report, one panel per worker process, and save it."""
+    jobs = [('title', TITLE), ('similarity', G_sim), ('bipartite', G_bi),
+            ('performance', G_perf), ('stats', [list(row) for row in stats])]
+    report_key = hashlib.sha1(
+        ''.join(panel_key(name, data, dpi) for name, data in jobs).encode()).hexdigest()
+    report_path = os.path.join(cache_dir, f"report-{report_key}.png")
+    if os.path.exists(report_path) and not show:
+        shutil.copyfile(report_path, out_path)
+        return out_path
+
+    if workers == 1:
+        pngs = [render_panel(name, data, dpi, cache_dir) for name, data in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render_panel, name, data, dpi, cache_dir)
+                       for name, data in jobs]
+            pngs = [f.result() for f in futures]
+
+    title, sim, bi, perf, table = (_decode(png) for png in pngs)
+    image = np.vstack([title, np.hstack([sim, bi]), np.hstack([perf, table])])
+
+    import matplotlib.image as mpimg
+    mpimg.imsave(out_path, image, dpi=dpi)
+    shutil.copyfile(out_path, report_path)
+
+    if show:
+        import matplotlib.pyplot as plt
+        plt.figure(figsize=(16, 14.8))
+        plt.imshow(image)
+        plt.axis('off')
+        plt.show()
+    return out_path
@@ -0,0 +1,153 @@
+"""Vectorized similarity engine for the developer network.
+
+Scores every pair of developers in square tiles of the upper triangle so
+memory stays bounded by ``block * block`` regardless of roster size.
+"""
+import numpy as np
+
+# Score contributed by each matching criterion and minimum score for an edge
+LANG_SCORE = 3
+EXP_SCORE = 2
+SAT_SCORE = 1
+EXP_TOLERANCE = 2
+SAT_TOLERANCE = 1
+MIN_SCORE = 4
+
+DEFAULT_BLOCK = 2048
+
+
+def score_tile(lang, exp, sat, rows, cols):
+    """Return the int8 score matrix between the ``rows`` and ``cols`` slices."""
+    score = np.where(lang[rows, None] == lang[None, cols], LANG_SCORE, 0).astype(np.int8)
+    score += np.where(np.abs(exp[rows, None] - exp[None, cols]) <= EXP_TOLERANCE,
+                      EXP_SCORE, 0).astype(np.int8)
+    score += np.where(np.abs(sat[rows, None] - sat[None, cols]) <= SAT_TOLERANCE,
+                      SAT_SCORE, 0).astype(np.int8)
+    return score
+
+
+def iter_similarity_edges(lang, exp, sat, block=DEFAULT_BLOCK, min_score=MIN_SCORE):
+    """Yield (row_i, row_j, weight) arrays for each tile, with row_i < row_j."""
+    n = len(lang)
+    for i0 in range(0, n, block):
+        rows = slice(i0, min(i0 + block, n))
+        for j0 in range(i0, n, block):
+            cols = slice(j0, min(j0 + block, n))
+            score = score_tile(lang, exp, sat, rows, cols)
+            if j0 == i0:
+                # Diagonal tile: keep only the strict upper triangle
+                score = np.triu(score, k=1)
+            ii, jj = np.nonzero(score >= min_score)
+            if len(ii):
+                yield ii + i0, jj + j0, score[ii, jj]
+
+
+def _pairs_between(a, b):
+    """All (i, j) row pairs taking i from ``a`` and j from ``b`` (a != b)."""
+    return np.repeat(a, len(b)), np.tile(b, len(a))
+
+
+def _pairs_within(a):
+    """All unordered row pairs inside ``a``."""
+    iu, ju = np.triu_indices(len(a), k=1)
+    return a[iu], a[ju]
+
+
+def iter_indexed_edges(lang, exp, sat, min_score=MIN_SCORE, report=None):
+    """Yield (row_i, row_j, weight) arrays scoring only compatible buckets.
+
+    Developers are bucketed into (language, experience, satisfaction) cells.
+    Since a different language caps the score at EXP_SCORE + SAT_SCORE, only
+    cells of the same language whose experience is within EXP_TOLERANCE or
+    whose satisfaction is within SAT_TOLERANCE can produce an edge. Every
+    pair of two cells has the same score, so cell pairs below ``min_score``
+    are dropped whole: every scored pair is an edge and work grows with the
+    output size.
+
+    If ``report`` is a dict it is filled with total, candidate and pruned
+    pair counts once the generator is exhausted.
+    """
+    if LANG_SCORE >= min_score or EXP_SCORE + SAT_SCORE >= min_score:
+        raise ValueError("indexed builder requires a language match plus one "
+                         "more criterion; use iter_similarity_edges instead")
+
+    n = len(lang)
+    order = np.lexsort((sat, exp, lang))
+    keys = np.stack((lang[order], exp[order], sat[order]), axis=1)
+    starts = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+    starts = np.concatenate(([0], starts, [n])).astype(np.int64)
+
+    cells = {}
+    sats_by_exp = {}
+    exps_by_sat = {}
+    for start, stop in zip(starts[:-1].tolist(), starts[1:].tolist()):
+        if start == stop:
+            continue
+        g, e, s = keys[start].tolist()
+        cells[(g, e, s)] = order[start:stop]
+        sats_by_exp.setdefault((g, e), []).append(s)
+        exps_by_sat.setdefault((g, s), []).append(e)
+
+    # Cells matching on satisfaction alone score LANG_SCORE + SAT_SCORE
+    sat_only = LANG_SCORE + SAT_SCORE >= min_score
+    candidates = 0
+    for key, rows in cells.items():
+        g, e, s = key
+        parts_i, parts_j, parts_w = [], [], []
+        if len(rows) > 1 and LANG_SCORE + EXP_SCORE + SAT_SCORE >= min_score:
+            ii, jj = _pairs_within(rows)
+            parts_i.append(ii)
+            parts_j.append(jj)
+            parts_w.append(np.full(len(ii), LANG_SCORE + EXP_SCORE + SAT_SCORE, dtype=np.int8))
+
+        partners = []
+        for e2 in range(e - EXP_TOLERANCE, e + EXP_TOLERANCE + 1):
+            partners.extend((g, e2, s2) for s2 in sats_by_exp.get((g, e2), ()))
+        if sat_only:
+            for s2 in range(s - SAT_TOLERANCE, s + SAT_TOLERANCE + 1):
+                partners.extend((g, e2, s2) for e2 in exps_by_sat.get((g, s2), ())
+                                if abs(e2 - e) > EXP_TOLERANCE)
+        for other in partners:
+            # Each unordered cell pair is visited once, from its smaller key
+            if other <= key:
+                continue
+            score = LANG_SCORE
+            if abs(other[1] - e) <= EXP_TOLERANCE:
+                score += EXP_SCORE
+            if abs(other[2] - s) <= SAT_TOLERANCE:
+                score += SAT_SCORE
+            if score < min_score:
+                continue
+            ii, jj = _pairs_between(rows, cells[other])
+            parts_i.append(ii)
+            parts_j.append(jj)
+            parts_w.append(np.full(len(ii), score, dtype=np.int8))
+
+        if parts_i:
+            ii = np.concatenate(parts_i)
+            candidates += len(ii)
+            yield ii, np.concatenate(parts_j), np.concatenate(parts_w)
+
+    if report is not None:
+        total = n * (n - 1) // 2
+        report['total_pairs'] = total
+        report['candidate_pairs'] = candidates
+        report['pruned_pairs'] = total - candidates
+
+
+def add_similarity_edges(G, ids, lang, exp, sat, block=DEFAULT_BLOCK, min_score=MIN_SCORE,
+                         method='indexed', report=None):
+    """Add every pair scoring at least ``min_score`` to ``G`` as a weighted edge.
+
+    ``method`` selects the bucketed builder ('indexed') or the tiled
+    all-pairs scorer ('blocked').
+    """
+    if method == 'indexed':
+        edges = iter_indexed_edges(lang, exp, sat, min_score, report)
+    elif method == 'blocked':
+        edges = iter_similarity_edges(lang, exp, sat, block, min_score)
+    else:
+        raise ValueError(f"unknown similarity method: {method!r}")
+    for ii, jj, w in edges:
+        G.add_weighted_edges_from(zip(ids[ii].tolist(), ids[jj].tolist(), w.tolist()))
+    return G
@@ -0,0 +1,93 @@
+"""Non-interactive runner for the playlist menu.
+
+Reads a command stream (a file or stdin) and runs every command through the
+same handlers map the interactive menu uses (listadoble.build_handlers). A
+command is a menu option followed by the answers its prompts would read, in
+order, either separated by ``|`` or as a JSON object:
+
+    1|Song title|Artist|3:45
+    9|12
+    {"op": "3", "args": ["Song title"]}
+
+Blank lines and lines starting with ``#`` are skipped; option 0 ends the
+batch. The answers reach the handlers through the ``read`` callable of
+build_handlers. Handler output is collected in memory and written in large
+chunks (or dropped with --quiet); a failing command, including an option
+that is not in the menu, counts as an error and leaves no output behind.
+Per-option timings go to stderr at the end. Command parsing, buffering and
+timings come from Comun/lotes_menu.py, shared with the task list runner.
+
+    python batch.py commands.txt --playlist station.jsonl
+    python batch.py - --quiet --pooled < commands.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import Iterable, List, Optional, TextIO, Tuple
+
+import playlist_io
+from listadoble import Playlist, Reader, build_handlers
+
+# The list folders are plain scripts: the shared module lives next to them
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Comun"))
+import lotes_menu
+
+# JSON commands use these keys for the option and its answers
+KEYS = ("op", "args")
+
+
+def run_batch(lines: Iterable[str], playlist: Optional[Playlist] = None,
+              out: Optional[TextIO] = None,
+              quiet: bool = False) -> Tuple[Playlist, lotes_menu.Estadisticas]:
+    # See lotes_menu.ejecutar_comandos for error handling and output
+    playlist = Playlist() if playlist is None else playlist
+    answers = lotes_menu.RespuestasComando()
+    handlers = build_handlers(playlist, answers)
+
+    def dispatch(option: str, read: Reader) -> bool:
+        if option == "0":
+            return False
+        handler = handlers.get(option)
+        if handler is None:
+            raise ValueError(f"opcion desconocida {option!r}")
+        handler()
+        return True
+
+    stats = lotes_menu.ejecutar_comandos(lines, dispatch, out, quiet, KEYS, answers)
+    return playlist, stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run playlist menu commands in batch")
+    parser.add_argument("commands", help="command file, or - to read stdin")
+    parser.add_argument("--playlist", help=".m3u or .jsonl file loaded first and saved at the end")
+    parser.add_argument("--pooled", action="store_true", help="use the PooledPlaylist backend")
+    parser.add_argument("--quiet", action="store_true", help="drop handler output, keep timings")
+    args = parser.parse_args(argv)
+
+    if args.pooled:
+        from pooled_playlist import PooledPlaylist
+
+        playlist = PooledPlaylist()
+    else:
+        playlist = Playlist()
+    if args.playlist and os.path.exists(args.playlist):
+        playlist_io.load(args.playlist, playlist)
+
+    commands = sys.stdin if args.commands == "-" else open(args.commands, encoding="utf-8-sig")
+    try:
+        _, stats = run_batch(commands, playlist, quiet=args.quiet)
+    finally:
+        if commands is not sys.stdin:
+            commands.close()
+    if args.playlist:
+        playlist_io.save(playlist, args.playlist)
+    print(stats.informe(), file=sys.stderr)
+    return 1 if stats.errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
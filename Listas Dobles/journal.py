@@ -0,0 +1,141 @@
+"""Undo/redo journal for a Playlist.
+
+PlaylistJournal observes a playlist and, for every change, records the
+operation that reverts it. Entries hold the nodes themselves, so undoing a
+removal relinks the very same node after its old neighbour and redoing an
+insertion puts it back; neither copies songs. Undo and redo pop one entry,
+apply it and push the inverse on the other stack.
+
+``clear`` on an observed playlist hands its whole state (nodes, position
+index, title/artist indexes) to the journal in O(1), so undoing an
+accidental clear is O(1) as well. Those snapshots are the only entries whose
+size grows with the playlist: the journal keeps at most ``max_snapshots`` of
+them and at most ``limit`` entries overall, forgetting the oldest ones.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Deque, List, Tuple
+
+if TYPE_CHECKING:
+    from listadoble import Playlist
+
+Entry = Tuple[Any, ...]
+
+
+class PlaylistJournal:
+    def __init__(self, playlist: Playlist, limit: int = 1000, max_snapshots: int = 2) -> None:
+        self.playlist = playlist
+        self.max_snapshots = max_snapshots
+        self._undo: Deque[Entry] = deque(maxlen=limit)
+        self._redo: List[Entry] = []
+        self._applying = False
+        playlist.add_observer(self._record)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> bool:
+        if not self._undo:
+            return False
+        with self._locked():
+            self._redo.append(self._apply(self._undo.pop()))
+        return True
+
+    def redo(self) -> bool:
+        if not self._redo:
+            return False
+        with self._locked():
+            self._undo.append(self._apply(self._redo.pop()))
+        return True
+
+    def _locked(self):
+        # A SharedPlaylist must not be edited while listeners move their cursors
+        lock = getattr(self.playlist, "lock", None)
+        return lock.writing() if lock is not None else nullcontext()
+
+    def detach(self) -> None:
+        self.playlist.remove_observer(self._record)
+        self._undo.clear()
+        self._redo.clear()
+
+    def _record(self, event: str, *details: Any) -> None:
+        if self._applying:
+            return
+        if event == "link":
+            # Callers move current after linking, so this is still the old one
+            entry: Entry = ("unlink", details[0], self.playlist.current)
+        elif event == "unlink":
+            node, prev, was_current = details
+            entry = ("link", prev, node, was_current)
+        elif event == "splice":
+            entry = ("cut", *details)
+        elif event == "extract":
+            entry = ("paste", *details)
+        elif event == "clear":
+            entry = ("restore", details[0])
+        else:
+            return
+        self._undo.append(entry)
+        self._redo.clear()
+        if entry[0] == "restore":
+            self._drop_old_snapshots()
+
+    def _drop_old_snapshots(self) -> None:
+        snapshots = sum(1 for entry in self._undo if entry[0] == "restore")
+        while snapshots > self.max_snapshots:
+            if self._undo.popleft()[0] == "restore":
+                snapshots -= 1
+
+    def _apply(self, entry: Entry) -> Entry:
+        # Runs the entry on the playlist and returns the entry that reverts it
+        playlist = self.playlist
+        self._applying = True
+        try:
+            kind = entry[0]
+            if kind == "unlink":
+                _, node, current = entry
+                prev, was_current = node.prev, playlist.current is node
+                playlist._unlink_node(node)
+                playlist.current = current or playlist.current
+                return ("link", prev, node, was_current)
+            if kind == "link":
+                _, prev, node, make_current = entry
+                current = playlist.current
+                playlist._link_after(prev, node)
+                if make_current or playlist.current is None:
+                    playlist.current = node
+                return ("unlink", node, current)
+            if kind == "cut":
+                _, first, last, source = entry
+                prev, current = first.prev, playlist.current
+                piece = playlist.extract(playlist.position_of(first), playlist.position_of(last))
+                if source.is_empty():
+                    # Give the nodes back to the playlist they were spliced from:
+                    # an older "paste" entry may still refer to it
+                    source._restore_state(piece._take_state())
+                    piece = source
+                return ("paste", piece, prev, piece.current is current)
+            if kind == "paste":
+                _, piece, prev, had_current = entry
+                first, last, current = piece.head, piece.tail, piece.current
+                playlist._splice_after(prev, piece)
+                if had_current:
+                    playlist.current = current
+                return ("cut", first, last, piece)
+            if kind == "restore":
+                playlist._take_state()
+                playlist._restore_state(entry[1])
+                return ("wipe",)
+            if kind == "wipe":
+                return ("restore", playlist._take_state())
+            raise ValueError(f"unknown journal entry: {kind!r}")
+        finally:
+            self._applying = False
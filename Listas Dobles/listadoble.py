@@ -2,16 +2,61 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from journal import PlaylistJournal
+from position_index import PositionIndex
+from shuffle import ShuffleOrder
+
+REPEAT_MODES = ("off", "one", "all")
+# Reads the answer to a prompt, like input(); the batch runner feeds its own
+Reader = Callable[[str], str]
+
+
+@lru_cache(maxsize=4096)
+def parse_duration(text: str) -> Optional[int]:
+    # "245", "4:05" or "1:02:03" -> seconds; None when empty or malformed.
+    # Cached: bulk loads repeat the same few hundred durations
+    parts = text.strip().split(":")
+    if len(parts) > 3 or not all(part.isdigit() for part in parts):
+        return None
+    if any(int(part) >= 60 for part in parts[1:]):
+        return None
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def format_duration(seconds: int) -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
 
 
 @dataclass
 class Song:
+    # seconds and location are not dataclass fields: seconds is parsed once
+    # from duration, location (file path or URL) is only known for songs read
+    # from a playlist file. Artist names and durations repeat a lot, so they
+    # are interned.
+    __slots__ = ("title", "artist", "duration", "seconds", "location")
+
     title: str
     artist: str
     duration: str
 
+    def __post_init__(self) -> None:
+        self.artist = sys.intern(self.artist)
+        self.duration = sys.intern(self.duration)
+        self.seconds = parse_duration(self.duration)
+        self.location = ""
+
     def display(self) -> str:
         parts = [self.title]
         if self.artist:
@@ -22,12 +67,16 @@ class Song:
 
 
 class SongNode:
-    __slots__ = ("song", "prev", "next")
+    # weight plus left/right/parent/size/total/priority belong to the
+    # playlist's PositionIndex; weight is the song length in seconds
+    __slots__ = ("song", "prev", "next", "weight",
+                 "left", "right", "parent", "size", "total", "priority")
 
     def __init__(self, song: Song) -> None:
         self.song: Song = song
         self.prev: Optional[SongNode] = None
         self.next: Optional[SongNode] = None
+        self.weight: int = song.seconds or 0
 
 
 class Playlist:
@@ -36,6 +85,14 @@ class Playlist:
         self.tail: Optional[SongNode] = None
         self.current: Optional[SongNode] = None
         self._size: int = 0
+        self._positions = PositionIndex()
+        # casefolded title/artist -> nodes (dicts used as insertion-ordered sets)
+        self._by_title: Dict[str, Dict[SongNode, None]] = {}
+        self._by_artist: Dict[str, Dict[SongNode, None]] = {}
+        self._shuffle: Optional[ShuffleOrder] = None
+        self.repeat: str = "off"
+        # Called as observer(event, *details) after each structural change
+        self._observers: List[Callable[..., None]] = []
 
     def is_empty(self) -> bool:
         return self._size == 0
@@ -44,6 +101,10 @@ class Playlist:
         return self._size
 
     def _append_node(self, node: SongNode) -> None:
+        self._positions.insert_after(self.tail, node)
+        self._index_node(node)
+        if self._shuffle is not None:
+            self._shuffle.add(node)
         if self.tail is None:
             self.head = self.tail = node
         else:
@@ -51,6 +112,116 @@ class Playlist:
             node.prev = self.tail
             self.tail = node
         self._size += 1
+        self._notify("link", node)
+
+    @classmethod
+    def from_songs(cls, songs: Iterable[Song]) -> Playlist:
+        # One linking pass, and the position index is built in O(n)
+        playlist = cls()
+        nodes = [SongNode(song) for song in songs]
+        previous = None
+        for node in nodes:
+            node.prev = previous
+            if previous is not None:
+                previous.next = node
+            previous = node
+            playlist._index_node(node)
+        if nodes:
+            playlist.head, playlist.tail = nodes[0], nodes[-1]
+            playlist.current = nodes[0]
+        playlist._size = len(nodes)
+        playlist._positions.build(nodes)
+        return playlist
+
+    def extend(self, songs: Iterable[Song]) -> int:
+        return self._splice_after(self.tail, Playlist.from_songs(songs))
+
+    def splice_after_current(self, other: Playlist) -> int:
+        # Moves every song of other (left empty) right after the current one
+        return self._splice_after(self.current, other)
+
+    def extract(self, start: int, stop: int) -> Optional[Playlist]:
+        # Positions start..stop (1-based, inclusive) leave this playlist as a new one
+        if start < 1 or stop < start or stop > self._size:
+            return None
+        first, last = self.node_at(start), self.node_at(stop)
+        piece = Playlist()
+        piece._positions = self._positions.cut(start - 1, stop)
+        before, after = first.prev, last.next
+        current_inside = False
+        if before is not None:
+            before.next = after
+        else:
+            self.head = after
+        if after is not None:
+            after.prev = before
+        else:
+            self.tail = before
+        first.prev = last.next = None
+        piece.head, piece.tail, piece.current = first, last, first
+        moved = []
+        node = first
+        while node is not None:
+            self._unindex_node(node)
+            piece._index_node(node)
+            if node is self.current:
+                piece.current = node
+                self.current = after or before
+                current_inside = True
+            moved.append(node)
+            node = node.next
+        piece._size = len(moved)
+        self._size -= len(moved)
+        if self._shuffle is not None:
+            self._shuffle.forget(set(moved))
+        self._notify("extract", piece, before, current_inside)
+        return piece
+
+    def _splice_after(self, anchor: Optional[SongNode], other: Playlist) -> int:
+        if other is self:
+            raise ValueError("cannot splice a playlist into itself")
+        if other.is_empty():
+            return 0
+        first, last = other.head, other.tail
+        if self._shuffle is not None:
+            for node in other.iter_songs():
+                self._shuffle.add(node)
+        self._positions.splice(anchor, other._positions)
+        next_node = anchor.next if anchor is not None else self.head
+        first.prev = anchor
+        last.next = next_node
+        if anchor is not None:
+            anchor.next = first
+        else:
+            self.head = first
+        if next_node is not None:
+            next_node.prev = last
+        else:
+            self.tail = last
+        for index, moved in ((self._by_title, other._by_title),
+                             (self._by_artist, other._by_artist)):
+            for key, nodes in moved.items():
+                existing = index.get(key)
+                if existing is None:
+                    index[key] = nodes
+                else:
+                    existing.update(nodes)
+        count = other._size
+        self._size += count
+        if self.current is None:
+            self.current = first
+        other._disown_nodes()
+        self._notify("splice", first, last, other)
+        return count
+
+    def _disown_nodes(self) -> None:
+        # The nodes now belong to another playlist: reset without touching them
+        self.head = self.tail = self.current = None
+        self._size = 0
+        self._by_title = {}
+        self._by_artist = {}
+        if self._shuffle is not None:
+            self._shuffle = ShuffleOrder((), self._is_linked)
 
     def add_song(self, song: Song, make_current: bool = False) -> None:
         node = SongNode(song)
@@ -63,19 +234,58 @@ class Playlist:
             self.add_song(song, make_current=True)
             return
         node = SongNode(song)
-        next_node = self.current.next
-        self.current.next = node
-        node.prev = self.current
+        self._link_after(self.current, node)
+        if make_current:
+            self.current = node
+
+    def insert_at(self, position: int, song: Song, make_current: bool = False) -> bool:
+        if position < 1 or position > self._size + 1:
+            return False
+        node = SongNode(song)
+        if position == self._size + 1:
+            self._append_node(node)
+        else:
+            self._link_after(self._positions.select(position - 2), node)
+        if self.current is None or make_current:
+            self.current = node
+        return True
+
+    def _link_after(self, anchor: Optional[SongNode], node: SongNode) -> None:
+        self._positions.insert_after(anchor, node)
+        self._index_node(node)
+        if self._shuffle is not None:
+            self._shuffle.add(node)
+        next_node = anchor.next if anchor is not None else self.head
+        node.prev = anchor
         node.next = next_node
+        if anchor is not None:
+            anchor.next = node
+        else:
+            self.head = node
         if next_node is not None:
             next_node.prev = node
         else:
             self.tail = node
         self._size += 1
-        if make_current:
-            self.current = node
+        self._notify("link", node)
+
+    def _index_node(self, node: SongNode) -> None:
+        song = node.song
+        self._by_title.setdefault(song.title.casefold(), {})[node] = None
+        self._by_artist.setdefault(song.artist.casefold(), {})[node] = None
+
+    def _unindex_node(self, node: SongNode) -> None:
+        for index, key in ((self._by_title, node.song.title.casefold()),
+                           (self._by_artist, node.song.artist.casefold())):
+            nodes = index[key]
+            del nodes[node]
+            if not nodes:
+                del index[key]
 
     def _unlink_node(self, node: SongNode) -> None:
+        self._positions.remove(node)
+        self._unindex_node(node)
+        was_current = self.current is node
         prev_node = node.prev
         next_node = node.next
         if prev_node is not None:
@@ -90,16 +300,36 @@ class Playlist:
             self.current = next_node or prev_node
         node.prev = node.next = None
         self._size -= 1
+        if self._shuffle is not None:
+            self._shuffle.discard(node)
+        self._notify("unlink", node, prev_node, was_current)
+
+    def _is_linked(self, node: SongNode) -> bool:
+        # Removed nodes leave the position index with no parent; O(1)
+        return node.parent is not None or node is self._positions.root
 
     def remove_by_title(self, title: str) -> bool:
-        cursor = self.head
-        title_lower = title.lower()
-        while cursor is not None:
-            if cursor.song.title.lower() == title_lower:
-                self._unlink_node(cursor)
-                return True
-            cursor = cursor.next
-        return False
+        matches = self._by_title.get(title.casefold())
+        if not matches:
+            return False
+        # Same song the old front-to-back walk would have removed
+        self._unlink_node(min(matches, key=self._positions.rank))
+        return True
+
+    def find_by_title(self, title: str) -> List[SongNode]:
+        return self._in_order(self._by_title.get(title.casefold(), ()))
+
+    def find_by_artist(self, artist: str) -> List[SongNode]:
+        return self._in_order(self._by_artist.get(artist.casefold(), ()))
+
+    def remove_all_by_artist(self, artist: str) -> int:
+        nodes = list(self._by_artist.get(artist.casefold(), ()))
+        for node in nodes:
+            self._unlink_node(node)
+        return len(nodes)
+
+    def _in_order(self, nodes: Iterable[SongNode]) -> List[SongNode]:
+        return sorted(nodes, key=self._positions.rank)
 
     def remove_current(self) -> bool:
         if self.current is None:
@@ -108,6 +338,10 @@ class Playlist:
         return True
 
     def clear(self) -> None:
+        if self._observers:
+            # Observers (e.g. an undo journal) may keep the old list: hand it over in O(1)
+            self._notify("clear", self._take_state())
+            return
         cursor = self.head
         while cursor is not None:
             nxt = cursor.next
@@ -115,30 +349,127 @@ class Playlist:
             cursor = nxt
         self.head = self.tail = self.current = None
         self._size = 0
+        self._positions.clear()
+        self._by_title.clear()
+        self._by_artist.clear()
+        if self._shuffle is not None:
+            self._shuffle = ShuffleOrder((), self._is_linked)
+
+    def _take_state(self) -> Tuple[Any, ...]:
+        # Everything clear() would drop, leaving the playlist empty
+        state = (self.head, self.tail, self.current, self._size, self._positions,
+                 self._by_title, self._by_artist, self._shuffle)
+        self.head = self.tail = self.current = None
+        self._size = 0
+        self._positions = PositionIndex()
+        self._by_title = {}
+        self._by_artist = {}
+        if self._shuffle is not None:
+            self._shuffle = ShuffleOrder((), self._is_linked)
+        return state
+
+    def _restore_state(self, state: Tuple[Any, ...]) -> None:
+        (self.head, self.tail, self.current, self._size, self._positions,
+         self._by_title, self._by_artist, self._shuffle) = state
+
+    def add_observer(self, observer: Callable[..., None]) -> None:
+        # Events: ("link", node), ("unlink", node, prev, was_current),
+        # ("splice", first, last, source), ("extract", piece, prev, had_current)
+        # and ("clear", state taken by _take_state)
+        self._observers.append(observer)
+
+    def remove_observer(self, observer: Callable[..., None]) -> None:
+        self._observers.remove(observer)
+
+    def _notify(self, event: str, *details: Any) -> None:
+        for observer in self._observers:
+            observer(event, *details)
+
+    @property
+    def shuffled(self) -> bool:
+        return self._shuffle is not None
+
+    def set_shuffle(self, enabled: bool) -> None:
+        # The current song stays current; turning shuffle on again starts a new order
+        if not enabled:
+            self._shuffle = None
+        else:
+            self._shuffle = ShuffleOrder(self.iter_songs(), self._is_linked, first=self.current)
+
+    def set_repeat(self, mode: str) -> None:
+        if mode not in REPEAT_MODES:
+            raise ValueError(f"unknown repeat mode: {mode!r}")
+        self.repeat = mode
 
     def play_next(self) -> Optional[Song]:
         if self.current is None:
             return None
-        if self.current.next is not None:
-            self.current = self.current.next
+        if self.repeat == "one":
+            return self.current.song
+        if self._shuffle is not None:
+            node = self._shuffle.next()
+            if node is None and self.repeat == "all":
+                self._shuffle.restart()
+                node = self._shuffle.next()
+        else:
+            node = self.current.next
+            if node is None and self.repeat == "all":
+                node = self.head
+        if node is not None:
+            self.current = node
         return self.current.song
 
     def play_previous(self) -> Optional[Song]:
         if self.current is None:
             return None
-        if self.current.prev is not None:
-            self.current = self.current.prev
+        if self._shuffle is not None:
+            node = self._shuffle.previous()
+        else:
+            node = self.current.prev
+            if node is None and self.repeat == "all":
+                node = self.tail
+        if node is not None:
+            self.current = node
         return self.current.song
 
     def jump_to(self, index: int) -> Optional[Song]:
+        node = self.node_at(index)
+        if node is None:
+            return None
+        self.current = node
+        return node.song
+
+    def node_at(self, index: int) -> Optional[SongNode]:
         if index < 1 or index > self._size:
             return None
-        cursor = self.head
-        for _ in range(index - 1):
-            assert cursor is not None
-            cursor = cursor.next
-        self.current = cursor
-        return self.current.song if cursor is not None else None
+        return self._positions.select(index - 1)
+
+    def position_of(self, node: SongNode) -> int:
+        return self._positions.rank(node) + 1
+
+    def current_position(self) -> Optional[int]:
+        if self.current is None:
+            return None
+        return self.position_of(self.current)
+
+    # Songs without a valid duration count as 0 seconds
+    def total_duration(self) -> int:
+        return self._positions.total_weight
+
+    def remaining_duration(self, elapsed: int = 0) -> int:
+        # From the start of the current song (minus what was already played) to the end
+        if self.current is None:
+            return 0
+        before = self._positions.weight_before(self.current)
+        return max(self.total_duration() - before - elapsed, 0)
+
+    def seek(self, offset: int) -> Optional[Tuple[Song, int]]:
+        found = self._positions.find_weight(offset)
+        if found is None:
+            return None
+        node, into_song = found
+        self.current = node
+        return node.song, into_song
 
     def iter_songs(self) -> Iterable[SongNode]:
         cursor = self.head
@@ -147,16 +478,16 @@ class Playlist:
             cursor = cursor.next
 
 
-def prompt_song_details() -> Song:
-    title = prompt_non_empty("Titulo de la cancion: ")
-    artist = input("Artista (opcional): ").strip()
-    duration = input("Duracion, por ejemplo 3:45 (opcional): ").strip()
+def prompt_song_details(read: Reader = input) -> Song:
+    title = prompt_non_empty("Titulo de la cancion: ", read)
+    artist = read("Artista (opcional): ").strip()
+    duration = read("Duracion, por ejemplo 3:45 (opcional): ").strip()
     return Song(title=title, artist=artist, duration=duration)
 
 
-def prompt_non_empty(message: str) -> str:
+def prompt_non_empty(message: str, read: Reader = input) -> str:
     while True:
-        value = input(message).strip()
+        value = read(message).strip()
         if value:
             return value
         print("Debe ingresar un valor.")
@@ -176,6 +507,14 @@ Opciones:
 8. Mostrar lista completa
 9. Saltar a posicion especifica
 10. Vaciar playlist
+11. Insertar cancion en posicion especifica
+12. Eliminar todas las canciones de un artista
+13. Ir a un tiempo de la playlist
+14. Activar o desactivar modo aleatorio
+15. Cambiar modo de repeticion
+16. Mover un rango de canciones despues de la actual
+17. Deshacer ultimo cambio
+18. Rehacer cambio
 0. Salir
 """.strip()
     )
@@ -188,8 +527,10 @@ def display_playlist(playlist: Playlist) -> None:
         return
     print("\nPlaylist:")
     for index, node in enumerate(playlist.iter_songs(), start=1):
-        marker = "->" if node is playlist.current else "  "
+        marker = "->" if node == playlist.current else "  "
         print(f"{marker} {index:02d}. {node.song.display()}")
+    print(f"Duracion total: {format_duration(playlist.total_duration())}, "
+          f"restante: {format_duration(playlist.remaining_duration())}")
     print()
 
 
@@ -200,20 +541,11 @@ def display_current(playlist: Playlist) -> None:
         print(f"Reproduciendo: {playlist.current.song.display()}")
 
 
-def main() -> None:
-    playlist = Playlist()
-    handlers = {
-        "1": lambda: playlist.add_song(prompt_song_details(), make_current=False),
-        "2": lambda: playlist.insert_after_current(prompt_song_details(), make_current=True),
-        "3": lambda: handle_remove_by_title(playlist),
-        "4": lambda: handle_remove_current(playlist),
-        "5": lambda: handle_play_next(playlist),
-        "6": lambda: handle_play_previous(playlist),
-        "7": lambda: display_current(playlist),
-        "8": lambda: display_playlist(playlist),
-        "9": lambda: handle_jump_to(playlist),
-        "10": lambda: handle_clear(playlist),
-    }
+def main(playlist: Optional[Playlist] = None) -> None:
+    # Any object with Playlist's API works here, e.g. pooled_playlist.PooledPlaylist
+    if playlist is None:
+        playlist = Playlist()
+    handlers = build_handlers(playlist)
 
     print("Bienvenido a la playlist interactiva.")
     while True:
@@ -228,17 +560,55 @@ def main() -> None:
         handler()
 
 
-def handle_remove_by_title(playlist: Playlist) -> None:
+def build_handlers(playlist: Playlist, read: Reader = input) -> Dict[str, Callable[[], None]]:
+    # Menu option -> handler; each handler reads what it needs with read(prompt)
+    # Backends without observers (PooledPlaylist) have no undo
+    journal = PlaylistJournal(playlist) if hasattr(playlist, "add_observer") else None
+    return {
+        "1": lambda: playlist.add_song(prompt_song_details(read), make_current=False),
+        "2": lambda: playlist.insert_after_current(prompt_song_details(read), make_current=True),
+        "3": lambda: handle_remove_by_title(playlist, read),
+        "4": lambda: handle_remove_current(playlist),
+        "5": lambda: handle_play_next(playlist),
+        "6": lambda: handle_play_previous(playlist),
+        "7": lambda: display_current(playlist),
+        "8": lambda: display_playlist(playlist),
+        "9": lambda: handle_jump_to(playlist, read),
+        "10": lambda: handle_clear(playlist, read),
+        "11": lambda: handle_insert_at(playlist, read),
+        "12": lambda: handle_remove_by_artist(playlist, read),
+        "13": lambda: handle_seek(playlist, read),
+        "14": lambda: handle_toggle_shuffle(playlist),
+        "15": lambda: handle_repeat(playlist, read),
+        "16": lambda: handle_move_range(playlist, read),
+        "17": lambda: handle_undo(journal, redo=False),
+        "18": lambda: handle_undo(journal, redo=True),
+    }
+
+
+def handle_remove_by_title(playlist: Playlist, read: Reader = input) -> None:
     if playlist.is_empty():
         print("No hay canciones para eliminar.")
         return
-    title = prompt_non_empty("Titulo exacto a eliminar: ")
+    title = prompt_non_empty("Titulo exacto a eliminar: ", read)
     if playlist.remove_by_title(title):
         print(f"Se elimino '{title}'.")
     else:
         print(f"No se encontro '{title}'.")
 
 
+def handle_remove_by_artist(playlist: Playlist, read: Reader = input) -> None:
+    if playlist.is_empty():
+        print("No hay canciones para eliminar.")
+        return
+    artist = prompt_non_empty("Artista a eliminar: ", read)
+    removed = playlist.remove_all_by_artist(artist)
+    if removed:
+        print(f"Se eliminaron {removed} canciones de '{artist}'.")
+    else:
+        print(f"No se encontraron canciones de '{artist}'.")
+
+
 def handle_remove_current(playlist: Playlist) -> None:
     if playlist.remove_current():
         print("Cancion actual eliminada.")
@@ -263,12 +633,12 @@ def handle_play_previous(playlist: Playlist) -> None:
         print(f"Anterior: {song.display()}")
 
 
-def handle_jump_to(playlist: Playlist) -> None:
+def handle_jump_to(playlist: Playlist, read: Reader = input) -> None:
     if playlist.is_empty():
         print("Playlist vacia. Agregue canciones primero.")
         return
     try:
-        position = int(prompt_non_empty("Posicion a reproducir (1-n): "))
+        position = int(prompt_non_empty("Posicion a reproducir (1-n): ", read))
     except ValueError:
         print("Ingrese un numero valido.")
         return
@@ -279,11 +649,88 @@ def handle_jump_to(playlist: Playlist) -> None:
         print(f"Reproduciendo posicion {position}: {song.display()}")
 
 
-def handle_clear(playlist: Playlist) -> None:
+def handle_insert_at(playlist: Playlist, read: Reader = input) -> None:
+    try:
+        position = int(prompt_non_empty(f"Posicion donde insertar (1-{len(playlist) + 1}): ", read))
+    except ValueError:
+        print("Ingrese un numero valido.")
+        return
+    if position < 1 or position > len(playlist) + 1:
+        print("Posicion fuera de rango.")
+        return
+    song = prompt_song_details(read)
+    playlist.insert_at(position, song)
+    print(f"Se inserto '{song.title}' en la posicion {position}.")
+
+
+def handle_move_range(playlist: Playlist, read: Reader = input) -> None:
+    if playlist.is_empty():
+        print("Playlist vacia. Agregue canciones primero.")
+        return
+    try:
+        start = int(prompt_non_empty("Desde la posicion: ", read))
+        stop = int(prompt_non_empty("Hasta la posicion: ", read))
+    except ValueError:
+        print("Ingrese un numero valido.")
+        return
+    if start < 1 or stop < start or stop > len(playlist):
+        print("Rango fuera de la playlist.")
+        return
+    if start <= playlist.current_position() <= stop:
+        print("La cancion actual no puede estar dentro del rango.")
+        return
+    moved = playlist.splice_after_current(playlist.extract(start, stop))
+    print(f"Se movieron {moved} canciones despues de la actual.")
+
+
+def handle_seek(playlist: Playlist, read: Reader = input) -> None:
+    if playlist.is_empty():
+        print("Playlist vacia. Agregue canciones primero.")
+        return
+    offset = parse_duration(prompt_non_empty("Tiempo desde el inicio, por ejemplo 12:30: ", read))
+    if offset is None:
+        print("Ingrese un tiempo valido.")
+        return
+    found = playlist.seek(offset)
+    if found is None:
+        print("Tiempo fuera de rango.")
+    else:
+        song, into_song = found
+        print(f"Reproduciendo {song.display()} desde {format_duration(into_song)}")
+
+
+def handle_toggle_shuffle(playlist: Playlist) -> None:
+    playlist.set_shuffle(not playlist.shuffled)
+    print("Modo aleatorio activado." if playlist.shuffled else "Modo aleatorio desactivado.")
+
+
+REPEAT_LABELS = {"no": "off", "una": "one", "todas": "all"}
+
+
+def handle_repeat(playlist: Playlist, read: Reader = input) -> None:
+    choice = prompt_non_empty("Repetir (no / una / todas): ", read).lower()
+    mode = REPEAT_LABELS.get(choice)
+    if mode is None:
+        print("Modo no valido.")
+        return
+    playlist.set_repeat(mode)
+    print(f"Repeticion: {choice}.")
+
+
+def handle_undo(journal: Optional[PlaylistJournal], redo: bool) -> None:
+    if journal is None:
+        print("Deshacer no esta disponible para esta playlist.")
+    elif redo:
+        print("Cambio rehecho." if journal.redo() else "No hay cambios para rehacer.")
+    else:
+        print("Cambio deshecho." if journal.undo() else "No hay cambios para deshacer.")
+
+
+def handle_clear(playlist: Playlist, read: Reader = input) -> None:
     if playlist.is_empty():
         print("La playlist ya esta vacia.")
         return
-    confirmation = input("Seguro que desea vaciar la playlist? (s/N): ").strip().lower()
+    confirmation = read("Seguro que desea vaciar la playlist? (s/N): ").strip().lower()
     if confirmation == "s":
         playlist.clear()
         print("Playlist vaciada.")
@@ -292,4 +739,10 @@ def handle_clear(playlist: Playlist) -> None:
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        # With a .m3u or .jsonl file as argument the playlist survives between runs
+        from playlist_io import run_saved
+
+        run_saved(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,174 @@
+"""Streaming M3U and JSONL import/export for playlists.
+
+Both formats are read and written one song at a time. Loading feeds the songs
+to ``playlist.extend`` so they are linked in a single pass, and the song that
+was current when the file was saved is current again after loading it into an
+empty playlist.
+
+M3U files use ``#EXTINF:<seconds>,<artist> - <title>`` before each entry and
+the song's file path or URL (``Song.location``) as the entry line, so other
+players can open them; M3U only keeps the length in seconds, so those
+durations come back normalized (``245`` -> ``4:05``). Labels are split on
+the first `` - ``, so when the artist is empty or either field contains
+`` - `` the song also gets a ``#PLAYLIST-SONG:<json>`` comment right before
+its entry, which wins over the label when reading. Songs with no location
+(typed in the menu) are written only as that comment, and the current
+position as ``#PLAYLIST-CURRENT:<n>``; players skip both.
+JSONL keeps every field as typed, one object per song, with
+``"current": true`` on the current one.
+
+    python listadoble.py mi_playlist.jsonl    # loads it, saves it on exit
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Iterator, List, Optional
+
+from listadoble import Playlist, Song, format_duration, main
+
+FORMATS = ("m3u", "jsonl")
+CURRENT_TAG = "#PLAYLIST-CURRENT:"
+SONG_TAG = "#PLAYLIST-SONG:"
+
+
+def format_for(path: str, fmt: Optional[str] = None) -> str:
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt == "m3u8":
+        fmt = "m3u"
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported playlist format: {fmt!r} (use m3u or jsonl)")
+    return fmt
+
+
+def save(playlist: Playlist, path: str, fmt: Optional[str] = None) -> int:
+    fmt = format_for(path, fmt)
+    current = playlist.current_position()
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as file:
+        if fmt == "m3u":
+            file.write("#EXTM3U\n")
+            if current is not None:
+                file.write(f"{CURRENT_TAG}{current}\n")
+        for count, node in enumerate(playlist.iter_songs(), start=1):
+            song = node.song
+            record = {"title": song.title, "artist": song.artist, "duration": song.duration}
+            if fmt == "m3u":
+                if song.location:
+                    if not song.artist or " - " in song.artist or " - " in song.title:
+                        # The label alone would not split back into these fields
+                        exact = {**record, "location": song.location}
+                        file.write(SONG_TAG + json.dumps(exact, ensure_ascii=False) + "\n")
+                    seconds = -1 if song.seconds is None else song.seconds
+                    label = f"{song.artist} - {song.title}" if song.artist else song.title
+                    file.write(f"#EXTINF:{seconds},{label}\n{song.location}\n")
+                else:
+                    file.write(SONG_TAG + json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                if song.location:
+                    record["location"] = song.location
+                if count == current:
+                    record["current"] = True
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return count
+
+
+def load(path: str, playlist: Optional[Playlist] = None, fmt: Optional[str] = None) -> Playlist:
+    # Appends to playlist (a new Playlist by default)
+    fmt = format_for(path, fmt)
+    playlist = Playlist() if playlist is None else playlist
+    was_empty = playlist.is_empty()
+    # Filled by the reader as it goes: position of the saved current song
+    current: List[int] = []
+    with open(path, encoding="utf-8-sig") as file:
+        reader = _read_m3u if fmt == "m3u" else _read_jsonl
+        playlist.extend(reader(file, path, current))
+    if was_empty and current:
+        playlist.jump_to(current[0])
+    return playlist
+
+
+def _read_jsonl(file, path: str, current: List[int]) -> Iterator[Song]:
+    position = 0
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            song = _song_from(record)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            raise ValueError(f"{path}:{number}: invalid song record ({error})") from None
+        position += 1
+        if record.get("current"):
+            current.append(position)
+        yield song
+
+
+def _read_m3u(file, path: str, current: List[int]) -> Iterator[Song]:
+    seconds, label = None, None
+    # Song from a #PLAYLIST-SONG line that has a location: the entry that
+    # follows is the same song
+    exact: Optional[Song] = None
+    for number, line in enumerate(file, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#EXTINF:"):
+            length, _, label = line[len("#EXTINF:"):].partition(",")
+            try:
+                seconds = int(float(length))
+            except ValueError:
+                raise ValueError(f"{path}:{number}: invalid #EXTINF length") from None
+        elif line.startswith(CURRENT_TAG):
+            try:
+                current.append(int(line[len(CURRENT_TAG):]))
+            except ValueError:
+                raise ValueError(f"{path}:{number}: invalid {CURRENT_TAG[:-1]} position") from None
+        elif line.startswith(SONG_TAG):
+            try:
+                song = _song_from(json.loads(line[len(SONG_TAG):]))
+            except (ValueError, KeyError, TypeError, AttributeError) as error:
+                raise ValueError(f"{path}:{number}: invalid song record ({error})") from None
+            if song.location:
+                exact = song
+            else:
+                yield song
+        elif exact is not None and exact.location == line:
+            yield exact
+            seconds, label, exact = None, None, None
+        elif not line.startswith("#"):
+            title, artist, location = line, "", line
+            if label:
+                if label == line or label.endswith(" - " + line):
+                    # Written before entries carried a location: the entry
+                    # line is the title
+                    artist = "" if label == line else label[:-len(" - " + line)]
+                    location = ""
+                else:
+                    artist, separator, title = label.partition(" - ")
+                    if not separator:
+                        title, artist = label, ""
+            else:
+                title = os.path.splitext(os.path.basename(line.rstrip("/")))[0] or line
+            duration = format_duration(seconds) if seconds is not None and seconds >= 0 else ""
+            song = Song(title=title, artist=artist, duration=duration)
+            song.location = location
+            yield song
+            seconds, label, exact = None, None, None
+
+
+def _song_from(record: dict) -> Song:
+    song = Song(title=record["title"], artist=record.get("artist", ""),
+                duration=record.get("duration", ""))
+    song.location = str(record.get("location") or "")
+    return song
+
+
+def run_saved(path: str, playlist: Optional[Playlist] = None) -> None:
+    """Interactive menu on the playlist stored at path; saved again on exit."""
+    playlist = Playlist() if playlist is None else playlist
+    if os.path.exists(path):
+        load(path, playlist)
+    main(playlist)
+    save(playlist, path)
@@ -0,0 +1,436 @@
+"""Playlist backend that keeps its links in integer arrays.
+
+PooledPlaylist has the same public API as listadoble.Playlist, but instead of
+one SongNode object per song it stores the songs in slots: prev/next links
+are slot numbers in preallocated ``array('i')`` columns (-1 means no node),
+removed slots go to a free list threaded through ``_next`` and are reused by
+the next insertion, and ``clear`` only resets the head, the free list and the
+high-water mark of used slots, in O(1).
+
+Nodes are exposed as PooledNode handles (slot views with ``song``, ``prev``
+and ``next``) that compare equal when they point to the same slot. There is
+no position index here, so positional operations (``jump_to``, ``insert_at``,
+``seek``...) walk the list in O(n); use Playlist when those dominate. Slots
+belong to one pool, so ``splice_after_current`` copies the songs of the
+other playlist instead of relinking its nodes.
+
+    python pooled_playlist.py [playlist.jsonl]   # same menu, pooled backend
+"""
+
+from __future__ import annotations
+
+from array import array
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from listadoble import REPEAT_MODES, Song, main
+from shuffle import ShuffleOrder
+
+NIL = -1
+# Shuffle entries pack (generation, slot) in one int so a reused slot is not
+# mistaken for the song that was removed from it
+_SLOT_BITS = 32
+_SLOT_MASK = (1 << _SLOT_BITS) - 1
+
+
+class PooledNode:
+    __slots__ = ("_playlist", "slot")
+
+    def __init__(self, playlist: PooledPlaylist, slot: int) -> None:
+        self._playlist = playlist
+        self.slot = slot
+
+    @property
+    def song(self) -> Song:
+        return self._playlist._songs[self.slot]
+
+    @property
+    def prev(self) -> Optional[PooledNode]:
+        return self._playlist._handle(self._playlist._prev[self.slot])
+
+    @property
+    def next(self) -> Optional[PooledNode]:
+        return self._playlist._handle(self._playlist._next[self.slot])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PooledNode):
+            return NotImplemented
+        return self._playlist is other._playlist and self.slot == other.slot
+
+    def __hash__(self) -> int:
+        return hash((id(self._playlist), self.slot))
+
+    def __repr__(self) -> str:
+        return f"PooledNode({self.song.title!r}, slot={self.slot})"
+
+
+class PooledPlaylist:
+    def __init__(self, capacity: int = 1024) -> None:
+        capacity = max(capacity, 1)
+        self._songs: List[Optional[Song]] = [None] * capacity
+        self._prev = array("i", [NIL]) * capacity
+        self._next = array("i", [NIL]) * capacity
+        self._generation = array("I", [0]) * capacity
+        self._head = self._tail = self._current = NIL
+        # Slots below _used have been handed out since the last clear; freed
+        # ones are chained through _next starting at _free
+        self._used = 0
+        self._free = NIL
+        self._size = 0
+        self._total_seconds = 0
+        # casefolded title/artist -> slots (dicts used as insertion-ordered sets)
+        self._by_title: Dict[str, Dict[int, None]] = {}
+        self._by_artist: Dict[str, Dict[int, None]] = {}
+        self._shuffle: Optional[ShuffleOrder] = None
+        self.repeat: str = "off"
+
+    def is_empty(self) -> bool:
+        return self._size == 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def head(self) -> Optional[PooledNode]:
+        return self._handle(self._head)
+
+    @property
+    def tail(self) -> Optional[PooledNode]:
+        return self._handle(self._tail)
+
+    @property
+    def current(self) -> Optional[PooledNode]:
+        return self._handle(self._current)
+
+    @current.setter
+    def current(self, node: Optional[PooledNode]) -> None:
+        self._current = NIL if node is None else node.slot
+
+    def _handle(self, slot: int) -> Optional[PooledNode]:
+        return None if slot == NIL else PooledNode(self, slot)
+
+    # Slot pool
+
+    def _allocate(self, song: Song) -> int:
+        if self._free != NIL:
+            slot = self._free
+            self._free = self._next[slot]
+        else:
+            if self._used == len(self._songs):
+                self._grow()
+            slot = self._used
+            self._used += 1
+        self._songs[slot] = song
+        self._prev[slot] = self._next[slot] = NIL
+        return slot
+
+    def _release(self, slot: int) -> None:
+        self._songs[slot] = None
+        self._generation[slot] += 1
+        self._prev[slot] = NIL
+        self._next[slot] = self._free
+        self._free = slot
+
+    def _grow(self) -> None:
+        extra = len(self._songs)
+        self._songs.extend([None] * extra)
+        self._prev.extend(array("i", [NIL]) * extra)
+        self._next.extend(array("i", [NIL]) * extra)
+        self._generation.extend(array("I", [0]) * extra)
+
+    # Linking
+
+    def _link_after(self, anchor: int, song: Song) -> int:
+        slot = self._allocate(song)
+        next_slot = self._next[anchor] if anchor != NIL else self._head
+        self._prev[slot] = anchor
+        self._next[slot] = next_slot
+        if anchor != NIL:
+            self._next[anchor] = slot
+        else:
+            self._head = slot
+        if next_slot != NIL:
+            self._prev[next_slot] = slot
+        else:
+            self._tail = slot
+        self._size += 1
+        self._total_seconds += song.seconds or 0
+        self._by_title.setdefault(song.title.casefold(), {})[slot] = None
+        self._by_artist.setdefault(song.artist.casefold(), {})[slot] = None
+        if self._shuffle is not None:
+            self._shuffle.add(self._ref(slot))
+        return slot
+
+    def _unlink(self, slot: int) -> None:
+        song = self._songs[slot]
+        for index, key in ((self._by_title, song.title.casefold()),
+                           (self._by_artist, song.artist.casefold())):
+            slots = index[key]
+            del slots[slot]
+            if not slots:
+                del index[key]
+        prev_slot = self._prev[slot]
+        next_slot = self._next[slot]
+        if prev_slot != NIL:
+            self._next[prev_slot] = next_slot
+        else:
+            self._head = next_slot
+        if next_slot != NIL:
+            self._prev[next_slot] = prev_slot
+        else:
+            self._tail = prev_slot
+        if self._current == slot:
+            self._current = next_slot if next_slot != NIL else prev_slot
+        self._size -= 1
+        self._total_seconds -= song.seconds or 0
+        self._release(slot)
+        if self._shuffle is not None:
+            self._shuffle.discard(slot)
+
+    def _ref(self, slot: int) -> int:
+        return (self._generation[slot] << _SLOT_BITS) | slot
+
+    def _is_live(self, ref: int) -> bool:
+        slot = ref & _SLOT_MASK
+        return (slot < self._used and self._songs[slot] is not None
+                and self._generation[slot] == ref >> _SLOT_BITS)
+
+    def _slots(self) -> Iterator[int]:
+        slot = self._head
+        while slot != NIL:
+            yield slot
+            slot = self._next[slot]
+
+    def _slot_at(self, index: int) -> int:
+        # 0-based; walks from whichever end is closer
+        if index < self._size // 2:
+            slot = self._head
+            for _ in range(index):
+                slot = self._next[slot]
+        else:
+            slot = self._tail
+            for _ in range(self._size - 1 - index):
+                slot = self._prev[slot]
+        return slot
+
+    # Public API, as in Playlist
+
+    def add_song(self, song: Song, make_current: bool = False) -> None:
+        slot = self._link_after(self._tail, song)
+        if self._current == NIL or make_current:
+            self._current = slot
+
+    @classmethod
+    def from_songs(cls, songs: Iterable[Song]) -> PooledPlaylist:
+        playlist = cls()
+        playlist.extend(songs)
+        return playlist
+
+    def extend(self, songs: Iterable[Song]) -> int:
+        count, anchor = 0, self._tail
+        for song in songs:
+            anchor = self._link_after(anchor, song)
+            count += 1
+        if self._current == NIL:
+            self._current = self._head
+        return count
+
+    def splice_after_current(self, other) -> int:
+        # other may be any playlist; it is left empty
+        if other is self:
+            raise ValueError("cannot splice a playlist into itself")
+        count, anchor, first = 0, self._current, NIL
+        for node in other.iter_songs():
+            anchor = self._link_after(anchor, node.song)
+            if first == NIL:
+                first = anchor
+            count += 1
+        if self._current == NIL:
+            self._current = first
+        other.clear()
+        return count
+
+    def extract(self, start: int, stop: int) -> Optional[PooledPlaylist]:
+        # Positions start..stop (1-based, inclusive) leave this playlist as a new one
+        if start < 1 or stop < start or stop > self._size:
+            return None
+        piece = PooledPlaylist(capacity=stop - start + 1)
+        slot, current = self._slot_at(start - 1), self._current
+        for _ in range(stop - start + 1):
+            next_slot = self._next[slot]
+            piece.add_song(self._songs[slot], make_current=slot == current)
+            self._unlink(slot)
+            slot = next_slot
+        return piece
+
+    def insert_after_current(self, song: Song, make_current: bool = True) -> None:
+        if self.is_empty() or self._current == NIL:
+            self.add_song(song, make_current=True)
+            return
+        slot = self._link_after(self._current, song)
+        if make_current:
+            self._current = slot
+
+    def insert_at(self, position: int, song: Song, make_current: bool = False) -> bool:
+        if position < 1 or position > self._size + 1:
+            return False
+        anchor = NIL if position == 1 else self._slot_at(position - 2)
+        slot = self._link_after(anchor, song)
+        if self._current == NIL or make_current:
+            self._current = slot
+        return True
+
+    def remove_by_title(self, title: str) -> bool:
+        matches = self._by_title.get(title.casefold())
+        if not matches:
+            return False
+        self._unlink(self._first_in_order(matches))
+        return True
+
+    def find_by_title(self, title: str) -> List[PooledNode]:
+        return self._in_order(self._by_title.get(title.casefold(), {}))
+
+    def find_by_artist(self, artist: str) -> List[PooledNode]:
+        return self._in_order(self._by_artist.get(artist.casefold(), {}))
+
+    def remove_all_by_artist(self, artist: str) -> int:
+        slots = list(self._by_artist.get(artist.casefold(), ()))
+        for slot in slots:
+            self._unlink(slot)
+        return len(slots)
+
+    def _first_in_order(self, slots: Dict[int, None]) -> int:
+        if len(slots) == 1:
+            return next(iter(slots))
+        return next(slot for slot in self._slots() if slot in slots)
+
+    def _in_order(self, slots: Dict[int, None]) -> List[PooledNode]:
+        if not slots:
+            return []
+        return [PooledNode(self, slot) for slot in self._slots() if slot in slots]
+
+    def remove_current(self) -> bool:
+        if self._current == NIL:
+            return False
+        self._unlink(self._current)
+        return True
+
+    def clear(self) -> None:
+        # O(1): the slots keep their old songs until they are handed out again
+        self._head = self._tail = self._current = NIL
+        self._used = 0
+        self._free = NIL
+        self._size = 0
+        self._total_seconds = 0
+        self._by_title = {}
+        self._by_artist = {}
+        if self._shuffle is not None:
+            self._shuffle = ShuffleOrder((), self._is_live)
+
+    @property
+    def shuffled(self) -> bool:
+        return self._shuffle is not None
+
+    def set_shuffle(self, enabled: bool) -> None:
+        if not enabled:
+            self._shuffle = None
+            return
+        first = None if self._current == NIL else self._ref(self._current)
+        self._shuffle = ShuffleOrder((self._ref(slot) for slot in self._slots()),
+                                     self._is_live, first=first)
+
+    def set_repeat(self, mode: str) -> None:
+        if mode not in REPEAT_MODES:
+            raise ValueError(f"unknown repeat mode: {mode!r}")
+        self.repeat = mode
+
+    def play_next(self) -> Optional[Song]:
+        if self._current == NIL:
+            return None
+        if self.repeat == "one":
+            return self._songs[self._current]
+        if self._shuffle is not None:
+            ref = self._shuffle.next()
+            if ref is None and self.repeat == "all":
+                self._shuffle.restart()
+                ref = self._shuffle.next()
+            slot = NIL if ref is None else ref & _SLOT_MASK
+        else:
+            slot = self._next[self._current]
+            if slot == NIL and self.repeat == "all":
+                slot = self._head
+        if slot != NIL:
+            self._current = slot
+        return self._songs[self._current]
+
+    def play_previous(self) -> Optional[Song]:
+        if self._current == NIL:
+            return None
+        if self._shuffle is not None:
+            ref = self._shuffle.previous()
+            slot = NIL if ref is None else ref & _SLOT_MASK
+        else:
+            slot = self._prev[self._current]
+            if slot == NIL and self.repeat == "all":
+                slot = self._tail
+        if slot != NIL:
+            self._current = slot
+        return self._songs[self._current]
+
+    def jump_to(self, index: int) -> Optional[Song]:
+        if index < 1 or index > self._size:
+            return None
+        self._current = self._slot_at(index - 1)
+        return self._songs[self._current]
+
+    def node_at(self, index: int) -> Optional[PooledNode]:
+        if index < 1 or index > self._size:
+            return None
+        return PooledNode(self, self._slot_at(index - 1))
+
+    def position_of(self, node: PooledNode) -> int:
+        position, slot = 1, self._prev[node.slot]
+        while slot != NIL:
+            position += 1
+            slot = self._prev[slot]
+        return position
+
+    def current_position(self) -> Optional[int]:
+        if self._current == NIL:
+            return None
+        return self.position_of(PooledNode(self, self._current))
+
+    # Songs without a valid duration count as 0 seconds
+    def total_duration(self) -> int:
+        return self._total_seconds
+
+    def remaining_duration(self, elapsed: int = 0) -> int:
+        remaining, slot = 0, self._current
+        while slot != NIL:
+            remaining += self._songs[slot].seconds or 0
+            slot = self._next[slot]
+        return max(remaining - elapsed, 0)
+
+    def seek(self, offset: int) -> Optional[Tuple[Song, int]]:
+        if offset < 0 or offset >= self._total_seconds:
+            return None
+        for slot in self._slots():
+            seconds = self._songs[slot].seconds or 0
+            if offset < seconds:
+                self._current = slot
+                return self._songs[slot], offset
+            offset -= seconds
+        return None
+
+    def iter_songs(self) -> Iterable[PooledNode]:
+        for slot in self._slots():
+            yield PooledNode(self, slot)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from playlist_io import run_saved
+
+        run_saved(sys.argv[1], PooledPlaylist())
+    else:
+        main(PooledPlaylist())
@@ -0,0 +1,267 @@
+"""Order-statistic index over the nodes of a doubly linked list.
+
+An implicit treap: the in-order traversal of the tree is the list order,
+and every node stores the size of its subtree, so the position of a node
+and the node at a position are found in O(log n) expected time. Each node
+also has a ``weight`` and the tree keeps subtree sums of it (``total``),
+which makes prefix sums and "node at offset" lookups O(log n) as well.
+Whole runs of nodes move between indexes with split/merge, also in
+O(log n). The tree lives in extra slots of the list nodes themselves (left, right,
+parent, size, total, priority); prev/next links are untouched.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Iterable, List, Optional, Tuple
+
+Node = Any
+
+
+def _size(node: Optional[Node]) -> int:
+    return node.size if node is not None else 0
+
+
+def _total(node: Optional[Node]) -> int:
+    return node.total if node is not None else 0
+
+
+class PositionIndex:
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self.root: Optional[Node] = None
+        self._random = (rng or random.Random()).random
+
+    def __len__(self) -> int:
+        return _size(self.root)
+
+    @property
+    def total_weight(self) -> int:
+        return _total(self.root)
+
+    def clear(self) -> None:
+        self.root = None
+
+    def reset_node(self, node: Node) -> None:
+        node.left = node.right = node.parent = None
+        node.size = 1
+        node.total = node.weight
+        node.priority = self._random()
+
+    def pull(self, node: Node) -> None:
+        left, right = node.left, node.right
+        node.size = 1 + _size(left) + _size(right)
+        node.total = node.weight + _total(left) + _total(right)
+
+    def contains(self, node: Node) -> bool:
+        while node.parent is not None:
+            node = node.parent
+        return node is self.root
+
+    def select(self, index: int) -> Optional[Node]:
+        """Node at 0-based ``index`` or None when out of range."""
+        if index < 0 or index >= len(self):
+            return None
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node
+            else:
+                index -= left_size + 1
+                node = node.right
+
+    def rank(self, node: Node) -> int:
+        """0-based position of ``node`` in the list."""
+        position = _size(node.left)
+        while node.parent is not None:
+            if node is node.parent.right:
+                position += _size(node.parent.left) + 1
+            node = node.parent
+        return position
+
+    def weight_before(self, node: Node) -> int:
+        """Sum of the weights of the nodes before ``node``."""
+        before = _total(node.left)
+        while node.parent is not None:
+            if node is node.parent.right:
+                before += _total(node.parent.left) + node.parent.weight
+            node = node.parent
+        return before
+
+    def find_weight(self, offset: int) -> Optional[Tuple[Node, int]]:
+        """(node, offset inside it) covering ``offset`` in the running weight sum."""
+        if offset < 0 or offset >= self.total_weight:
+            return None
+        node = self.root
+        while True:
+            left_total = _total(node.left)
+            if offset < left_total:
+                node = node.left
+            elif offset < left_total + node.weight:
+                return node, offset - left_total
+            else:
+                offset -= left_total + node.weight
+                node = node.right
+
+    def insert_after(self, anchor: Optional[Node], node: Node) -> None:
+        """Insert ``node`` right after ``anchor`` (at the front when anchor is None)."""
+        self.reset_node(node)
+        if self.root is None:
+            self.root = node
+            return
+        if anchor is None:
+            target = self._leftmost(self.root)
+            target.left = node
+        elif anchor.right is None:
+            target = anchor
+            target.right = node
+        else:
+            target = self._leftmost(anchor.right)
+            target.left = node
+        node.parent = target
+        self._refresh_path(target)
+        while node.parent is not None and node.priority > node.parent.priority:
+            self._rotate_up(node)
+
+    def remove(self, node: Node) -> None:
+        # Rotate the node down until it has at most one child, then splice it out
+        while node.left is not None and node.right is not None:
+            if node.left.priority > node.right.priority:
+                self._rotate_up(node.left)
+            else:
+                self._rotate_up(node.right)
+        child = node.left if node.left is not None else node.right
+        parent = node.parent
+        self._replace(node, child)
+        if parent is not None:
+            self._refresh_path(parent)
+        node.left = node.right = node.parent = None
+
+    def build(self, nodes: Iterable[Node]) -> None:
+        """Replace the tree with ``nodes`` in order, in O(n) (Cartesian tree build)."""
+        stack: List[Node] = []
+        for node in nodes:
+            self.reset_node(node)
+            last = None
+            while stack and stack[-1].priority < node.priority:
+                last = stack.pop()
+            if last is not None:
+                node.left = last
+                last.parent = node
+            if stack:
+                stack[-1].right = node
+                node.parent = stack[-1]
+            stack.append(node)
+        self.root = stack[0] if stack else None
+        self._pull_all()
+
+    def splice(self, anchor: Optional[Node], other: PositionIndex) -> None:
+        """Move every node of ``other`` right after ``anchor``; ``other`` ends empty."""
+        if other.root is None:
+            return
+        position = self.rank(anchor) + 1 if anchor is not None else 0
+        left, right = self._split(self.root, position)
+        self._set_root(self._merge(self._merge(left, other.root), right))
+        other.root = None
+
+    def cut(self, start: int, stop: int) -> PositionIndex:
+        """Remove the nodes at 0-based positions [start, stop) into a new index."""
+        left, rest = self._split(self.root, start)
+        middle, right = self._split(rest, stop - start)
+        self._set_root(self._merge(left, right))
+        piece = PositionIndex()
+        piece._random = self._random
+        piece._set_root(middle)
+        return piece
+
+    def _set_root(self, node: Optional[Node]) -> None:
+        if node is not None:
+            node.parent = None
+        self.root = node
+
+    def _split(self, node: Optional[Node], count: int) -> Tuple[Optional[Node], Optional[Node]]:
+        # (first ``count`` nodes, the rest); the returned roots may keep a stale parent
+        if node is None:
+            return None, None
+        if _size(node.left) >= count:
+            left, rest = self._split(node.left, count)
+            node.left = rest
+            if rest is not None:
+                rest.parent = node
+            self.pull(node)
+            return left, node
+        first, right = self._split(node.right, count - _size(node.left) - 1)
+        node.right = first
+        if first is not None:
+            first.parent = node
+        self.pull(node)
+        return node, right
+
+    def _merge(self, left: Optional[Node], right: Optional[Node]) -> Optional[Node]:
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            left.right.parent = left
+            self.pull(left)
+            return left
+        right.left = self._merge(left, right.left)
+        right.left.parent = right
+        self.pull(right)
+        return right
+
+    def _pull_all(self) -> None:
+        # Post-order without recursion: children are pulled before parents
+        order: List[Node] = []
+        pending = [self.root] if self.root is not None else []
+        while pending:
+            node = pending.pop()
+            order.append(node)
+            if node.left is not None:
+                pending.append(node.left)
+            if node.right is not None:
+                pending.append(node.right)
+        for node in reversed(order):
+            self.pull(node)
+
+    def _leftmost(self, node: Node) -> Node:
+        while node.left is not None:
+            node = node.left
+        return node
+
+    def _refresh_path(self, node: Optional[Node]) -> None:
+        while node is not None:
+            self.pull(node)
+            node = node.parent
+
+    def _replace(self, node: Node, child: Optional[Node]) -> None:
+        parent = node.parent
+        if child is not None:
+            child.parent = parent
+        if parent is None:
+            self.root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+
+    def _rotate_up(self, node: Node) -> None:
+        parent = node.parent
+        if node is parent.left:
+            parent.left = node.right
+            if node.right is not None:
+                node.right.parent = parent
+            node.right = parent
+        else:
+            parent.right = node.left
+            if node.left is not None:
+                node.left.parent = parent
+            node.left = parent
+        self._replace(parent, node)
+        parent.parent = node
+        self.pull(parent)
+        self.pull(node)
@@ -0,0 +1,268 @@
+"""One playlist, many listeners.
+
+SharedPlaylist is a Playlist that hands out PlaybackCursor objects: each
+listener moves its own cursor over the same nodes instead of cloning the
+list. The playlist keeps a registry node -> cursors on that node, so when a
+node is removed (``_unlink_node``, ``extract``, ``clear``) only the cursors
+standing on it are moved, to the next song or else the previous one, the same
+rule ``current`` follows.
+
+Edits take the write side of a ReadWriteLock; cursor moves take the read
+side, so any number of listeners advance at the same time and wait only
+while a curator edit is in progress.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Iterator, Optional, Set
+
+from listadoble import REPEAT_MODES, Playlist, Song, SongNode
+
+
+class ReadWriteLock:
+    # Writers go first once they are waiting, so a steady stream of readers
+    # cannot starve them. The writing thread may take either side again.
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writers_waiting = 0
+        self._writer: Optional[int] = None
+        self._depth = 0
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        if self._writer == threading.get_ident():
+            yield
+            return
+        with self._condition:
+            while self._writer is not None or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer != me:
+                self._writers_waiting += 1
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+                self._writers_waiting -= 1
+                self._writer = me
+            self._depth += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+class PlaybackCursor:
+    __slots__ = ("_playlist", "_node", "repeat")
+
+    def __init__(self, playlist: SharedPlaylist, node: Optional[SongNode]) -> None:
+        self._playlist: Optional[SharedPlaylist] = playlist
+        self._node = node
+        self.repeat = "off"
+
+    @property
+    def song(self) -> Optional[Song]:
+        node = self._node
+        return node.song if node is not None else None
+
+    @property
+    def closed(self) -> bool:
+        return self._playlist is None
+
+    def next(self) -> Optional[Song]:
+        playlist = self._require_open()
+        with playlist.lock.reading():
+            node = self._node
+            if node is None:
+                target = playlist.head
+            elif self.repeat == "one":
+                target = node
+            else:
+                target = node.next
+                if target is None:
+                    target = playlist.head if self.repeat == "all" else node
+            playlist._move_cursor(self, target)
+            return self.song
+
+    def previous(self) -> Optional[Song]:
+        playlist = self._require_open()
+        with playlist.lock.reading():
+            node = self._node
+            if node is None:
+                target = playlist.tail
+            else:
+                target = node.prev
+                if target is None:
+                    target = playlist.tail if self.repeat == "all" else node
+            playlist._move_cursor(self, target)
+            return self.song
+
+    def jump_to(self, index: int) -> Optional[Song]:
+        playlist = self._require_open()
+        with playlist.lock.reading():
+            node = playlist.node_at(index)
+            if node is None:
+                return None
+            playlist._move_cursor(self, node)
+            return node.song
+
+    def position(self) -> Optional[int]:
+        playlist = self._require_open()
+        with playlist.lock.reading():
+            node = self._node
+            return None if node is None else playlist.position_of(node)
+
+    def set_repeat(self, mode: str) -> None:
+        if mode not in REPEAT_MODES:
+            raise ValueError(f"unknown repeat mode: {mode!r}")
+        self.repeat = mode
+
+    def close(self) -> None:
+        playlist = self._playlist
+        if playlist is not None:
+            with playlist.lock.reading():
+                playlist._move_cursor(self, None, register=False)
+
+    def _require_open(self) -> SharedPlaylist:
+        if self._playlist is None:
+            raise ValueError("cursor is closed")
+        return self._playlist
+
+
+def _writes(method):
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock.writing():
+            return method(self, *args, **kwargs)
+    return locked
+
+
+class SharedPlaylist(Playlist):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lock = ReadWriteLock()
+        # Cursors standing on each node; every cursor is in exactly one set,
+        # or in none when its node is None. Readers update it under the mutex
+        self._cursors_at: Dict[SongNode, Set[PlaybackCursor]] = {}
+        self._idle: Set[PlaybackCursor] = set()
+        self._registry = threading.Lock()
+
+    def open_cursor(self, position: int = 1) -> PlaybackCursor:
+        with self.lock.reading():
+            cursor = PlaybackCursor(self, None)
+            self._move_cursor(cursor, self.node_at(position) or self.head)
+            return cursor
+
+    def cursor_count(self) -> int:
+        # Writers update the registry under the write lock alone
+        with self.lock.reading(), self._registry:
+            return len(self._idle) + sum(map(len, self._cursors_at.values()))
+
+    # Edits, and everything that moves the curator's own current song
+    add_song = _writes(Playlist.add_song)
+    insert_after_current = _writes(Playlist.insert_after_current)
+    insert_at = _writes(Playlist.insert_at)
+    extend = _writes(Playlist.extend)
+    splice_after_current = _writes(Playlist.splice_after_current)
+    remove_by_title = _writes(Playlist.remove_by_title)
+    remove_all_by_artist = _writes(Playlist.remove_all_by_artist)
+    remove_current = _writes(Playlist.remove_current)
+    set_shuffle = _writes(Playlist.set_shuffle)
+    play_next = _writes(Playlist.play_next)
+    play_previous = _writes(Playlist.play_previous)
+    jump_to = _writes(Playlist.jump_to)
+    seek = _writes(Playlist.seek)
+
+    def extract(self, start: int, stop: int) -> Optional[Playlist]:
+        with self.lock.writing():
+            first, last = self.node_at(start), self.node_at(stop)
+            target = last.next or first.prev if first and last else None
+            piece = super().extract(start, stop)
+            if piece is not None and self._cursors_at:
+                for node in piece.iter_songs():
+                    self._retarget(node, target)
+            return piece
+
+    def clear(self) -> None:
+        with self.lock.writing():
+            super().clear()
+            self._park_all_cursors()
+
+    def _unlink_node(self, node: SongNode) -> None:
+        target = node.next or node.prev
+        super()._unlink_node(node)
+        self._retarget(node, target)
+
+    def _take_state(self):
+        with self.lock.writing():
+            state = super()._take_state()
+            self._park_all_cursors()
+            return state
+
+    def _disown_nodes(self) -> None:
+        with self.lock.writing():
+            super()._disown_nodes()
+            self._park_all_cursors()
+
+    def _move_cursor(self, cursor: PlaybackCursor, node: Optional[SongNode],
+                     register: bool = True) -> None:
+        # Called with the read lock held; register=False closes the cursor
+        with self._registry:
+            if cursor._playlist is None:
+                # Closed by another thread in the meantime
+                return
+            old = cursor._node
+            if old is None:
+                self._idle.discard(cursor)
+            else:
+                cursors = self._cursors_at.get(old)
+                if cursors is not None:
+                    cursors.discard(cursor)
+                    if not cursors:
+                        del self._cursors_at[old]
+            cursor._node = node
+            if not register:
+                cursor._playlist = None
+                return
+            if node is None:
+                self._idle.add(cursor)
+            else:
+                self._cursors_at.setdefault(node, set()).add(cursor)
+
+    def _retarget(self, node: SongNode, target: Optional[SongNode]) -> None:
+        # Called with the write lock held: move every cursor on node to target
+        cursors = self._cursors_at.pop(node, None)
+        if not cursors:
+            return
+        for cursor in cursors:
+            cursor._node = target
+        if target is None:
+            self._idle.update(cursors)
+        else:
+            self._cursors_at.setdefault(target, set()).update(cursors)
+
+    def _park_all_cursors(self) -> None:
+        for cursors in self._cursors_at.values():
+            for cursor in cursors:
+                cursor._node = None
+            self._idle.update(cursors)
+        self._cursors_at.clear()
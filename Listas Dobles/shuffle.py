@@ -0,0 +1,116 @@
+"""Lazily generated shuffle order over the nodes of a playlist.
+
+The order is a Fisher-Yates shuffle done one step at a time: ``_order[:_dealt]``
+holds the songs already drawn, in play order, and doubles as the history for
+going back; the rest of the list is the pool still to be drawn. Drawing the
+next song swaps a random pool entry to the front of the pool, so each step is
+O(1). Songs added while shuffling join the pool; removed songs are skipped
+when reached and purged once they make up half of the order. A removed song
+that is linked again before it is purged (an undo) keeps its old entry, so
+it is never drawn twice in one round.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Callable, Collection, Iterable, List, Optional, Set
+
+Node = Any
+
+
+class ShuffleOrder:
+    def __init__(self, nodes: Iterable[Node], is_live: Callable[[Node], bool],
+                 first: Optional[Node] = None,
+                 rng: Optional[random.Random] = None) -> None:
+        self._order: List[Node] = list(nodes)
+        # Everything in _order, live or not, to find entries of relinked songs
+        self._entries: Set[Node] = set(self._order)
+        self._is_live = is_live
+        self._randrange = (rng or random.Random()).randrange
+        self._dealt = 0
+        # Index in _order of the song being played, -1 before the first draw
+        self._cursor = -1
+        self._removed = 0
+        if first is not None:
+            # The song playing when shuffle is turned on starts the order
+            index = self._order.index(first)
+            self._swap(0, index)
+            self._dealt = 1
+            self._cursor = 0
+
+    def __len__(self) -> int:
+        return len(self._order) - self._removed
+
+    @property
+    def current(self) -> Optional[Node]:
+        return self._order[self._cursor] if self._cursor >= 0 else None
+
+    def add(self, node: Node) -> None:
+        if node in self._entries:
+            # Removed and linked again: its entry is live once more
+            self._removed -= 1
+            return
+        self._order.append(node)
+        self._entries.add(node)
+
+    def discard(self, node: Node) -> None:
+        # Called after the node left the playlist; it stays in _order until purged
+        self._removed += 1
+        if self._removed > len(self._order) // 2:
+            self._purge()
+
+    def forget(self, nodes: Collection[Node]) -> None:
+        """Drop nodes that are still linked but moved to another playlist (O(n))."""
+        self._purge(nodes)
+
+    def next(self) -> Optional[Node]:
+        """Next song in the order, drawing a new one when the history runs out."""
+        while self._cursor + 1 < self._dealt:
+            self._cursor += 1
+            if self._is_live(self._order[self._cursor]):
+                return self._order[self._cursor]
+        while self._dealt < len(self._order):
+            self._swap(self._dealt, self._randrange(self._dealt, len(self._order)))
+            self._dealt += 1
+            if self._is_live(self._order[self._dealt - 1]):
+                self._cursor = self._dealt - 1
+                return self._order[self._cursor]
+        self._cursor = self._dealt - 1
+        return None
+
+    def previous(self) -> Optional[Node]:
+        """Previous song in the history, or None at its start."""
+        cursor = self._cursor - 1
+        while cursor >= 0:
+            if self._is_live(self._order[cursor]):
+                self._cursor = cursor
+                return self._order[cursor]
+            cursor -= 1
+        return None
+
+    def restart(self) -> None:
+        """Start a new round: every song goes back to the pool."""
+        self._purge()
+        self._dealt = 0
+        self._cursor = -1
+
+    def _swap(self, i: int, j: int) -> None:
+        order = self._order
+        order[i], order[j] = order[j], order[i]
+
+    def _purge(self, dropped: Collection[Node] = ()) -> None:
+        # Keep the relative order of live nodes and the position of the cursor
+        live: List[Node] = []
+        dealt = cursor = 0
+        for index, node in enumerate(self._order):
+            if self._is_live(node) and node not in dropped:
+                live.append(node)
+            if index + 1 == self._dealt:
+                dealt = len(live)
+            if index == self._cursor:
+                cursor = len(live) - 1
+        self._order = live
+        self._entries = set(live)
+        self._dealt = dealt
+        self._cursor = cursor if self._cursor >= 0 else -1
+        self._removed = 0
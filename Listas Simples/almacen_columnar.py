@@ -0,0 +1,418 @@
+"""Almacen columnar para la lista de tareas.
+
+ListaTareasColumnar guarda cada campo en su propia columna en lugar de un
+objeto por tarea: los textos propios de cada tarea (id, titulo, descripcion
+y notas) van en listas, y los valores que se repiten (prioridad, estado,
+responsable, fechas y tags) se guardan como codigos enteros en arreglos
+array.array que apuntan a una tabla de valores unicos. Las fechas se
+interpretan una sola vez por valor distinto y se guardan como ordinales.
+
+Las tareas se leen a traves de VistaTarea, que expone los mismos atributos
+que NodoTarea, asi que las consultas y el renderizador funcionan sin cambios.
+Tambien acepta enlazar_en_bloque, de modo que AlmacenTareas e importacion
+pueden cargar tareas en ella igual que en una ListaTareas, y los ganchos
+_desenlazar/_reenlazar de HistorialCambios. Quitar solo es posible desde la
+ultima tarea (asi deshace el historial): la fila queda oculta al final de
+las columnas y sus vistas la siguen leyendo, de modo que rehacer la vuelve
+a mostrar sin copiar nada. Agregar otra tarea descarta las filas ocultas.
+
+Es el almacen para listas muy grandes: cada tarea ocupa cerca de un tercio
+de lo que ocupaba un nodo con __dict__. NodoTarea con __slots__, por si
+solo, apenas reduce esa memoria a la mitad.
+"""
+
+from array import array
+
+from consultas import Consulta, RenderizadorTareas, ejecutar, fecha_a_ordinal, normalizar_texto
+from listasimple import ListaTareas
+
+# Ordinal guardado cuando la fecha no se reconoce
+SIN_FECHA = -1
+
+
+class TablaValores:
+    """Valores unicos de una columna, cada uno con un codigo entero."""
+
+    def __init__(self):
+        self.valores = []
+        self._codigos = {}
+
+    def __len__(self):
+        return len(self.valores)
+
+    def __getitem__(self, codigo):
+        return self.valores[codigo]
+
+    def codificar(self, valor):
+        """Devuelve el codigo del valor, registrandolo si es nuevo."""
+        codigo = self._codigos.get(valor)
+        if codigo is None:
+            codigo = self._codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+
+def _campo(columna):
+    """Atributo de la vista que lee la fila de una columna de textos."""
+    return property(lambda vista: getattr(vista._lista, columna)[vista.fila])
+
+
+def _campo_codificado(columna, tabla):
+    """Atributo de la vista que decodifica la fila de una columna de codigos."""
+    return property(lambda vista: getattr(vista._lista, tabla)[
+        getattr(vista._lista, columna)[vista.fila]])
+
+
+def _ordinal(columna):
+    """Atributo de la vista con el ordinal de una columna de fechas."""
+    def leer(vista):
+        lista = vista._lista
+        ordinal = lista._ordinales[getattr(lista, columna)[vista.fila]]
+        return None if ordinal == SIN_FECHA else ordinal
+    return property(leer)
+
+
+def _datos_tarea(nodo):
+    """Campos de una tarea en el orden de agregar_tarea."""
+    return (nodo.id_tarea, nodo.titulo, nodo.descripcion, nodo.prioridad, nodo.estado,
+            nodo.fecha_creacion, nodo.fecha_vencimiento, nodo.responsable, nodo.tags,
+            nodo.notas_adicionales)
+
+
+class VistaTarea:
+    """Acceso de solo lectura a una fila, con los atributos de NodoTarea."""
+
+    __slots__ = ("_lista", "fila")
+
+    def __init__(self, lista, fila):
+        self._lista = lista
+        self.fila = fila
+
+    id_tarea = _campo("_ids")
+    titulo = _campo("_titulos")
+    descripcion = _campo("_descripciones")
+    notas_adicionales = _campo("_notas")
+    prioridad = _campo_codificado("_prioridades", "_tabla_prioridades")
+    estado = _campo_codificado("_estados", "_tabla_estados")
+    responsable = _campo_codificado("_responsables", "_tabla_responsables")
+    fecha_creacion = _campo_codificado("_creacion", "_tabla_fechas")
+    fecha_vencimiento = _campo_codificado("_vencimiento", "_tabla_fechas")
+    ordinal_creacion = _ordinal("_creacion")
+    ordinal_vencimiento = _ordinal("_vencimiento")
+
+    @property
+    def tags(self):
+        return tuple(self._lista._tabla_tags[codigo] for codigo in self._codigos_tags())
+
+    @property
+    def tags_normalizados(self):
+        normalizados = self._lista._tags_normalizados
+        return tuple(dict.fromkeys(normalizados[codigo] for codigo in self._codigos_tags()))
+
+    @property
+    def titulo_normalizado(self):
+        return normalizar_texto(self.titulo)
+
+    @property
+    def orden(self):
+        return self.fila
+
+    @property
+    def next(self):
+        """Vista de la fila siguiente, como el enlace de NodoTarea."""
+        siguiente = self.fila + 1
+        return VistaTarea(self._lista, siguiente) if siguiente < len(self._lista) else None
+
+    def coincide_tag(self, tag_busqueda):
+        """Verifica si el tag buscado existe dentro de los tags de la tarea."""
+        return normalizar_texto(tag_busqueda) in self.tags_normalizados
+
+    def coincide_titulo(self, titulo_busqueda):
+        """Compara el titulo de la tarea con el titulo buscado (ignorando mayusculas)."""
+        return self.titulo_normalizado == normalizar_texto(titulo_busqueda)
+
+    def _codigos_tags(self):
+        lista = self._lista
+        return lista._tags[lista._inicio_tags[self.fila]:lista._inicio_tags[self.fila + 1]]
+
+    def __eq__(self, otra):
+        if not isinstance(otra, VistaTarea):
+            return NotImplemented
+        return self._lista is otra._lista and self.fila == otra.fila
+
+    def __hash__(self):
+        return hash((id(self._lista), self.fila))
+
+    def __repr__(self):
+        return f"VistaTarea({self.id_tarea!r}, fila={self.fila})"
+
+
+class ListaTareasColumnar:
+    """Misma API que ListaTareas, con las tareas guardadas por columnas."""
+
+    def __init__(self):
+        # Textos propios de cada tarea
+        self._ids = []
+        # Filas visibles; las que siguen en las columnas son tareas quitadas
+        # con _desenlazar que se pueden volver a mostrar
+        self._filas = 0
+        self._titulos = []
+        self._descripciones = []
+        self._notas = []
+        # Valores repetidos: un codigo por fila y una tabla de valores unicos
+        self._prioridades = array("I")
+        self._estados = array("I")
+        self._responsables = array("I")
+        self._tabla_prioridades = TablaValores()
+        self._tabla_estados = TablaValores()
+        self._tabla_responsables = TablaValores()
+        # Fechas: codigo por fila; el ordinal se guarda una vez por fecha distinta
+        self._creacion = array("I")
+        self._vencimiento = array("I")
+        self._tabla_fechas = TablaValores()
+        self._ordinales = array("i")
+        # Tags: codigos de todas las filas seguidos, delimitados por _inicio_tags
+        self._tags = array("I")
+        self._inicio_tags = array("I", [0])
+        self._tabla_tags = TablaValores()
+        self._tags_normalizados = []
+        # Indices: id -> fila, tag normalizado -> filas, titulo normalizado -> filas
+        self._indice_ids = {}
+        self._indice_tags = {}
+        self._indice_titulos = {}
+        self.renderizador = RenderizadorTareas()
+        self._observadores = []
+
+    def __len__(self):
+        return self._filas
+
+    def __iter__(self):
+        """Recorre las tareas en orden de insercion."""
+        for fila in range(self._filas):
+            yield VistaTarea(self, fila)
+
+    @property
+    def head(self):
+        return VistaTarea(self, 0) if self._filas else None
+
+    @property
+    def tail(self):
+        return VistaTarea(self, self._filas - 1) if self._filas else None
+
+    def agregar_tarea(self, id_tarea, titulo, descripcion, prioridad, estado,
+                      fecha_creacion, fecha_vencimiento, responsable, tags,
+                      notas_adicionales):
+        """Agrega una nueva tarea al final de la lista si el id no esta repetido."""
+        if self._contiene_id(id_tarea):
+            print(f"Ya existe una tarea con el id '{id_tarea}'. Usa otro identificador.")
+            return False
+
+        fila = self._agregar_fila(id_tarea, titulo, descripcion, prioridad, estado,
+                                  fecha_creacion, fecha_vencimiento, responsable, tags,
+                                  notas_adicionales)
+        self._notificar("agregar", VistaTarea(self, fila))
+        return True
+
+    def enlazar_en_bloque(self, nodos):
+        """Agrega al final una secuencia de tareas ya creadas (NodoTarea o vistas).
+
+        Igual que en ListaTareas: no imprime avisos, devuelve cuantas tareas
+        se agregaron, lanza ValueError sin modificar nada si algun id se
+        repite y avisa a los observadores una sola vez ("bloque", vistas).
+        """
+        nodos = list(nodos)
+        ids = [nodo.id_tarea for nodo in nodos]
+        if len(set(ids)) != len(ids) or not self._indice_ids.keys().isdisjoint(ids):
+            vistos = set(self._indice_ids)
+            for id_tarea in ids:
+                if id_tarea in vistos:
+                    raise ValueError(f"id de tarea repetido: {id_tarea!r}")
+                vistos.add(id_tarea)
+        if not nodos:
+            return 0
+
+        if all(isinstance(nodo, VistaTarea) and nodo._lista is self
+               and nodo.fila == self._filas + posicion
+               for posicion, nodo in enumerate(nodos)):
+            # Rehacer un bloque quitado: sus filas siguen ocultas en las columnas
+            for _ in nodos:
+                self._mostrar_fila()
+            vistas = nodos
+        else:
+            # Los datos se leen antes de agregar: las vistas de filas ocultas
+            # dejan de ser validas en cuanto se descartan
+            datos = [_datos_tarea(nodo) for nodo in nodos]
+            vistas = [VistaTarea(self, self._agregar_fila(*campos)) for campos in datos]
+        self._notificar("bloque", vistas)
+        return len(vistas)
+
+    def actualizar_estado(self, id_tarea, estado):
+        """Cambia el estado de la tarea con el id indicado."""
+        fila = self._indice_ids.get(id_tarea)
+        if fila is None:
+            print(f"No existe una tarea con el id '{id_tarea}'.")
+            return False
+        anterior = self._tabla_estados[self._estados[fila]]
+        self._estados[fila] = self._tabla_estados.codificar(estado)
+        self._notificar("estado", VistaTarea(self, fila), anterior)
+        return True
+
+    def obtener_tarea(self, id_tarea):
+        """Devuelve la tarea con el id indicado, o None si no existe."""
+        fila = self._indice_ids.get(id_tarea)
+        return None if fila is None else VistaTarea(self, fila)
+
+    def tareas_con_tag(self, tag):
+        """Devuelve, en orden de insercion, las tareas que tienen el tag."""
+        return [VistaTarea(self, fila)
+                for fila in self._indice_tags.get(normalizar_texto(tag), ())]
+
+    def tareas_con_tags(self, tags, todas=True):
+        """Devuelve las tareas que tienen todos los tags (o alguno si todas=False)."""
+        conjuntos = [self._indice_tags.get(normalizar_texto(tag), ()) for tag in tags]
+        if not conjuntos:
+            return []
+        if todas:
+            conjuntos.sort(key=len)
+            resultado = set(conjuntos[0])
+            for conjunto in conjuntos[1:]:
+                resultado.intersection_update(conjunto)
+                if not resultado:
+                    break
+        else:
+            resultado = set().union(*conjuntos)
+        return [VistaTarea(self, fila) for fila in sorted(resultado)]
+
+    def tareas_con_titulo(self, titulo):
+        """Devuelve, en orden de insercion, las tareas cuyo titulo coincide."""
+        filas = self._indice_titulos.get(normalizar_texto(titulo), ())
+        if isinstance(filas, int):
+            filas = (filas,)
+        return [VistaTarea(self, fila) for fila in filas]
+
+    def consultar(self, **criterios):
+        """Devuelve un generador con las tareas que cumplen los criterios."""
+        return ejecutar(self, Consulta(**criterios))
+
+    # Salida por consola y observadores iguales a los de la lista enlazada
+    buscar_por_tag = ListaTareas.buscar_por_tag
+    buscar_por_titulo = ListaTareas.buscar_por_titulo
+    mostrar_todas = ListaTareas.mostrar_todas
+    agregar_observador = ListaTareas.agregar_observador
+    quitar_observador = ListaTareas.quitar_observador
+    _notificar = ListaTareas._notificar
+
+    def _contiene_id(self, id_busqueda):
+        """Revisa si ya existe una tarea con el id indicado."""
+        return id_busqueda in self._indice_ids
+
+    def _agregar_fila(self, id_tarea, titulo, descripcion, prioridad, estado,
+                      fecha_creacion, fecha_vencimiento, responsable, tags,
+                      notas_adicionales):
+        """Agrega la fila al final de las columnas y los indices; devuelve su numero."""
+        fila = self._filas
+        if len(self._ids) > fila:
+            self._descartar_ocultas()
+        self._ids.append(id_tarea)
+        self._titulos.append(titulo)
+        self._descripciones.append(descripcion)
+        self._notas.append(notas_adicionales)
+        self._prioridades.append(self._tabla_prioridades.codificar(prioridad))
+        self._estados.append(self._tabla_estados.codificar(estado))
+        self._responsables.append(self._tabla_responsables.codificar(responsable))
+        self._creacion.append(self._codificar_fecha(fecha_creacion))
+        self._vencimiento.append(self._codificar_fecha(fecha_vencimiento))
+        for tag in tags:
+            self._tags.append(self._codificar_tag(tag))
+        self._inicio_tags.append(len(self._tags))
+        self._filas += 1
+        self._indexar(fila, id_tarea, titulo)
+        return fila
+
+    def _desenlazar(self, vista, anterior=None):
+        """Quita la ultima tarea en O(1); `anterior` solo existe por compatibilidad.
+
+        La fila queda oculta y `vista` la sigue leyendo. Lanza ValueError si
+        la vista no es la ultima tarea de esta lista.
+        """
+        fila = self._filas - 1
+        if vista._lista is not self or vista.fila != fila:
+            raise ValueError("en una lista columnar solo se puede quitar la ultima tarea")
+        self._desindexar(fila)
+        self._filas = fila
+        self._notificar("eliminar", vista, self.tail)
+
+    def _reenlazar(self, vista):
+        """Vuelve a mostrar al final la tarea quitada con _desenlazar."""
+        if vista._lista is not self or vista.fila != self._filas or vista.fila >= len(self._ids):
+            raise ValueError("la vista no es la ultima tarea quitada de esta lista")
+        self._mostrar_fila()
+        self._notificar("agregar", vista)
+
+    def _mostrar_fila(self):
+        fila = self._filas
+        self._filas += 1
+        self._indexar(fila, self._ids[fila], self._titulos[fila])
+
+    def _descartar_ocultas(self):
+        """Borra de las columnas las filas ocultas; sus vistas dejan de ser validas."""
+        fila = self._filas
+        for columna in (self._ids, self._titulos, self._descripciones, self._notas,
+                        self._prioridades, self._estados, self._responsables,
+                        self._creacion, self._vencimiento):
+            del columna[fila:]
+        del self._tags[self._inicio_tags[fila]:]
+        del self._inicio_tags[fila + 1:]
+
+    def _completar_indices(self):
+        """Los indices se actualizan al agregar cada fila: no hay pendientes."""
+
+    def _codificar_fecha(self, fecha):
+        codigo = self._tabla_fechas.codificar(fecha)
+        if codigo == len(self._ordinales):
+            ordinal = fecha_a_ordinal(fecha)
+            self._ordinales.append(SIN_FECHA if ordinal is None else ordinal)
+        return codigo
+
+    def _codificar_tag(self, tag):
+        codigo = self._tabla_tags.codificar(tag)
+        if codigo == len(self._tags_normalizados):
+            self._tags_normalizados.append(normalizar_texto(tag))
+        return codigo
+
+    def _indexar(self, fila, id_tarea, titulo):
+        """Registra la fila en el indice de ids, de tags y de titulos."""
+        self._indice_ids[id_tarea] = fila
+        inicio, fin = self._inicio_tags[fila], self._inicio_tags[fila + 1]
+        for tag in dict.fromkeys(self._tags_normalizados[c] for c in self._tags[inicio:fin]):
+            self._indice_tags.setdefault(tag, array("I")).append(fila)
+        # Un titulo unico guarda la fila directamente; al repetirse pasa a un arreglo
+        clave = normalizar_texto(titulo)
+        if clave == titulo:
+            clave = titulo
+        filas = self._indice_titulos.get(clave)
+        if filas is None:
+            self._indice_titulos[clave] = fila
+        elif isinstance(filas, int):
+            self._indice_titulos[clave] = array("I", (filas, fila))
+        else:
+            filas.append(fila)
+
+    def _desindexar(self, fila):
+        """Quita la fila de los indices; siempre es la ultima de cada uno."""
+        del self._indice_ids[self._ids[fila]]
+        inicio, fin = self._inicio_tags[fila], self._inicio_tags[fila + 1]
+        for tag in dict.fromkeys(self._tags_normalizados[c] for c in self._tags[inicio:fin]):
+            filas = self._indice_tags[tag]
+            filas.pop()
+            if not filas:
+                del self._indice_tags[tag]
+        clave = normalizar_texto(self._titulos[fila])
+        filas = self._indice_titulos[clave]
+        if isinstance(filas, int):
+            del self._indice_titulos[clave]
+        elif len(filas) == 2:
+            self._indice_titulos[clave] = filas[0]
+        else:
+            filas.pop()
+
@@ -0,0 +1,191 @@
+"""Capa de consultas y renderizado para la lista de tareas.
+
+Las consultas devuelven generadores de nodos en lugar de imprimir, con
+filtros por prioridad, estado, responsable y fecha de vencimiento y
+paginacion por desplazamiento/limite. El formato de salida vive aparte, en
+RenderizadorTareas, que escribe cada pagina con una sola llamada.
+"""
+
+import sys
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import islice
+
+# Formatos de fecha aceptados ademas de ISO (AAAA-MM-DD)
+FORMATOS_FECHA = ("%d/%m/%Y", "%d-%m-%Y")
+
+
+def normalizar_texto(texto):
+    """Forma canonica usada para comparar titulos y tags sin importar mayusculas."""
+    return texto.strip().casefold()
+
+
+@lru_cache(maxsize=4096)
+def fecha_a_ordinal(fecha):
+    """Convierte una fecha (date o texto) a su ordinal, o None si no se reconoce.
+
+    Las fechas se repiten mucho entre tareas: la cache evita volver a
+    interpretarlas y hace que todas compartan el mismo objeto entero.
+    """
+    if isinstance(fecha, date):
+        return fecha.toordinal()
+    texto = (fecha or "").strip()
+    if not texto:
+        return None
+    try:
+        return date.fromisoformat(texto).toordinal()
+    except ValueError:
+        pass
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.strptime(texto, formato).toordinal()
+        except ValueError:
+            continue
+    return None
+
+
+def _conjunto_normalizado(valor):
+    """Acepta un texto o una coleccion de textos y devuelve un conjunto normalizado."""
+    if valor is None:
+        return None
+    if isinstance(valor, str):
+        valor = [valor]
+    return {normalizar_texto(v) for v in valor}
+
+
+class Consulta:
+    """Describe una busqueda: criterios, filtros y paginacion."""
+
+    def __init__(self, tags=None, todas_las_tags=True, titulo=None, prioridad=None,
+                 estado=None, responsable=None, vence_desde=None, vence_hasta=None,
+                 desplazamiento=0, limite=None):
+        self.tags = _conjunto_normalizado(tags)
+        self.todas_las_tags = todas_las_tags
+        self.titulo = normalizar_texto(titulo) if titulo is not None else None
+        self.prioridad = _conjunto_normalizado(prioridad)
+        self.estado = _conjunto_normalizado(estado)
+        self.responsable = _conjunto_normalizado(responsable)
+        self.vence_desde = fecha_a_ordinal(vence_desde) if vence_desde is not None else None
+        self.vence_hasta = fecha_a_ordinal(vence_hasta) if vence_hasta is not None else None
+        self.desplazamiento = desplazamiento
+        self.limite = limite
+
+    def coincide(self, nodo):
+        """Indica si el nodo cumple todos los criterios (sin paginacion)."""
+        if self.tags is not None:
+            if self.todas_las_tags and not self.tags.issubset(nodo.tags_normalizados):
+                return False
+            if not self.todas_las_tags and self.tags.isdisjoint(nodo.tags_normalizados):
+                return False
+        if self.titulo is not None and nodo.titulo_normalizado != self.titulo:
+            return False
+        if self.prioridad is not None and normalizar_texto(nodo.prioridad) not in self.prioridad:
+            return False
+        if self.estado is not None and normalizar_texto(nodo.estado) not in self.estado:
+            return False
+        if (self.responsable is not None
+                and normalizar_texto(nodo.responsable) not in self.responsable):
+            return False
+        if self.vence_desde is not None or self.vence_hasta is not None:
+            vencimiento = nodo.ordinal_vencimiento
+            if vencimiento is None:
+                return False
+            if self.vence_desde is not None and vencimiento < self.vence_desde:
+                return False
+            if self.vence_hasta is not None and vencimiento > self.vence_hasta:
+                return False
+        return True
+
+    def candidatos(self, lista):
+        """Nodos a revisar: salen de los indices cuando hay tags o titulo."""
+        if self.titulo is not None:
+            return lista.tareas_con_titulo(self.titulo)
+        if self.tags:
+            return lista.tareas_con_tags(self.tags, todas=self.todas_las_tags)
+        return iter(lista)
+
+    def paginar(self, nodos):
+        fin = self.desplazamiento + self.limite if self.limite is not None else None
+        return islice(nodos, self.desplazamiento, fin)
+
+
+def ejecutar(lista, consulta):
+    """Generador perezoso con las tareas que cumplen la consulta."""
+    return consulta.paginar(n for n in consulta.candidatos(lista) if consulta.coincide(n))
+
+
+def ejecutar_lote(lista, consultas):
+    """Resuelve varias consultas con un solo recorrido de la lista.
+
+    Devuelve una lista de resultados (listas de nodos) en el mismo orden que
+    las consultas. El recorrido termina antes si todas llegaron a su limite.
+    """
+    resultados = [[] for _ in consultas]
+    saltados = [0] * len(consultas)
+    pendientes = [i for i, c in enumerate(consultas) if c.limite != 0]
+    actual = lista.head
+    while actual is not None and pendientes:
+        completas = False
+        for i in pendientes:
+            consulta = consultas[i]
+            if not consulta.coincide(actual):
+                continue
+            if saltados[i] < consulta.desplazamiento:
+                saltados[i] += 1
+                continue
+            resultados[i].append(actual)
+            if consulta.limite is not None and len(resultados[i]) >= consulta.limite:
+                completas = True
+        if completas:
+            pendientes = [i for i in pendientes
+                          if consultas[i].limite is None
+                          or len(resultados[i]) < consultas[i].limite]
+        actual = actual.next
+    return resultados
+
+
+class RenderizadorTareas:
+    """Da formato a las tareas y las escribe por paginas, una escritura por pagina."""
+
+    SEPARADOR = "-" * 70
+
+    def __init__(self, salida=None, tamano_pagina=200):
+        self.salida = salida
+        self.tamano_pagina = tamano_pagina
+
+    def formatear(self, tarea, indice=None):
+        """Devuelve el bloque de texto de una tarea (incluye el separador final)."""
+        etiqueta_indice = f"Tarea {indice}" if indice is not None else "Tarea"
+        tags_formateados = ", ".join(tarea.tags) if tarea.tags else "(sin tags)"
+        notas = tarea.notas_adicionales or "(sin notas)"
+        return "\n".join((
+            etiqueta_indice,
+            f"  Id             : {tarea.id_tarea}",
+            f"  Titulo         : {tarea.titulo}",
+            f"  Descripcion    : {tarea.descripcion}",
+            f"  Prioridad      : {tarea.prioridad}",
+            f"  Estado         : {tarea.estado}",
+            f"  Fecha creacion : {tarea.fecha_creacion}",
+            f"  Fecha vencim.  : {tarea.fecha_vencimiento}",
+            f"  Responsable    : {tarea.responsable}",
+            f"  Tags           : {tags_formateados}",
+            f"  Notas          : {notas}",
+            self.SEPARADOR,
+        ))
+
+    def escribir(self, tareas, encabezado=None, numerar=True, inicio=1):
+        """Escribe las tareas por paginas y devuelve cuantas se escribieron."""
+        salida = self.salida or sys.stdout
+        pagina = []
+        if encabezado is not None:
+            pagina.append(f"\n{encabezado}\n{self.SEPARADOR}")
+        total = 0
+        for indice, tarea in enumerate(tareas, start=inicio):
+            pagina.append(self.formatear(tarea, indice if numerar else None))
+            total += 1
+            if len(pagina) >= self.tamano_pagina:
+                salida.write("\n".join(pagina) + "\n")
+                pagina = []
+        if pagina:
+            salida.write("\n".join(pagina) + "\n")
+        return total
@@ -0,0 +1,110 @@
+"""Deshacer y rehacer cambios de una ListaTareas.
+
+HistorialCambios se registra como observador de la lista y por cada cambio
+guarda la operacion inversa, con los nodos mismos en lugar de copias: deshacer
+un agregado desenlaza ese nodo de la cola y rehacerlo lo vuelve a enlazar.
+Como se deshace en el orden inverso al de los cambios, el nodo a quitar es
+siempre el ultimo de la lista y su anterior se conoce, asi que cada paso es
+O(1) aunque la lista sea simple (un bloque cuesta O(tamano del bloque)).
+
+Los cambios deshechos avisan a los demas observadores como cualquier otro:
+el planificador saca la tarea y el almacen en disco registra "eliminar".
+Solo se guardan los ultimos `limite` cambios; los mas viejos se olvidan.
+
+Sirve igual para almacen_columnar.ListaTareasColumnar, que implementa los
+mismos ganchos (_desenlazar, _reenlazar y enlazar_en_bloque).
+"""
+
+from collections import deque
+
+
+class HistorialCambios:
+    """Pila de deshacer/rehacer sincronizada con una ListaTareas."""
+
+    def __init__(self, lista, limite=1000):
+        self.lista = lista
+        self._deshacer = deque(maxlen=limite)
+        self._rehacer = []
+        self._aplicando = False
+        # Cola de la lista despues del ultimo cambio: es el nodo anterior al
+        # proximo que se agregue
+        self._cola = lista.tail
+        lista.agregar_observador(self._registrar)
+
+    @property
+    def puede_deshacer(self):
+        return bool(self._deshacer)
+
+    @property
+    def puede_rehacer(self):
+        return bool(self._rehacer)
+
+    def deshacer(self):
+        """Revierte el ultimo cambio; devuelve False si no hay ninguno."""
+        if not self._deshacer:
+            return False
+        self._rehacer.append(self._aplicar(self._deshacer.pop()))
+        return True
+
+    def rehacer(self):
+        """Vuelve a aplicar el ultimo cambio deshecho; False si no hay ninguno."""
+        if not self._rehacer:
+            return False
+        self._deshacer.append(self._aplicar(self._rehacer.pop()))
+        return True
+
+    def desconectar(self):
+        """Deja de seguir los cambios de la lista y olvida el historial."""
+        self.lista.quitar_observador(self._registrar)
+        self._deshacer.clear()
+        self._rehacer.clear()
+
+    def _registrar(self, operacion, nodo, *detalle):
+        if self._aplicando:
+            return
+        if operacion == "agregar":
+            entrada = ("quitar", nodo, self._cola)
+        elif operacion == "bloque":
+            entrada = ("recortar", self._cola, list(nodo))
+        elif operacion == "estado":
+            entrada = ("estado", nodo, detalle[0])
+        else:
+            # Solo el propio historial quita tareas de la lista
+            return
+        self._deshacer.append(entrada)
+        self._rehacer.clear()
+        self._cola = self.lista.tail
+
+    def _aplicar(self, entrada):
+        """Ejecuta la entrada sobre la lista y devuelve la entrada que la revierte."""
+        lista = self.lista
+        self._aplicando = True
+        try:
+            tipo = entrada[0]
+            if tipo == "quitar":
+                _, nodo, anterior = entrada
+                lista._desenlazar(nodo, anterior)
+                return ("reenlazar", nodo)
+            if tipo == "reenlazar":
+                anterior = lista.tail
+                lista._reenlazar(entrada[1])
+                return ("quitar", entrada[1], anterior)
+            if tipo == "recortar":
+                _, anterior, nodos = entrada
+                for posicion in range(len(nodos) - 1, -1, -1):
+                    lista._desenlazar(nodos[posicion],
+                                      nodos[posicion - 1] if posicion else anterior)
+                return ("bloque", nodos)
+            if tipo == "bloque":
+                anterior = lista.tail
+                lista.enlazar_en_bloque(entrada[1])
+                return ("recortar", anterior, entrada[1])
+            if tipo == "estado":
+                _, nodo, estado = entrada
+                actual = nodo.estado
+                lista.actualizar_estado(nodo.id_tarea, estado)
+                return ("estado", nodo, actual)
+            raise ValueError(f"entrada de historial desconocida: {tipo!r}")
+        finally:
+            self._aplicando = False
+            self._cola = lista.tail
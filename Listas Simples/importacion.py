@@ -0,0 +1,291 @@
+"""Importacion y exportacion masiva de tareas en CSV o JSONL.
+
+La importacion lee el archivo por bloques de lineas y los valida en un pool
+de procesos; el proceso principal recibe los registros en orden, descarta
+los ids repetidos en una sola pasada, crea los nodos y los enlaza de una
+vez con ListaTareas.enlazar_en_bloque. Solo la lectura y la validacion son
+paralelas: los nodos se crean en el proceso principal, en serie, porque los
+textos internados por NodoTarea no sobreviven al pasar entre procesos y la
+lista terminaria con una copia de cada valor repetido. La exportacion recorre la lista y
+escribe las tareas por lotes, sin armar el archivo completo en memoria.
+
+    python importacion.py importar tareas.csv --datos carpeta
+    python importacion.py exportar tareas.jsonl --datos carpeta
+
+Columnas (CSV con encabezado) o claves (JSONL): id_tarea, titulo,
+descripcion, prioridad, estado, fecha_creacion, fecha_vencimiento,
+responsable, tags y notas_adicionales. En CSV los tags van separados por
+comas dentro de su columna, igual que en el menu interactivo. En JSONL los
+numeros (por ejemplo ids numericos de otros gestores) se toman como texto.
+Las columnas o claves que no son de la tarea (habituales al migrar desde
+otro gestor) se ignoran y se informan una vez, en
+ResultadoImportacion.ignoradas.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from listasimple import ListaTareas, NodoTarea
+from persistencia import CAMPOS, AlmacenTareas, sin_recolector, tarea_a_dict
+
+FORMATOS = ("csv", "jsonl")
+OBLIGATORIOS = ("id_tarea", "titulo")
+LINEAS_POR_BLOQUE = 20000
+# Bloques en vuelo por proceso: acota la memoria al leer archivos enormes
+BLOQUES_EN_VUELO = 2
+
+
+class ResultadoImportacion:
+    """Resumen de una importacion."""
+
+    def __init__(self):
+        self.importadas = 0
+        self.duplicadas = 0
+        # (numero de linea, mensaje) de cada registro rechazado
+        self.errores = []
+        # Columnas (CSV) o claves (JSONL) desconocidas que no se importaron
+        self.ignoradas = []
+
+    def __repr__(self):
+        return (f"ResultadoImportacion(importadas={self.importadas}, "
+                f"duplicadas={self.duplicadas}, errores={len(self.errores)}, "
+                f"ignoradas={self.ignoradas})")
+
+
+def formato_de(ruta, formato=None):
+    """Formato indicado o deducido de la extension del archivo."""
+    formato = formato or os.path.splitext(ruta)[1].lstrip(".").lower()
+    if formato not in FORMATOS:
+        raise ValueError(f"formato no soportado: {formato!r} (usa csv o jsonl)")
+    return formato
+
+
+# Lectura por bloques ----------------------------------------------------
+
+def _bloques(archivo, formato, lineas_por_bloque):
+    """Genera (numero de la primera linea, lineas) sin cortar registros.
+
+    En CSV un campo entre comillas puede contener saltos de linea: solo se
+    corta el bloque cuando la cantidad de comillas leidas es par.
+    """
+    bloque, inicio, comillas = [], None, 0
+    for numero, linea in enumerate(archivo, start=1):
+        if inicio is None:
+            inicio = numero
+        bloque.append(linea)
+        if formato == "csv":
+            comillas += linea.count('"')
+        if len(bloque) >= lineas_por_bloque and comillas % 2 == 0:
+            yield inicio, bloque
+            bloque, inicio, comillas = [], None, 0
+    if bloque:
+        yield inicio, bloque
+
+
+def _en_paralelo(funcion, trabajos, workers):
+    """Como map(), pero en procesos, en orden y con pocos trabajos en vuelo."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(funcion, trabajos)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pendientes = deque()
+        for trabajo in trabajos:
+            pendientes.append(pool.submit(funcion, trabajo))
+            if len(pendientes) >= workers * BLOQUES_EN_VUELO:
+                yield pendientes.popleft().result()
+        while pendientes:
+            yield pendientes.popleft().result()
+
+
+# Validacion (se ejecuta en los procesos del pool) -----------------------
+
+def _validar(datos):
+    """Convierte un dict de campos en la tupla de argumentos de NodoTarea.
+
+    Las claves que no estan en CAMPOS no se leen.
+    """
+    valores = []
+    for campo in CAMPOS:
+        valor = _como_texto(datos.get(campo))
+        if valor is None:
+            valor = [] if campo == "tags" else ""
+        if campo == "tags":
+            if isinstance(valor, str):
+                valor = valor.split(",")
+            if not isinstance(valor, list):
+                raise ValueError("tags debe ser un texto o una lista de textos")
+            valor = [_como_texto(tag) for tag in valor]
+            if not all(isinstance(tag, str) for tag in valor):
+                raise ValueError("tags debe ser un texto o una lista de textos")
+            valor = [tag.strip() for tag in valor if tag.strip()]
+        elif not isinstance(valor, str):
+            raise ValueError(f"{campo} debe ser texto")
+        else:
+            valor = valor.strip()
+        valores.append(valor)
+    registro = tuple(valores)
+    for campo in OBLIGATORIOS:
+        if not registro[CAMPOS.index(campo)]:
+            raise ValueError(f"{campo} es obligatorio")
+    return registro
+
+
+def _como_texto(valor):
+    """Pasa a texto los numeros; deja igual el resto (incluidos los booleanos)."""
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return str(valor)
+    return valor
+
+
+def _procesar_bloque(trabajo):
+    """Valida un bloque y devuelve (registros, errores, claves desconocidas)."""
+    formato, encabezado, inicio, lineas = trabajo
+    registros, errores, desconocidas = [], [], set()
+    if formato == "jsonl":
+        for numero, linea in enumerate(lineas, start=inicio):
+            if not linea.strip():
+                continue
+            try:
+                datos = json.loads(linea)
+                if not isinstance(datos, dict):
+                    raise ValueError("cada linea debe ser un objeto JSON")
+                desconocidas.update(datos.keys() - CAMPOS)
+                registros.append(_validar(datos))
+            except ValueError as error:
+                errores.append((numero, str(error)))
+    else:
+        lector = csv.reader(io.StringIO("".join(lineas)))
+        leidas = 0
+        for fila in lector:
+            # Primera linea del registro, aunque un campo ocupe varias
+            numero, leidas = inicio + leidas, lector.line_num
+            if not any(fila):
+                continue
+            try:
+                if len(fila) != len(encabezado):
+                    raise ValueError(f"se esperaban {len(encabezado)} columnas, "
+                                     f"hay {len(fila)}")
+                registros.append(_validar(dict(zip(encabezado, fila))))
+            except ValueError as error:
+                errores.append((numero, str(error)))
+    return registros, errores, desconocidas
+
+
+# Importacion y exportacion ----------------------------------------------
+
+def importar(ruta, lista=None, formato=None, workers=None,
+             lineas_por_bloque=LINEAS_POR_BLOQUE):
+    """Importa las tareas del archivo al final de la lista.
+
+    Devuelve (lista, ResultadoImportacion). Los ids que ya existen en la
+    lista o que se repiten en el archivo se cuentan como duplicados y se
+    conserva la primera aparicion.
+    """
+    formato = formato_de(ruta, formato)
+    lista = ListaTareas() if lista is None else lista
+    resultado = ResultadoImportacion()
+    nodos, vistos = [], set()
+    posicion_id = CAMPOS.index("id_tarea")
+
+    with open(ruta, encoding="utf-8-sig", newline="") as archivo:
+        encabezado = None
+        desplazamiento = 0
+        ignoradas = set()
+        if formato == "csv":
+            encabezado = [nombre.strip() for nombre in next(csv.reader(archivo), [])]
+            desplazamiento = 1
+            faltantes = set(OBLIGATORIOS) - set(encabezado)
+            if faltantes:
+                raise ValueError(f"faltan columnas en {ruta}: {', '.join(sorted(faltantes))}")
+            ignoradas = set(encabezado) - set(CAMPOS)
+        trabajos = ((formato, encabezado, inicio + desplazamiento, lineas)
+                    for inicio, lineas in _bloques(archivo, formato, lineas_por_bloque))
+        with sin_recolector():
+            for registros, errores, desconocidas in _en_paralelo(_procesar_bloque, trabajos,
+                                                                 workers):
+                resultado.errores.extend(errores)
+                ignoradas |= desconocidas
+                for registro in registros:
+                    id_tarea = registro[posicion_id]
+                    if id_tarea in vistos or lista.obtener_tarea(id_tarea) is not None:
+                        resultado.duplicadas += 1
+                        continue
+                    vistos.add(id_tarea)
+                    nodos.append(NodoTarea(*registro))
+            resultado.importadas = lista.enlazar_en_bloque(nodos)
+    resultado.ignoradas = sorted(ignoradas)
+    return lista, resultado
+
+
+def _fila_csv(nodo):
+    datos = tarea_a_dict(nodo)
+    datos["tags"] = ",".join(nodo.tags)
+    return [datos[campo] for campo in CAMPOS]
+
+
+def exportar(lista, ruta, formato=None, tamano_lote=10000):
+    """Escribe las tareas de la lista en el archivo, por lotes; devuelve cuantas."""
+    formato = formato_de(ruta, formato)
+    total = 0
+    with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+        escritor = csv.writer(archivo) if formato == "csv" else None
+        if escritor is not None:
+            escritor.writerow(CAMPOS)
+        lote = []
+        for nodo in lista:
+            lote.append(nodo)
+            if len(lote) >= tamano_lote:
+                total += _escribir_lote(archivo, escritor, lote)
+                lote = []
+        if lote:
+            total += _escribir_lote(archivo, escritor, lote)
+    return total
+
+
+def _escribir_lote(archivo, escritor, lote):
+    if escritor is not None:
+        escritor.writerows(_fila_csv(nodo) for nodo in lote)
+    else:
+        archivo.write("".join(json.dumps(tarea_a_dict(nodo), ensure_ascii=False) + "\n"
+                              for nodo in lote))
+    return len(lote)
+
+
+# Punto de entrada --------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa o exporta tareas en CSV/JSONL")
+    parser.add_argument("accion", choices=("importar", "exportar"))
+    parser.add_argument("archivo")
+    parser.add_argument("--datos", required=True,
+                        help="carpeta del almacen de tareas (ver persistencia.py)")
+    parser.add_argument("--formato", choices=FORMATOS)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    with AlmacenTareas(args.datos) as almacen:
+        if args.accion == "importar":
+            _, resultado = importar(args.archivo, almacen.lista, args.formato, args.workers)
+            print(f"Tareas importadas: {resultado.importadas}")
+            print(f"Ids repetidos omitidos: {resultado.duplicadas}")
+            if resultado.ignoradas:
+                print(f"Columnas ignoradas: {', '.join(resultado.ignoradas)}")
+            for numero, mensaje in resultado.errores[:20]:
+                print(f"  linea {numero}: {mensaje}")
+            if len(resultado.errores) > 20:
+                print(f"  ... y {len(resultado.errores) - 20} errores mas")
+            return 1 if resultado.errores else 0
+        total = exportar(almacen.lista, args.archivo, args.formato)
+        print(f"Tareas exportadas: {total}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
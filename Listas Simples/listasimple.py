@@ -1,9 +1,28 @@
 ﻿"""Script interactivo para gestionar una lista de tareas pendientes usando una lista enlazada simple."""
 
+import gc
+import sys
+from contextlib import contextmanager
+from operator import attrgetter
+
+from consultas import Consulta, RenderizadorTareas, ejecutar, fecha_a_ordinal, normalizar_texto
+
 # Definicion de clases ----------------------------------------------------
 
 class NodoTarea:
-    """Representa un nodo de la lista enlazada con todos los datos de una tarea."""
+    """Representa un nodo de la lista enlazada con todos los datos de una tarea.
+
+    Usa __slots__ (sin __dict__ por instancia) e interna los valores que se
+    repiten entre tareas (prioridad, estado, responsable, tags y fechas), de
+    modo que miles de tareas comparten los mismos objetos de texto.
+    """
+
+    __slots__ = (
+        "id_tarea", "titulo", "descripcion", "prioridad", "estado",
+        "fecha_creacion", "fecha_vencimiento", "responsable", "tags",
+        "notas_adicionales", "titulo_normalizado", "tags_normalizados",
+        "ordinal_creacion", "ordinal_vencimiento", "orden", "next",
+    )
 
     def __init__(self, id_tarea, titulo, descripcion, prioridad, estado,
                  fecha_creacion, fecha_vencimiento, responsable, tags,
@@ -12,24 +31,33 @@ class NodoTarea:
         self.id_tarea = id_tarea
         self.titulo = titulo
         self.descripcion = descripcion
-        self.prioridad = prioridad
-        self.estado = estado
-        self.fecha_creacion = fecha_creacion
-        self.fecha_vencimiento = fecha_vencimiento
-        self.responsable = responsable
-        self.tags = tags
+        self.prioridad = sys.intern(prioridad)
+        self.estado = sys.intern(estado)
+        self.fecha_creacion = sys.intern(fecha_creacion)
+        self.fecha_vencimiento = sys.intern(fecha_vencimiento)
+        self.responsable = sys.intern(responsable)
+        self.tags = tuple(sys.intern(tag) for tag in tags)
         self.notas_adicionales = notas_adicionales
-        # Enlace al siguiente nodo de la lista
+        # Titulo y tags normalizados una sola vez, al crear la tarea; si el
+        # titulo ya esta en forma canonica se reutiliza el mismo objeto
+        titulo_normalizado = normalizar_texto(titulo)
+        self.titulo_normalizado = titulo if titulo_normalizado == titulo else titulo_normalizado
+        self.tags_normalizados = tuple(dict.fromkeys(
+            sys.intern(normalizar_texto(tag)) for tag in self.tags))
+        # Fechas como ordinales (None si no se reconocen) para filtrar y ordenar
+        self.ordinal_creacion = fecha_a_ordinal(self.fecha_creacion)
+        self.ordinal_vencimiento = fecha_a_ordinal(self.fecha_vencimiento)
+        # Posicion de insercion (la asigna la lista) y enlace al siguiente nodo
+        self.orden = 0
         self.next = None
 
     def coincide_tag(self, tag_busqueda):
         """Verifica si el tag buscado existe dentro de la lista de tags."""
-        tag_normalizado = tag_busqueda.strip().lower()
-        return any(tag_normalizado == tag.lower() for tag in self.tags)
+        return normalizar_texto(tag_busqueda) in self.tags_normalizados
 
     def coincide_titulo(self, titulo_busqueda):
         """Compara el titulo del nodo con el titulo buscado (ignorando mayusculas)."""
-        return self.titulo.lower() == titulo_busqueda.strip().lower()
+        return self.titulo_normalizado == normalizar_texto(titulo_busqueda)
 
 
 class ListaTareas:
@@ -37,6 +65,31 @@ class ListaTareas:
 
     def __init__(self):
         self.head = None
+        # Ultimo nodo, cantidad de tareas e indice id -> nodo, para que
+        # agregar y verificar ids no tengan que recorrer la lista
+        self.tail = None
+        self._tamano = 0
+        self._indice_ids = {}
+        # Indices secundarios: tag normalizado -> nodos, titulo normalizado -> nodos
+        self._indice_tags = {}
+        self._indice_titulos = {}
+        # Nodos enlazados en bloque que aun no estan en los indices secundarios
+        self._pendientes_indice = []
+        self._siguiente_orden = 0
+        # Formato de salida separado de las consultas
+        self.renderizador = RenderizadorTareas()
+        # Funciones avisadas de cada cambio, como funcion(operacion, nodo)
+        self._observadores = []
+
+    def __len__(self):
+        return self._tamano
+
+    def __iter__(self):
+        """Recorre los nodos de la lista en orden."""
+        actual = self.head
+        while actual:
+            yield actual
+            actual = actual.next
 
     def agregar_tarea(self, id_tarea, titulo, descripcion, prioridad, estado,
                       fecha_creacion, fecha_vencimiento, responsable, tags,
@@ -58,38 +111,128 @@ class ListaTareas:
             tags=tags,
             notas_adicionales=notas_adicionales,
         )
+        self._enlazar_al_final(nueva_tarea)
+        self._notificar("agregar", nueva_tarea)
+        return True
 
-        if self.head is None:
-            self.head = nueva_tarea
-            return True
-
-        actual = self.head
-        while actual.next:
-            actual = actual.next
-        actual.next = nueva_tarea
+    def enlazar_en_bloque(self, nodos):
+        """Enlaza al final una secuencia de nodos ya creados, en O(n).
+
+        Pensado para recargas e importaciones masivas: no imprime avisos y
+        devuelve cuantos nodos se enlazaron. Si algun id se repite (contra la
+        lista o dentro del bloque) lanza ValueError sin modificar la lista.
+        Los observadores reciben un solo aviso ("bloque", nodos).
+        """
+        nodos = list(nodos)
+        ids = dict(zip(map(attrgetter("id_tarea"), nodos), nodos))
+        if len(ids) != len(nodos) or not self._indice_ids.keys().isdisjoint(ids):
+            vistos = set(self._indice_ids)
+            for nodo in nodos:
+                if nodo.id_tarea in vistos:
+                    raise ValueError(f"id de tarea repetido: {nodo.id_tarea!r}")
+                vistos.add(nodo.id_tarea)
+        if not nodos:
+            return 0
+
+        anterior = self.tail
+        orden = self._siguiente_orden
+        for nodo in nodos:
+            nodo.orden = orden
+            orden += 1
+            if anterior is None:
+                self.head = nodo
+            else:
+                anterior.next = nodo
+            anterior = nodo
+        anterior.next = None
+        self.tail = anterior
+        self._siguiente_orden = orden
+        self._tamano += len(nodos)
+
+        self._indice_ids.update(ids)
+        # Los indices de tags y titulos se completan en la primera busqueda,
+        # asi una recarga grande no paga por ellos al arrancar
+        self._pendientes_indice.extend(nodos)
+        self._notificar("bloque", nodos)
+        return len(nodos)
+
+    def actualizar_estado(self, id_tarea, estado):
+        """Cambia el estado de la tarea con el id indicado."""
+        nodo = self._indice_ids.get(id_tarea)
+        if nodo is None:
+            print(f"No existe una tarea con el id '{id_tarea}'.")
+            return False
+        anterior = nodo.estado
+        nodo.estado = sys.intern(estado)
+        self._notificar("estado", nodo, anterior)
         return True
 
+    def obtener_tarea(self, id_tarea):
+        """Devuelve el nodo con el id indicado, o None si no existe."""
+        return self._indice_ids.get(id_tarea)
+
+    def tareas_con_tag(self, tag):
+        """Devuelve, en orden de insercion, las tareas que tienen el tag."""
+        self._completar_indices()
+        return list(self._indice_tags.get(normalizar_texto(tag), ()))
+
+    def tareas_con_tags(self, tags, todas=True):
+        """Devuelve las tareas que tienen todos los tags (o alguno si todas=False)."""
+        self._completar_indices()
+        conjuntos = [self._indice_tags.get(normalizar_texto(tag), {}).keys() for tag in tags]
+        if not conjuntos:
+            return []
+        if todas:
+            # Se intersecta empezando por el conjunto mas pequeno
+            conjuntos.sort(key=len)
+            resultado = set(conjuntos[0])
+            for conjunto in conjuntos[1:]:
+                resultado &= conjunto
+                if not resultado:
+                    break
+        else:
+            resultado = set().union(*conjuntos)
+        return sorted(resultado, key=lambda nodo: nodo.orden)
+
+    def tareas_con_titulo(self, titulo):
+        """Devuelve, en orden de insercion, las tareas cuyo titulo coincide."""
+        self._completar_indices()
+        return list(self._indice_titulos.get(normalizar_texto(titulo), ()))
+
+    def agregar_observador(self, funcion):
+        """Registra una funcion que se llama como funcion(operacion, nodo) tras cada cambio.
+
+        Tras enlazar_en_bloque la operacion es "bloque" y en lugar de un
+        nodo se pasa la lista de nodos enlazados. Con "estado" se pasa
+        ademas el estado anterior y con "eliminar" el nodo que precedia al
+        quitado: funcion(operacion, nodo, anterior).
+        """
+        self._observadores.append(funcion)
+
+    def quitar_observador(self, funcion):
+        self._observadores.remove(funcion)
+
+    def consultar(self, **criterios):
+        """Devuelve un generador con las tareas que cumplen los criterios.
+
+        Acepta los mismos argumentos que consultas.Consulta (tags, titulo,
+        prioridad, estado, responsable, vence_desde, vence_hasta,
+        desplazamiento y limite).
+        """
+        return ejecutar(self, Consulta(**criterios))
+
     def buscar_por_tag(self, tag):
         """Muestra todas las tareas que contienen el tag indicado."""
         if self.head is None:
             print("No hay tareas registradas.")
             return
 
-        actual = self.head
-        encontradas = []
-        while actual:
-            if actual.coincide_tag(tag):
-                encontradas.append(actual)
-            actual = actual.next
-
+        encontradas = self.tareas_con_tag(tag)
         if not encontradas:
             print(f"No se encontraron tareas con el tag '{tag}'.")
             return
 
-        print(f"\nTareas con el tag '{tag}':")
-        print("-" * 70)
-        for indice, tarea in enumerate(encontradas, start=1):
-            self._imprimir_tarea(tarea, indice)
+        self.renderizador.escribir(encontradas, encabezado=f"Tareas con el tag '{tag}':")
 
     def buscar_por_titulo(self, titulo):
         """Busca y muestra la primera tarea cuyo titulo coincide exactamente."""
@@ -97,14 +240,11 @@ class ListaTareas:
             print("No hay tareas registradas.")
             return
 
-        actual = self.head
-        while actual:
-            if actual.coincide_titulo(titulo):
-                print("\nTarea encontrada:")
-                print("-" * 70)
-                self._imprimir_tarea(actual)
-                return
-            actual = actual.next
+        encontradas = self.tareas_con_titulo(titulo)
+        if encontradas:
+            self.renderizador.escribir(encontradas[:1], encabezado="Tarea encontrada:",
+                                       numerar=False)
+            return
 
         print(f"No se encontro ninguna tarea con el titulo '{titulo}'.")
 
@@ -114,59 +254,129 @@ class ListaTareas:
             print("No hay tareas para mostrar.")
             return
 
-        print("\nListado completo de tareas:")
-        print("-" * 70)
-        actual = self.head
-        indice = 1
-        while actual:
-            self._imprimir_tarea(actual, indice)
-            actual = actual.next
-            indice += 1
+        self.renderizador.escribir(self, encabezado="Listado completo de tareas:")
+
+    def _notificar(self, operacion, nodo, *detalle):
+        for funcion in self._observadores:
+            funcion(operacion, nodo, *detalle)
 
     def _contiene_id(self, id_busqueda):
         """Revisa si ya existe una tarea con el id indicado."""
-        actual = self.head
-        while actual:
-            if actual.id_tarea == id_busqueda:
-                return True
-            actual = actual.next
-        return False
+        return id_busqueda in self._indice_ids
+
+    def _enlazar_al_final(self, nodo):
+        """Enlaza el nodo despues de la cola y lo registra en los indices."""
+        if self.tail is None:
+            self.head = nodo
+        else:
+            self.tail.next = nodo
+        self.tail = nodo
+        self._tamano += 1
+        nodo.orden = self._siguiente_orden
+        self._siguiente_orden += 1
+        self._indice_ids[nodo.id_tarea] = nodo
+        if self._pendientes_indice:
+            # Se respeta el orden de insercion: va detras de los pendientes
+            self._pendientes_indice.append(nodo)
+        else:
+            self._indexar(nodo)
 
-    def _imprimir_tarea(self, tarea, indice=None):
-        """Imprime una tarea con un formato claro y alineado."""
-        etiqueta_indice = f"Tarea {indice}" if indice is not None else "Tarea"
-        print(f"{etiqueta_indice}")
-        print(f"  Id             : {tarea.id_tarea}")
-        print(f"  Titulo         : {tarea.titulo}")
-        print(f"  Descripcion    : {tarea.descripcion}")
-        print(f"  Prioridad      : {tarea.prioridad}")
-        print(f"  Estado         : {tarea.estado}")
-        print(f"  Fecha creacion : {tarea.fecha_creacion}")
-        print(f"  Fecha vencim.  : {tarea.fecha_vencimiento}")
-        print(f"  Responsable    : {tarea.responsable}")
-        tags_formateados = ", ".join(tarea.tags) if tarea.tags else "(sin tags)"
-        print(f"  Tags           : {tags_formateados}")
-        notas = tarea.notas_adicionales or "(sin notas)"
-        print(f"  Notas          : {notas}")
-        print("-" * 70)
+    def _desenlazar(self, nodo, anterior):
+        """Quita el nodo de la lista en O(1); `anterior` es el nodo previo (None si es la cabeza).
+
+        Lo usa el historial para deshacer: los nodos se quitan desde la cola,
+        asi que suelen ser los ultimos de sus indices.
+        """
+        if anterior is None:
+            self.head = nodo.next
+        else:
+            anterior.next = nodo.next
+        if self.tail is nodo:
+            self.tail = anterior
+        nodo.next = None
+        self._tamano -= 1
+        if nodo.orden == self._siguiente_orden - 1:
+            self._siguiente_orden = nodo.orden
+        del self._indice_ids[nodo.id_tarea]
+        pendientes = self._pendientes_indice
+        if pendientes and pendientes[-1] is nodo:
+            pendientes.pop()
+        else:
+            self._completar_indices()
+            self._desindexar(nodo)
+        self._notificar("eliminar", nodo, anterior)
+
+    def _reenlazar(self, nodo):
+        """Vuelve a enlazar al final un nodo quitado con _desenlazar."""
+        self._enlazar_al_final(nodo)
+        self._notificar("agregar", nodo)
+
+    def _completar_indices(self):
+        """Agrega a los indices de tags y titulos los nodos pendientes."""
+        pendientes, self._pendientes_indice = self._pendientes_indice, []
+        with sin_recolector():
+            for nodo in pendientes:
+                self._indexar(nodo)
+
+    def _indexar(self, nodo):
+        """Registra el nodo en el indice de tags y de titulos."""
+        for tag in nodo.tags_normalizados:
+            # Un dict sirve como conjunto que conserva el orden de insercion
+            self._indice_tags.setdefault(tag, {})[nodo] = None
+        self._indice_titulos.setdefault(nodo.titulo_normalizado, []).append(nodo)
+
+    def _desindexar(self, nodo):
+        """Quita el nodo del indice de tags y de titulos."""
+        for tag in nodo.tags_normalizados:
+            nodos = self._indice_tags[tag]
+            del nodos[nodo]
+            if not nodos:
+                del self._indice_tags[tag]
+        nodos = self._indice_titulos[nodo.titulo_normalizado]
+        if nodos[-1] is nodo:
+            nodos.pop()
+        else:
+            nodos.remove(nodo)
+        if not nodos:
+            del self._indice_titulos[nodo.titulo_normalizado]
 
 
 # Funciones auxiliares ----------------------------------------------------
 
-def solicitar_datos_tarea():
-    """Solicita al usuario los campos necesarios para crear una tarea."""
+@contextmanager
+def sin_recolector():
+    """Pausa el recolector de ciclos mientras se crean muchos objetos de golpe.
+
+    Crear millones de nodos (o las entradas de sus indices) dispara
+    colecciones completas que no liberan nada; pausarlo reduce la carga a
+    menos de la mitad del tiempo.
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
+
+
+def solicitar_datos_tarea(leer=input):
+    """Solicita al usuario los campos necesarios para crear una tarea.
+
+    `leer` hace las preguntas (por defecto input); ver procesar_opcion.
+    """
     print("\nIngresa los datos de la nueva tarea")
     print("-" * 70)
-    id_tarea = input("Id de la tarea: ").strip()
-    titulo = input("Titulo de la tarea: ").strip()
-    descripcion = input("Descripcion de la tarea: ").strip()
-    prioridad = input("Prioridad (Alta, Media, Baja u otra): ").strip()
-    estado = input("Estado (Pendiente, En progreso, Completada, etc.): ").strip()
-    fecha_creacion = input("Fecha de creacion: ").strip()
-    fecha_vencimiento = input("Fecha de vencimiento: ").strip()
-    responsable = input("Responsable: ").strip()
-    tags_entrada = input("Tags (separados por comas): ").strip()
-    notas_adicionales = input("Notas adicionales: ").strip()
+    id_tarea = leer("Id de la tarea: ").strip()
+    titulo = leer("Titulo de la tarea: ").strip()
+    descripcion = leer("Descripcion de la tarea: ").strip()
+    prioridad = leer("Prioridad (Alta, Media, Baja u otra): ").strip()
+    estado = leer("Estado (Pendiente, En progreso, Completada, etc.): ").strip()
+    fecha_creacion = leer("Fecha de creacion: ").strip()
+    fecha_vencimiento = leer("Fecha de vencimiento: ").strip()
+    responsable = leer("Responsable: ").strip()
+    tags_entrada = leer("Tags (separados por comas): ").strip()
+    notas_adicionales = leer("Notas adicionales: ").strip()
 
     tags = [tag.strip() for tag in tags_entrada.split(",") if tag.strip()]
     return (
@@ -183,6 +393,10 @@ def solicitar_datos_tarea():
     )
 
 
+# Opciones que entiende procesar_opcion
+OPCIONES_MENU = ("1", "2", "3", "4", "5")
+
+
 def mostrar_menu():
     """Despliega el menu principal en la consola."""
     print("\n=== Gestor de Tareas Pendientes ===")
@@ -193,68 +407,91 @@ def mostrar_menu():
     print("5. Salir")
 
 
-def ejecutar_aplicacion():
-    """Ejecuta el ciclo principal de interaccion con el usuario."""
-    lista_tareas = ListaTareas()
+def ejecutar_aplicacion(lista_tareas=None):
+    """Ejecuta el ciclo principal de interaccion con el usuario.
+
+    Se puede pasar otra lista con la misma API (por ejemplo
+    almacen_columnar.ListaTareasColumnar); por defecto usa ListaTareas.
+    """
+    if lista_tareas is None:
+        lista_tareas = ListaTareas()
 
     while True:
         mostrar_menu()
         opcion = input("Selecciona una opcion (1-5): ").strip()
-
-        if opcion == "1":
-            (
-                id_tarea,
-                titulo,
-                descripcion,
-                prioridad,
-                estado,
-                fecha_creacion,
-                fecha_vencimiento,
-                responsable,
-                tags,
-                notas_adicionales,
-            ) = solicitar_datos_tarea()
-
-            if not id_tarea or not titulo:
-                print("El id y el titulo son obligatorios. Intenta nuevamente.")
-                continue
-
-            agregado = lista_tareas.agregar_tarea(
-                id_tarea=id_tarea,
-                titulo=titulo,
-                descripcion=descripcion,
-                prioridad=prioridad,
-                estado=estado,
-                fecha_creacion=fecha_creacion,
-                fecha_vencimiento=fecha_vencimiento,
-                responsable=responsable,
-                tags=tags,
-                notas_adicionales=notas_adicionales,
-            )
-            if agregado:
-                print("Tarea agregada correctamente.")
-        elif opcion == "2":
-            titulo = input("\nIntroduce el titulo de la tarea a buscar: ").strip()
-            if titulo:
-                lista_tareas.buscar_por_titulo(titulo)
-            else:
-                print("Debes ingresar un titulo para buscar.")
-        elif opcion == "3":
-            tag = input("\nIntroduce el tag a buscar: ").strip()
-            if tag:
-                lista_tareas.buscar_por_tag(tag)
-            else:
-                print("Debes ingresar un tag para buscar.")
-        elif opcion == "4":
-            lista_tareas.mostrar_todas()
-        elif opcion == "5":
-            print("Saliendo del gestor de tareas. Hasta luego!")
+        if not procesar_opcion(lista_tareas, opcion):
             break
+
+
+def procesar_opcion(lista_tareas, opcion, leer=input):
+    """Ejecuta una opcion del menu; devuelve False cuando la opcion es salir.
+
+    Los datos que necesita la opcion se piden con leer(mensaje), que por
+    defecto es input() como en el menu interactivo; lotes.py pasa una
+    funcion que devuelve los datos de cada comando.
+    """
+    if opcion == "1":
+        (
+            id_tarea,
+            titulo,
+            descripcion,
+            prioridad,
+            estado,
+            fecha_creacion,
+            fecha_vencimiento,
+            responsable,
+            tags,
+            notas_adicionales,
+        ) = solicitar_datos_tarea(leer)
+
+        if not id_tarea or not titulo:
+            print("El id y el titulo son obligatorios. Intenta nuevamente.")
+            return True
+
+        agregado = lista_tareas.agregar_tarea(
+            id_tarea=id_tarea,
+            titulo=titulo,
+            descripcion=descripcion,
+            prioridad=prioridad,
+            estado=estado,
+            fecha_creacion=fecha_creacion,
+            fecha_vencimiento=fecha_vencimiento,
+            responsable=responsable,
+            tags=tags,
+            notas_adicionales=notas_adicionales,
+        )
+        if agregado:
+            print("Tarea agregada correctamente.")
+    elif opcion == "2":
+        titulo = leer("\nIntroduce el titulo de la tarea a buscar: ").strip()
+        if titulo:
+            lista_tareas.buscar_por_titulo(titulo)
         else:
-            print("Opcion no valida. Por favor elige una opcion entre 1 y 5.")
+            print("Debes ingresar un titulo para buscar.")
+    elif opcion == "3":
+        tag = leer("\nIntroduce el tag a buscar: ").strip()
+        if tag:
+            lista_tareas.buscar_por_tag(tag)
+        else:
+            print("Debes ingresar un tag para buscar.")
+    elif opcion == "4":
+        lista_tareas.mostrar_todas()
+    elif opcion == "5":
+        print("Saliendo del gestor de tareas. Hasta luego!")
+        return False
+    else:
+        print("Opcion no valida. Por favor elige una opcion entre 1 y 5.")
+    return True
 
 
 # Punto de entrada --------------------------------------------------------
 
 if __name__ == "__main__":
-    ejecutar_aplicacion()
+    if len(sys.argv) > 1:
+        # Con una carpeta como argumento las tareas se conservan entre ejecuciones
+        from persistencia import AlmacenTareas
+
+        with AlmacenTareas(sys.argv[1]) as almacen:
+            ejecutar_aplicacion(almacen.lista)
+    else:
+        ejecutar_aplicacion()
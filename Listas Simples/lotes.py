@@ -0,0 +1,79 @@
+"""Ejecucion por lotes del menu de tareas, sin consola.
+
+Lee un flujo de comandos (archivo o stdin) y ejecuta cada uno con
+procesar_opcion, la misma funcion que usa el menu interactivo. Cada comando
+es una opcion del menu seguida de las respuestas que leerian sus preguntas,
+en el mismo orden:
+
+    1|T-1|Preparar informe|Resumen mensual|Alta|Pendiente|2024-01-01|2024-02-01|Ana|trabajo,informes|
+    3|trabajo
+    {"opcion": "2", "datos": ["Preparar informe"]}
+
+Las lineas vacias y las que empiezan con # se ignoran; la opcion 5 termina el
+lote. Los datos llegan a la opcion por el parametro `leer` de
+procesar_opcion. La salida de las opciones se acumula en memoria y se
+escribe por bloques (o se descarta con --silencioso); un comando que falla,
+incluida una opcion que no esta en el menu, cuenta como error y no deja
+salida. Al final se muestran tiempos por opcion en la salida de errores.
+La lectura de comandos, el buffer y los tiempos son los de
+Comun/lotes_menu.py, compartidos con el ejecutor de la playlist.
+
+    python lotes.py comandos.txt --datos carpeta
+    python lotes.py - --silencioso < comandos.jsonl
+"""
+
+import argparse
+import os
+import sys
+
+from listasimple import OPCIONES_MENU, ListaTareas, procesar_opcion
+
+# Las carpetas de las listas son scripts sueltos: el modulo comun se busca al lado
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Comun"))
+import lotes_menu
+
+
+def ejecutar_comandos(lineas, lista=None, salida=None, silencioso=False):
+    """Ejecuta los comandos de `lineas` sobre la lista; devuelve (lista, Estadisticas).
+
+    Ver lotes_menu.ejecutar_comandos para el manejo de errores y de la salida.
+    """
+    lista = ListaTareas() if lista is None else lista
+
+    def despachar(opcion, leer):
+        if opcion not in OPCIONES_MENU:
+            raise ValueError(f"opcion desconocida {opcion!r}")
+        return procesar_opcion(lista, opcion, leer)
+
+    estadisticas = lotes_menu.ejecutar_comandos(lineas, despachar, salida, silencioso)
+    return lista, estadisticas
+
+
+# Punto de entrada --------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ejecuta comandos del menu de tareas por lotes")
+    parser.add_argument("archivo", help="archivo de comandos, o - para leer de stdin")
+    parser.add_argument("--datos", help="carpeta del almacen de tareas (ver persistencia.py)")
+    parser.add_argument("--silencioso", action="store_true",
+                        help="descarta la salida de las opciones; solo muestra los tiempos")
+    args = parser.parse_args(argv)
+
+    entrada = sys.stdin if args.archivo == "-" else open(args.archivo, encoding="utf-8-sig")
+    try:
+        if args.datos:
+            from persistencia import AlmacenTareas
+
+            with AlmacenTareas(args.datos) as almacen:
+                _, estadisticas = ejecutar_comandos(entrada, almacen.lista, silencioso=args.silencioso)
+        else:
+            _, estadisticas = ejecutar_comandos(entrada, silencioso=args.silencioso)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+    print(estadisticas.informe(), file=sys.stderr)
+    return 1 if estadisticas.errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,366 @@
+"""Persistencia en disco para la lista de tareas.
+
+AlmacenTareas guarda una ListaTareas en una carpeta con dos archivos:
+
+* un snapshot compactado (tareas.snap) con todas las tareas por columnas,
+  escrito en un archivo temporal y reemplazado de forma atomica;
+* un registro de cambios (registro-<generacion>.jsonl) donde cada mutacion
+  se agrega como una linea JSON, sin reescribir lo anterior.
+
+Al abrir se lee el snapshot con mmap, se crean los nodos y se enlazan de una
+vez con ListaTareas.enlazar_en_bloque (O(n)), y luego se aplica el registro
+de su misma generacion. Cada `compactar_cada` cambios el registro se vuelca
+en un snapshot nuevo y se empieza otro registro vacio. Si una caida dejo la
+ultima linea del registro a medias, se descarta y se recorta del archivo
+antes de seguir agregando; una linea danada en medio del registro es un
+error y el archivo no se toca. La lista puede ser tambien una
+almacen_columnar.ListaTareasColumnar.
+
+Como referencia, con un millon de tareas abrir tarda unos 2 s y la primera
+busqueda por tag o titulo, que completa los indices, cerca de 1,8 s mas:
+casi todo el costo es crear un objeto por tarea.
+
+Formato del snapshot: una linea con la firma, una linea JSON de cabecera con
+la posicion y el tipo de cada bloque, y los bloques. Los valores repetidos
+(prioridad, estado, responsable, fechas y tags) se guardan una sola vez en el
+bloque "valores" y sus columnas son arreglos binarios de codigos; los textos
+propios de cada tarea van separados por NUL (o como arreglo JSON si algun
+texto contiene ese caracter).
+"""
+
+import json
+import mmap
+import os
+import sys
+from array import array
+
+from consultas import fecha_a_ordinal, normalizar_texto
+from listasimple import ListaTareas, NodoTarea, sin_recolector
+
+FIRMA = b"LISTATAREAS-SNAPSHOT 1\n"
+NOMBRE_SNAPSHOT = "tareas.snap"
+PREFIJO_REGISTRO = "registro-"
+
+# Campos de NodoTarea que se guardan; el resto se recalcula al cargar
+CAMPOS = (
+    "id_tarea", "titulo", "descripcion", "prioridad", "estado",
+    "fecha_creacion", "fecha_vencimiento", "responsable", "tags",
+    "notas_adicionales",
+)
+CAMPOS_TEXTO = ("id_tarea", "titulo", "descripcion", "notas_adicionales")
+CAMPOS_CODIFICADOS = ("prioridad", "estado", "responsable", "fecha_creacion",
+                      "fecha_vencimiento")
+SEPARADOR = "\x00"
+TIPO_CODIGOS = "I"
+
+
+def tarea_a_dict(nodo):
+    """Campos persistentes de un nodo, listos para serializar."""
+    datos = {campo: getattr(nodo, campo) for campo in CAMPOS}
+    datos["tags"] = list(nodo.tags)
+    return datos
+
+
+# Snapshot ---------------------------------------------------------------
+
+def escribir_snapshot(ruta, lista, generacion=0):
+    """Escribe todas las tareas de la lista en un snapshot, de forma atomica."""
+    columnas = {campo: [] for campo in CAMPOS_TEXTO + CAMPOS_CODIFICADOS + ("tags",)}
+    valores, codigos = [], {}
+    combinaciones, codigos_combinacion = [], {}
+
+    def codificar(valor):
+        codigo = codigos.get(valor)
+        if codigo is None:
+            codigo = codigos[valor] = len(valores)
+            valores.append(valor)
+        return codigo
+
+    for nodo in lista:
+        for campo in CAMPOS_TEXTO:
+            columnas[campo].append(getattr(nodo, campo))
+        for campo in CAMPOS_CODIFICADOS:
+            columnas[campo].append(codificar(getattr(nodo, campo)))
+        # Las combinaciones de tags se repiten mucho: se guardan una vez cada una
+        combinacion = codigos_combinacion.get(nodo.tags)
+        if combinacion is None:
+            combinacion = codigos_combinacion[nodo.tags] = len(combinaciones)
+            combinaciones.append([codificar(tag) for tag in nodo.tags])
+        columnas["tags"].append(combinacion)
+
+    bloques = {"valores": valores, "combinaciones": combinaciones, **columnas}
+    # Las posiciones son relativas al final de la cabecera
+    posiciones, datos, inicio = {}, [], 0
+    for nombre, contenido in bloques.items():
+        tipo, bloque = _codificar_bloque(nombre, contenido)
+        posiciones[nombre] = [tipo, inicio, len(bloque)]
+        datos.append(bloque)
+        inicio += len(bloque)
+    cabecera = {"generacion": generacion, "tareas": len(lista),
+                "orden_bytes": sys.byteorder, "bloques": posiciones}
+
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(FIRMA)
+        archivo.write(json.dumps(cabecera).encode("utf-8") + b"\n")
+        for bloque in datos:
+            archivo.write(bloque)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+
+
+def leer_snapshot(ruta):
+    """Lee un snapshot con mmap y devuelve (generacion, nodos sin enlazar).
+
+    Cada bloque se decodifica directamente desde el mapa de memoria, sin
+    copiar el archivo completo a memoria antes de interpretarlo.
+    """
+    with open(ruta, "rb") as archivo, \
+            mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        if mapa.readline() != FIRMA:
+            raise ValueError(f"{ruta} no es un snapshot de tareas")
+        cabecera = json.loads(mapa.readline())
+        base = mapa.tell()
+        intercambiar = cabecera["orden_bytes"] != sys.byteorder
+        bloques = {}
+        with memoryview(mapa) as vista:
+            for nombre, (tipo, inicio, largo) in cabecera["bloques"].items():
+                datos = vista[base + inicio:base + inicio + largo]
+                bloques[nombre] = _decodificar_bloque(tipo, datos, cabecera["tareas"],
+                                                      intercambiar)
+                datos.release()
+    return cabecera["generacion"], _construir_nodos(bloques)
+
+
+def _codificar_bloque(nombre, contenido):
+    """Devuelve (tipo, bytes) del bloque: codigos, texto o json."""
+    if nombre in CAMPOS_CODIFICADOS or nombre == "tags":
+        return "codigos", array(TIPO_CODIGOS, contenido).tobytes()
+    if nombre in CAMPOS_TEXTO and not any(SEPARADOR in texto for texto in contenido):
+        return "texto", SEPARADOR.join(contenido).encode("utf-8")
+    return "json", json.dumps(contenido, ensure_ascii=False,
+                              separators=(",", ":")).encode("utf-8")
+
+
+def _decodificar_bloque(tipo, datos, tareas, intercambiar):
+    if tipo == "codigos":
+        codigos = array(TIPO_CODIGOS)
+        codigos.frombytes(datos)
+        if intercambiar:
+            codigos.byteswap()
+        return codigos
+    if tipo == "texto":
+        # Con una sola tarea de texto vacio el bloque tambien queda vacio
+        return str(datos, "utf-8").split(SEPARADOR) if tareas else []
+    if tipo == "json":
+        return json.loads(bytes(datos))
+    raise ValueError(f"tipo de bloque desconocido: {tipo!r}")
+
+
+def _construir_nodos(bloques):
+    """Crea los nodos a partir de los bloques del snapshot.
+
+    Los campos derivados se calculan una vez por valor distinto (ordinales
+    de fecha) o por combinacion de tags, y el constructor de NodoTarea se
+    evita porque volveria a normalizar cada campo de cada tarea.
+    """
+    valores = [sys.intern(valor) for valor in bloques["valores"]]
+    tags = [tuple(valores[codigo] for codigo in combinacion)
+            for combinacion in bloques["combinaciones"]]
+    tags_normalizados = [tuple(dict.fromkeys(sys.intern(normalizar_texto(tag)) for tag in grupo))
+                         for grupo in tags]
+    codigos_fecha = set(bloques["fecha_creacion"]).union(bloques["fecha_vencimiento"])
+    ordinales = {codigo: fecha_a_ordinal(valores[codigo]) for codigo in codigos_fecha}
+
+    nuevo = object.__new__
+    nodos = []
+    agregar = nodos.append
+    for (id_tarea, titulo, descripcion, notas, prioridad, estado, responsable,
+         creacion, vencimiento, combinacion) in zip(
+            bloques["id_tarea"], bloques["titulo"], bloques["descripcion"],
+            bloques["notas_adicionales"], bloques["prioridad"], bloques["estado"],
+            bloques["responsable"], bloques["fecha_creacion"],
+            bloques["fecha_vencimiento"], bloques["tags"]):
+        nodo = nuevo(NodoTarea)
+        nodo.id_tarea = id_tarea
+        nodo.titulo = titulo
+        nodo.descripcion = descripcion
+        nodo.prioridad = valores[prioridad]
+        nodo.estado = valores[estado]
+        nodo.fecha_creacion = valores[creacion]
+        nodo.fecha_vencimiento = valores[vencimiento]
+        nodo.responsable = valores[responsable]
+        nodo.tags = tags[combinacion]
+        nodo.notas_adicionales = notas
+        titulo_normalizado = normalizar_texto(titulo)
+        nodo.titulo_normalizado = titulo if titulo_normalizado == titulo else titulo_normalizado
+        nodo.tags_normalizados = tags_normalizados[combinacion]
+        nodo.ordinal_creacion = ordinales[creacion]
+        nodo.ordinal_vencimiento = ordinales[vencimiento]
+        agregar(nodo)
+    return nodos
+
+
+# Registro de cambios ----------------------------------------------------
+
+def leer_registro(ruta):
+    """Devuelve (operaciones, bytes validos) del registro.
+
+    Solo la ultima linea puede estar cortada por una caida (sin salto de
+    linea, o JSON invalido al final del archivo): no se aplica, y los bytes
+    validos llegan hasta la linea anterior, que es donde debe seguir
+    escribiendose. Una linea invalida seguida de otras no es un corte sino
+    un registro danado: lanza ValueError con el archivo y la linea, sin
+    tocar el archivo.
+    """
+    if not os.path.exists(ruta):
+        return [], 0
+    operaciones, validos = [], 0
+    with open(ruta, "rb") as archivo:
+        for numero, linea in enumerate(archivo, start=1):
+            if not linea.endswith(b"\n"):
+                break
+            try:
+                operaciones.append(json.loads(linea))
+            except ValueError:
+                if archivo.read(1):
+                    raise ValueError(f"{ruta}:{numero}: linea invalida en el registro") from None
+                break
+            validos += len(linea)
+    return operaciones, validos
+
+
+def aplicar_operacion(lista, operacion):
+    """Repite sobre la lista una operacion leida del registro."""
+    tipo = operacion["op"]
+    if tipo == "agregar":
+        lista.agregar_tarea(**operacion["tarea"])
+    elif tipo == "estado":
+        lista.actualizar_estado(operacion["id"], operacion["estado"])
+    elif tipo == "eliminar":
+        anterior = operacion["anterior"]
+        lista._desenlazar(lista.obtener_tarea(operacion["id"]),
+                          None if anterior is None else lista.obtener_tarea(anterior))
+    else:
+        raise ValueError(f"operacion desconocida en el registro: {tipo!r}")
+
+
+def _recortar(ruta, largo):
+    """Descarta lo que sigue a los primeros `largo` bytes del archivo, si existe.
+
+    Sin esto la siguiente linea agregada quedaria pegada a los restos de una
+    linea cortada y se perderia, junto con todas las posteriores, al recargar.
+    """
+    if not os.path.exists(ruta) or os.path.getsize(ruta) <= largo:
+        return
+    with open(ruta, "r+b") as archivo:
+        archivo.truncate(largo)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+
+
+class AlmacenTareas:
+    """Mantiene una ListaTareas sincronizada con una carpeta en disco."""
+
+    def __init__(self, directorio, compactar_cada=10000, sincronizar=False):
+        self.directorio = directorio
+        self.compactar_cada = compactar_cada
+        # Con sincronizar=True cada cambio espera a que el disco lo confirme
+        self.sincronizar = sincronizar
+        self.lista = None
+        self.generacion = 0
+        self._registro = None
+        self._cambios = 0
+
+    @property
+    def ruta_snapshot(self):
+        return os.path.join(self.directorio, NOMBRE_SNAPSHOT)
+
+    def ruta_registro(self, generacion):
+        return os.path.join(self.directorio, f"{PREFIJO_REGISTRO}{generacion}.jsonl")
+
+    def abrir(self, lista=None):
+        """Carga el snapshot y el registro en la lista (nueva si no se pasa una)."""
+        os.makedirs(self.directorio, exist_ok=True)
+        lista = ListaTareas() if lista is None else lista
+        if os.path.exists(self.ruta_snapshot):
+            with sin_recolector():
+                self.generacion, nodos = leer_snapshot(self.ruta_snapshot)
+                lista.enlazar_en_bloque(nodos)
+        ruta_registro = self.ruta_registro(self.generacion)
+        operaciones, validos = leer_registro(ruta_registro)
+        for operacion in operaciones:
+            aplicar_operacion(lista, operacion)
+
+        self._borrar_registros_viejos()
+        _recortar(ruta_registro, validos)
+
+        self.lista = lista
+        self._cambios = len(operaciones)
+        self._registro = open(ruta_registro, "a", encoding="utf-8")
+        lista.agregar_observador(self._registrar)
+        return lista
+
+    def compactar(self):
+        """Vuelca la lista en un snapshot nuevo y empieza un registro vacio."""
+        generacion = self.generacion + 1
+        escribir_snapshot(self.ruta_snapshot, self.lista, generacion)
+        # El registro anterior ya esta incluido en el snapshot
+        self._registro.close()
+        anterior = self.ruta_registro(self.generacion)
+        self.generacion = generacion
+        self._registro = open(self.ruta_registro(generacion), "a", encoding="utf-8")
+        self._cambios = 0
+        if os.path.exists(anterior):
+            os.remove(anterior)
+
+    def cerrar(self, compactar=True):
+        """Deja de registrar cambios; por defecto compacta para un arranque rapido."""
+        if self._registro is None:
+            return
+        if compactar and self._cambios:
+            self.compactar()
+        self.lista.quitar_observador(self._registrar)
+        self._registro.flush()
+        os.fsync(self._registro.fileno())
+        self._registro.close()
+        self._registro = None
+
+    def __enter__(self):
+        if self.lista is None:
+            self.abrir()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cerrar()
+
+    def _borrar_registros_viejos(self):
+        """Quita registros de generaciones anteriores (una compactacion interrumpida)."""
+        actual = os.path.basename(self.ruta_registro(self.generacion))
+        for nombre in os.listdir(self.directorio):
+            if nombre.startswith(PREFIJO_REGISTRO) and nombre != actual:
+                os.remove(os.path.join(self.directorio, nombre))
+
+    def _registrar(self, operacion, nodo, *detalle):
+        if operacion == "bloque":
+            # Un bloque grande se guarda mejor como snapshot que linea a linea
+            self.compactar()
+            return
+        if operacion == "agregar":
+            entrada = {"op": "agregar", "tarea": tarea_a_dict(nodo)}
+        elif operacion == "estado":
+            entrada = {"op": "estado", "id": nodo.id_tarea, "estado": nodo.estado}
+        elif operacion == "eliminar":
+            anterior = detalle[0]
+            entrada = {"op": "eliminar", "id": nodo.id_tarea,
+                       "anterior": None if anterior is None else anterior.id_tarea}
+        else:
+            raise ValueError(f"operacion sin registro: {operacion!r}")
+        self._registro.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+        self._registro.flush()
+        if self.sincronizar:
+            os.fsync(self._registro.fileno())
+        self._cambios += 1
+        if self._cambios >= self.compactar_cada:
+            self.compactar()
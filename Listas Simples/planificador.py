@@ -0,0 +1,182 @@
+"""Indice de planificacion por prioridad y vencimiento.
+
+PlanificadorTareas mantiene dos monticulos (heapq) sobre las tareas abiertas
+de una lista: uno ordenado por (rango de prioridad, vencimiento) para saber
+que tarea atender primero, y otro solo por vencimiento para las consultas
+por fecha. Se registra como observador de la lista, asi que se actualiza al
+agregar tareas o cambiar su estado sin recorrer la lista.
+
+Las entradas no se borran del monticulo: cada tarea guarda la version de su
+entrada vigente y las entradas viejas se descartan al llegar a la cima
+(invalidacion perezosa). Cuando las entradas viejas superan a las vigentes
+los monticulos se reconstruyen con heapify.
+"""
+
+import heapq
+from datetime import date
+
+from consultas import fecha_a_ordinal, normalizar_texto
+
+# Rango de cada prioridad conocida (menor = mas urgente); el resto va al final
+RANGOS_PRIORIDAD = {"alta": 0, "media": 1, "baja": 2}
+RANGO_DESCONOCIDO = len(RANGOS_PRIORIDAD)
+# Estados que sacan a la tarea de la planificacion
+ESTADOS_CERRADOS = frozenset({"completada", "cancelada"})
+SIN_VENCIMIENTO = float("inf")
+
+
+class PlanificadorTareas:
+    """Vista de planificacion sincronizada con una ListaTareas."""
+
+    def __init__(self, lista=None, rangos=None, estados_cerrados=ESTADOS_CERRADOS):
+        self.rangos = RANGOS_PRIORIDAD if rangos is None else rangos
+        self.estados_cerrados = estados_cerrados
+        self.lista = lista
+        # Entradas (rango, vencimiento, orden, version, nodo) y
+        # (vencimiento, rango, orden, version, nodo) de las tareas con fecha
+        self._por_prioridad = []
+        self._por_vencimiento = []
+        # Nodo abierto -> version de su entrada vigente
+        self._vigentes = {}
+        self._version = 0
+        if lista is not None:
+            self.agregar_varios(lista)
+            lista.agregar_observador(self._al_cambiar)
+
+    def __len__(self):
+        """Cantidad de tareas abiertas."""
+        return len(self._vigentes)
+
+    def __contains__(self, nodo):
+        return nodo in self._vigentes
+
+    def desconectar(self):
+        """Deja de seguir los cambios de la lista."""
+        if self.lista is not None:
+            self.lista.quitar_observador(self._al_cambiar)
+            self.lista = None
+
+    # Mantenimiento --------------------------------------------------------
+
+    def agregar(self, nodo):
+        """Agrega (o vuelve a ubicar) una tarea; las cerradas se quitan."""
+        if self._abrir(nodo):
+            heapq.heappush(self._por_prioridad, self._entrada_prioridad(nodo))
+            if nodo.ordinal_vencimiento is not None:
+                heapq.heappush(self._por_vencimiento, self._entrada_vencimiento(nodo))
+        self._compactar_si_conviene()
+
+    def agregar_varios(self, nodos):
+        """Agrega muchas tareas en O(n + m): se juntan las entradas y se hace heapify."""
+        for nodo in nodos:
+            if self._abrir(nodo):
+                self._por_prioridad.append(self._entrada_prioridad(nodo))
+                if nodo.ordinal_vencimiento is not None:
+                    self._por_vencimiento.append(self._entrada_vencimiento(nodo))
+        heapq.heapify(self._por_prioridad)
+        heapq.heapify(self._por_vencimiento)
+        self._compactar_si_conviene()
+
+    def quitar(self, nodo):
+        """Saca la tarea de la planificacion; sus entradas quedan invalidas."""
+        if self._vigentes.pop(nodo, None) is not None:
+            self._compactar_si_conviene()
+
+    def _al_cambiar(self, operacion, nodo, *detalle):
+        if operacion == "eliminar":
+            self.quitar(nodo)
+        elif operacion == "bloque":
+            self.agregar_varios(nodo)
+        else:
+            self.agregar(nodo)
+
+    def _abrir(self, nodo):
+        """Da una version nueva a la tarea si esta abierta; si no, la quita.
+
+        Cambiar la version invalida las entradas anteriores de la tarea.
+        """
+        if normalizar_texto(nodo.estado) in self.estados_cerrados:
+            self._vigentes.pop(nodo, None)
+            return False
+        self._version += 1
+        self._vigentes[nodo] = self._version
+        return True
+
+    def _rango(self, nodo):
+        return self.rangos.get(normalizar_texto(nodo.prioridad), RANGO_DESCONOCIDO)
+
+    def _vencimiento(self, nodo):
+        ordinal = nodo.ordinal_vencimiento
+        return SIN_VENCIMIENTO if ordinal is None else ordinal
+
+    def _entrada_prioridad(self, nodo):
+        return (self._rango(nodo), self._vencimiento(nodo), nodo.orden,
+                self._vigentes[nodo], nodo)
+
+    def _entrada_vencimiento(self, nodo):
+        return (nodo.ordinal_vencimiento, self._rango(nodo), nodo.orden,
+                self._vigentes[nodo], nodo)
+
+    def _es_vigente(self, entrada):
+        return self._vigentes.get(entrada[4]) == entrada[3]
+
+    def _podar(self, monticulo):
+        """Descarta las entradas viejas que quedaron en la cima."""
+        while monticulo and not self._es_vigente(monticulo[0]):
+            heapq.heappop(monticulo)
+        return monticulo
+
+    def _compactar_si_conviene(self):
+        """Reconstruye los monticulos cuando la mitad de las entradas son viejas."""
+        if len(self._por_prioridad) > 2 * len(self._vigentes) + 32:
+            self._por_prioridad = [e for e in self._por_prioridad if self._es_vigente(e)]
+            self._por_vencimiento = [e for e in self._por_vencimiento if self._es_vigente(e)]
+            heapq.heapify(self._por_prioridad)
+            heapq.heapify(self._por_vencimiento)
+
+    # Consultas ------------------------------------------------------------
+
+    def siguiente(self):
+        """La tarea abierta mas urgente, o None (O(log n) amortizado)."""
+        monticulo = self._podar(self._por_prioridad)
+        return monticulo[0][4] if monticulo else None
+
+    def mas_urgentes(self, k):
+        """Las k tareas abiertas mas urgentes, en orden (O(k log k))."""
+        return list(self._recorrer(self._por_prioridad, k))
+
+    def proximas_a_vencer(self, fecha, k):
+        """Las k tareas abiertas que vencen antes de `fecha`, por vencimiento."""
+        limite = fecha_a_ordinal(fecha)
+        if limite is None:
+            raise ValueError(f"fecha no reconocida: {fecha!r}")
+        return list(self._recorrer(self._por_vencimiento, k, limite))
+
+    def vencidas(self, hoy=None):
+        """Tareas abiertas cuyo vencimiento ya paso, de la mas atrasada a la menos."""
+        return self.proximas_a_vencer(date.today() if hoy is None else hoy, None)
+
+    def _recorrer(self, monticulo, k, limite=None):
+        """Recorre el monticulo en orden sin desarmarlo, con un monticulo auxiliar.
+
+        Solo visita los hijos de las entradas ya entregadas, asi que el costo
+        depende de cuantas tareas se piden y no del tamano de la lista. Con
+        `limite` se detiene en la primera entrada cuya clave no es menor.
+        """
+        self._podar(monticulo)
+        if not monticulo or k == 0:
+            return
+        frontera = [(monticulo[0], 0)]
+        entregadas = 0
+        while frontera:
+            entrada, posicion = heapq.heappop(frontera)
+            if limite is not None and entrada[0] >= limite:
+                return
+            if self._es_vigente(entrada):
+                yield entrada[4]
+                entregadas += 1
+                if entregadas == k:
+                    return
+            for hijo in (2 * posicion + 1, 2 * posicion + 2):
+                if hijo < len(monticulo):
+                    heapq.heappush(frontera, (monticulo[hijo], hijo))